@@ -0,0 +1,123 @@
+"""
+The sprite atlas for the UI of A1.
+
+Run this file to pack every PNG in sprites/ into one atlas:
+
+    python -m a1_atlas
+
+This writes three files next to the sprites:
+    - atlas.png: the packed image, for looking at or editing.
+    - atlas.json: the sub-rectangle (x, y, width, height) of every sprite.
+    - atlas.rgba: the raw RGBA pixels of the atlas. load_atlas()
+      memory-maps this file and hands it straight to pygame, so a cold start
+      does not decode any PNGs.
+
+a1_ui falls back to loading the PNGs one by one if the atlas is missing or
+older than any of the sprites.
+"""
+import json
+import math
+import mmap
+import os
+from typing import Dict, Optional
+
+import pygame
+
+ATLAS_IMAGE = 'atlas.png'
+ATLAS_INDEX = 'atlas.json'
+ATLAS_PIXELS = 'atlas.rgba'
+
+
+def _sprite_files(directory: str) -> Dict[str, str]:
+    """
+    Return the path of every sprite PNG in directory, keyed by file name
+    without the .png.
+    """
+    files = {}
+    for file_name in sorted(os.listdir(directory)):
+        name, extension = os.path.splitext(file_name)
+        if extension == '.png' and file_name != ATLAS_IMAGE:
+            files[name] = os.path.join(directory, file_name)
+    return files
+
+
+def build_atlas(directory: str) -> None:
+    """
+    Pack every sprite PNG in directory into one atlas, and write the atlas
+    image, index and raw pixels to directory.
+
+    The sprites are packed into rows (tallest first) of a roughly square
+    atlas.
+    """
+    images = {name: pygame.image.load(path)
+              for name, path in _sprite_files(directory).items()}
+    order = sorted(images, key=lambda name: (-images[name].get_height(),
+                                             name))
+    area = sum(image.get_width() * image.get_height()
+               for image in images.values())
+    width = max(max(image.get_width() for image in images.values()),
+                int(math.sqrt(area)))
+
+    rects = {}
+    x = y = row_height = 0
+    for name in order:
+        w, h = images[name].get_size()
+        if x + w > width:
+            x, y, row_height = 0, y + row_height, 0
+        rects[name] = [x, y, w, h]
+        x += w
+        row_height = max(row_height, h)
+    height = y + row_height
+
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+    for name, rect in rects.items():
+        atlas.blit(images[name], rect[:2])
+
+    pygame.image.save(atlas, os.path.join(directory, ATLAS_IMAGE))
+    with open(os.path.join(directory, ATLAS_PIXELS), 'wb') as pixels:
+        pixels.write(pygame.image.tobytes(atlas, 'RGBA'))
+    with open(os.path.join(directory, ATLAS_INDEX), 'w') as index:
+        json.dump({'size': [width, height], 'sprites': rects}, index,
+                  indent=1, sort_keys=True)
+
+
+def is_fresh(directory: str) -> bool:
+    """
+    Return whether directory has an atlas that is newer than all of its
+    sprites.
+    """
+    try:
+        built = min(os.path.getmtime(os.path.join(directory, file_name))
+                    for file_name in (ATLAS_INDEX, ATLAS_PIXELS))
+    except OSError:
+        return False
+    return all(os.path.getmtime(path) <= built
+               for path in _sprite_files(directory).values())
+
+
+def load_atlas(directory: str) -> Optional[Dict[str, pygame.Surface]]:
+    """
+    Return every sprite in the atlas of directory as a sub-surface of the
+    atlas, keyed by name, or None if the atlas is missing or stale.
+
+    The raw pixels are memory-mapped and wrapped in a surface without
+    copying, then converted to the display's pixel format in one go, so a
+    display mode must be set first.
+    """
+    if not is_fresh(directory):
+        return None
+
+    with open(os.path.join(directory, ATLAS_INDEX)) as index_file:
+        index = json.load(index_file)
+    with open(os.path.join(directory, ATLAS_PIXELS), 'rb') as pixels, \
+            mmap.mmap(pixels.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+        atlas = pygame.image.frombuffer(raw, tuple(index['size']),
+                                        'RGBA').convert_alpha()
+    return {name: atlas.subsurface(pygame.Rect(rect))
+            for name, rect in index['sprites'].items()}
+
+
+if __name__ == '__main__':
+    from a1_ui import SPRITE_DIRECTORY
+    build_atlas(SPRITE_DIRECTORY)
+    print("wrote the atlas to {}".format(SPRITE_DIRECTORY))
@@ -0,0 +1,94 @@
+"""
+Unittests for the sprite atlas of A1.
+"""
+import os
+import tempfile
+import time
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from a1_atlas import (ATLAS_INDEX, ATLAS_PIXELS, build_atlas, is_fresh,
+                      load_atlas)
+
+# The size and color of every sprite written for the tests.
+SPRITES = {'rogue_idle_0': ((30, 40), (200, 10, 10, 255)),
+           'mage_idle_0': ((20, 50), (10, 200, 10, 128)),
+           'background': ((60, 20), (10, 10, 200, 255))}
+
+
+class AtlasUnitTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Starts pygame without a window, so images can be converted.
+        """
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+
+    def setUp(self):
+        """
+        Writes a sprite PNG of one color for every entry of SPRITES to a
+        new directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        for name, (size, color) in SPRITES.items():
+            image = pygame.Surface(size, pygame.SRCALPHA, 32)
+            image.fill(color)
+            pygame.image.save(image, self.path(name + '.png'))
+
+    def path(self, file_name):
+        """
+        Return the path of file_name in the directory of this test.
+        """
+        return os.path.join(self.directory.name, file_name)
+
+    def test_round_trip(self):
+        """
+        Test to make sure every sprite comes back out of the atlas with its
+        size and pixels.
+        """
+        build_atlas(self.directory.name)
+        self.assertTrue(is_fresh(self.directory.name))
+        sprites = load_atlas(self.directory.name)
+
+        self.assertEqual(sorted(sprites), sorted(SPRITES))
+        for name, (size, color) in SPRITES.items():
+            self.assertEqual(sprites[name].get_size(), size)
+            self.assertEqual(tuple(sprites[name].get_at((size[0] - 1,
+                                                         size[1] - 1))),
+                             color)
+
+    def test_missing_atlas(self):
+        """
+        Test to make sure there is nothing to load before the atlas is
+        built, or once part of it is gone.
+        """
+        self.assertFalse(is_fresh(self.directory.name))
+        self.assertIsNone(load_atlas(self.directory.name))
+        build_atlas(self.directory.name)
+        os.remove(self.path(ATLAS_PIXELS))
+        self.assertIsNone(load_atlas(self.directory.name))
+
+    def test_stale_atlas(self):
+        """
+        Test to make sure an atlas older than any of the sprites is not
+        loaded, and is loaded again once it is rebuilt.
+        """
+        build_atlas(self.directory.name)
+        built = os.path.getmtime(self.path(ATLAS_INDEX))
+        os.utime(self.path('mage_idle_0.png'), (time.time(), built + 10))
+        self.assertIsNone(load_atlas(self.directory.name))
+
+        build_atlas(self.directory.name)
+        os.utime(self.path(ATLAS_INDEX), (time.time(), built + 20))
+        os.utime(self.path(ATLAS_PIXELS), (time.time(), built + 20))
+        self.assertEqual(sorted(load_atlas(self.directory.name)),
+                         sorted(SPRITES))
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -15,12 +15,21 @@ the constructors for the docstring examples.
 #
 # If there are multiple return types, import Union and use that. For example:
 # Union[str, bool]
-from typing import Union
+from collections import deque
+from typing import Iterator, Union
 
 
 class BattleQueue:
     """
     A class representing a BattleQueue.
+
+    The characters are kept in a deque so that add() and remove() are both
+    O(1) no matter how long the queue grows during a battle.
+
+    Whether the game is over and who won are kept as state that the
+    characters update through update_status() whenever an attack changes
+    their HP or SP, so is_over() and get_winner() do not have to re-derive
+    them.
     """
 
     def __init__(self):
@@ -31,7 +40,9 @@ class BattleQueue:
         >>> bq.is_empty()
         True
         """
-        self.queue = []
+        self.queue = deque()
+        self.game_over = False
+        self.winner = None
 
     def add(self, character: 'Characters') -> None:
         """
@@ -63,7 +74,23 @@ class BattleQueue:
         >>> bq.is_empty()
         True
         """
-        return self.queue.pop(0)
+        return self.queue.popleft()
+
+    def __iter__(self) -> Iterator['Characters']:
+        """
+        Return an iterator over the characters in this BattleQueue, from
+        the front to the back.
+
+        >>> bq = BattleQueue()
+        >>> from a1_playstyle import ManualPlaystyle
+        >>> ps = ManualPlaystyle(bq)
+        >>> from a1_characters import Rogue
+        >>> c = Rogue('Sophia', bq, ps)
+        >>> bq.add(c)
+        >>> list(bq)
+        [Sophia (Rogue): 100/100]
+        """
+        return iter(self.queue)
 
     def is_empty(self) -> bool:
         """
@@ -74,7 +101,7 @@ class BattleQueue:
         >>> bq.is_empty()
         True
         """
-        return self.queue == []
+        return not self.queue
 
     def peek(self) -> 'Characters':
         """
@@ -117,17 +144,7 @@ class BattleQueue:
         >>> bq.is_over()
         False
         """
-        if self.is_empty():
-            return True
-        else:
-            player1 = self.queue[0]
-            player2 = player1.enemy
-            if player1.get_available_actions == [] and\
-                    player2.get_available_actions == []:
-                return True
-            if player1.hp == 0 or player2.hp == 0:
-                return True
-            return False
+        return self.game_over or self.is_empty()
 
     def get_winner(self) -> Union['Characters', None]:
         """
@@ -138,17 +155,133 @@ class BattleQueue:
         >>> bq = BattleQueue()
         >>> bq.get_winner()
         """
-        if not self.is_empty() and self.is_over():
-            player1 = self.peek()
-            player2 = player1.enemy
-            if player1.get_available_actions == [] and\
-                    player2.get_available_actions == []:
-                return None
-
-            if player1.hp == 0:
-                return player2
-            return player1
-        return None
+        return self.winner
+
+    def update_status(self, character: 'Characters') -> None:
+        """
+        Update whether the game is over and who won after character has
+        changed its own SP and its enemy's HP.
+
+        A player at 0 HP loses. Otherwise, if neither player has a skill
+        left that they can use, the game ends in a tie.
+
+        >>> bq = BattleQueue()
+        >>> from a1_playstyle import ManualPlaystyle
+        >>> ps = ManualPlaystyle(bq)
+        >>> from a1_characters import Rogue
+        >>> r = Rogue('Sophia', bq, ps)
+        >>> p = Rogue('Dhruv', bq, ps)
+        >>> r.enemy = p
+        >>> p.enemy = r
+        >>> p.hp = 0
+        >>> bq.update_status(r)
+        >>> bq.is_over()
+        True
+        >>> bq.get_winner()
+        Sophia (Rogue): 100/100
+        """
+        enemy = character.enemy
+        if enemy.hp == 0:
+            self.game_over = True
+            self.winner = character
+        elif character.hp == 0:
+            self.game_over = True
+            self.winner = enemy
+        elif not character.action_mask and not enemy.action_mask:
+            self.game_over = True
+            self.winner = None
+
+
+class CompactBattleQueue(BattleQueue):
+    """
+    A BattleQueue that stores consecutive turns of the same character as a
+    single run.
+
+    Special attacks push the same character several times in a row, so a
+    run of count turns by one character is stored as one entry in queue
+    and one in counts. Everything else, including game_over and winner, is
+    set up by BattleQueue, whose is_empty() and peek() work on the runs
+    unchanged. remove() still takes one turn at a time, but memory use
+    scales with the number of runs instead of the number of turns.
+    """
+
+    def __init__(self):
+        """
+        Initialize this CompactBattleQueue.
+
+        >>> bq = CompactBattleQueue()
+        >>> bq.is_empty()
+        True
+        >>> bq.game_over, bq.winner
+        (False, None)
+        """
+        super().__init__()
+        self.counts = deque()
+
+    def add(self, character: 'Characters') -> None:
+        """
+        Add character to this CompactBattleQueue, extending the last run if
+        character is already at the back.
+
+        >>> bq = CompactBattleQueue()
+        >>> from a1_playstyle import ManualPlaystyle
+        >>> ps = ManualPlaystyle(bq)
+        >>> from a1_characters import Rogue
+        >>> c = Rogue('Sophia', bq, ps)
+        >>> bq.add(c)
+        >>> bq.add(c)
+        >>> len(bq.queue)
+        1
+        """
+        queue = self.queue
+        if queue and queue[-1] is character:
+            self.counts[-1] += 1
+        else:
+            queue.append(character)
+            self.counts.append(1)
+
+    def remove(self) -> 'Characters':
+        """
+        Remove and return the character at the front of this
+        CompactBattleQueue.
+
+        >>> bq = CompactBattleQueue()
+        >>> from a1_playstyle import ManualPlaystyle
+        >>> ps = ManualPlaystyle(bq)
+        >>> from a1_characters import Rogue
+        >>> c = Rogue('Sophia', bq, ps)
+        >>> bq.add(c)
+        >>> bq.add(c)
+        >>> bq.remove()
+        Sophia (Rogue): 100/100
+        >>> bq.is_empty()
+        False
+        """
+        counts = self.counts
+        if counts[0] == 1:
+            counts.popleft()
+            return self.queue.popleft()
+        counts[0] -= 1
+        return self.queue[0]
+
+    def __iter__(self) -> Iterator['Characters']:
+        """
+        Return an iterator over the characters in this CompactBattleQueue,
+        from the front to the back, a turn at a time.
+
+        >>> bq = CompactBattleQueue()
+        >>> from a1_playstyle import ManualPlaystyle
+        >>> ps = ManualPlaystyle(bq)
+        >>> from a1_characters import Rogue
+        >>> c = Rogue('Sophia', bq, ps)
+        >>> bq.add(c)
+        >>> bq.add(c)
+        >>> list(bq)
+        [Sophia (Rogue): 100/100, Sophia (Rogue): 100/100]
+        """
+        for character, count in zip(self.queue, self.counts):
+            for _ in range(count):
+                yield character
 
 
 if __name__ == '__main__':
@@ -0,0 +1,158 @@
+"""
+Unittests for the BattleQueue classes of A1.
+"""
+import unittest
+
+from a1_battle_queue import BattleQueue, CompactBattleQueue
+from a1_characters import Mage, Rogue
+from a1_playstyle import ManualPlaystyle
+
+
+class BattleQueueUnitTests(unittest.TestCase):
+    queue_class = BattleQueue
+
+    def setUp(self):
+        """
+        Sets up a Battle Queue containing a Rogue and a Mage.
+        """
+        self.battle_queue = self.queue_class()
+        playstyle = ManualPlaystyle(self.battle_queue)
+
+        self.p1 = Rogue("P1", self.battle_queue, playstyle)
+        self.p2 = Mage("P2", self.battle_queue, playstyle)
+
+        self.p1.enemy = self.p2
+        self.p2.enemy = self.p1
+
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p2)
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp.
+        """
+        del self.battle_queue
+        del self.p1
+        del self.p2
+
+    def drain(self):
+        """
+        Remove every character from the queue and return their names.
+        """
+        names = []
+        while not self.battle_queue.is_empty():
+            names.append(self.battle_queue.remove().get_name())
+        return names
+
+    def test_fifo_order(self):
+        """
+        Test to make sure characters leave the queue in the order they were
+        added, including repeated entries.
+        """
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p2)
+
+        order = self.drain()
+        self.assertEqual(order, ['P1', 'P2', 'P1', 'P1', 'P2'],
+                         ("Expected the queue to be in the order " +
+                          "P1 -> P2 -> P1 -> P1 -> P2 but got {} " +
+                          "instead.").format(" -> ".join(order)))
+
+    def test_peek_does_not_remove(self):
+        """
+        Test to make sure peek returns the front character without removing
+        them.
+        """
+        self.assertIs(self.battle_queue.peek(), self.p1)
+        self.assertIs(self.battle_queue.peek(), self.p1)
+        self.assertEqual(self.drain(), ['P1', 'P2'])
+
+    def test_special_attack_order(self):
+        """
+        Test to make sure special attacks enqueue the right characters.
+        """
+        self.battle_queue.remove()
+        self.p1.special_attack()
+        self.p2.special_attack()
+
+        order = self.drain()
+        self.assertEqual(order, ['P2', 'P1', 'P1', 'P1', 'P2'],
+                         ("Expected the queue to be in the order " +
+                          "P2 -> P1 -> P1 -> P1 -> P2 but got {} " +
+                          "instead.").format(" -> ".join(order)))
+
+    def test_not_over_at_start(self):
+        """
+        Test to make sure a new game is not over and has no winner.
+        """
+        self.assertFalse(self.battle_queue.is_over(),
+                         "A new game should not be over.")
+        self.assertIsNone(self.battle_queue.get_winner(),
+                          "A new game should not have a winner.")
+
+    def test_winner_when_hp_reaches_0(self):
+        """
+        Test to make sure the game is over and won by the attacker once the
+        enemy's HP reaches 0.
+        """
+        self.p2.hp = 5
+        self.p1.attack()
+
+        self.assertTrue(self.battle_queue.is_over(),
+                        "The game should be over once P2 has 0 HP.")
+        self.assertIs(self.battle_queue.get_winner(), self.p1,
+                      ("P1 should win once P2 has 0 HP but got {} " +
+                       "instead.").format(self.battle_queue.get_winner()))
+
+    def test_not_over_when_one_player_out_of_sp(self):
+        """
+        Test to make sure the game goes on while one player can still act.
+        """
+        self.p1.sp = 3
+        self.p1.attack()
+
+        self.assertFalse(self.battle_queue.is_over(),
+                         ("The game should not be over while P2 still has " +
+                          "skills to use."))
+
+    def test_tie_when_both_players_out_of_sp(self):
+        """
+        Test to make sure the game ends in a tie once neither player has a
+        skill they can use.
+        """
+        self.p1.sp = 3
+        self.p2.sp = 4
+        self.p1.attack()
+
+        self.assertTrue(self.battle_queue.is_over(),
+                        ("The game should be over once neither player has " +
+                         "skills to use."))
+        self.assertIsNone(self.battle_queue.get_winner(),
+                          ("A game where neither player can act should be a " +
+                           "tie but got the winner {} instead.").format(
+                               self.battle_queue.get_winner()))
+
+
+class CompactBattleQueueUnitTests(BattleQueueUnitTests):
+    queue_class = CompactBattleQueue
+
+    def test_repeated_entries_share_a_run(self):
+        """
+        Test to make sure consecutive entries of one character are stored as
+        a single run.
+        """
+        self.battle_queue.remove()
+        self.p1.special_attack()
+        self.p1.special_attack()
+
+        # The queue should be P2 -> P1 x 4
+        runs = [(c.get_name(), n) for c, n in zip(
+            self.battle_queue.queue, self.battle_queue.counts)]
+        self.assertEqual(runs, [('P2', 1), ('P1', 4)],
+                         ("Expected the runs [('P2', 1), ('P1', 4)] but got " +
+                          "{} instead.").format(runs))
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
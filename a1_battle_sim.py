@@ -0,0 +1,230 @@
+"""
+A headless batch simulator for AI-vs-AI matches.
+
+This runs games without pygame, sprites, input() prompts or the UI's frame
+delay, and reports how fast they ran along with win rates and turn counts.
+For example:
+
+    python -m a1_battle_sim --p1 m --p2 r --games 1000000
+"""
+import argparse
+import math
+import random
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from a1_battle_queue import BattleQueue, CompactBattleQueue
+from a1_characters import ATTACK
+from a1_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
+from a1_playstyle import derive_seed
+
+# A game that runs for this many turns without ending is counted as stalled.
+MAX_TURNS = 1000
+
+# The possible results of a game.
+P1_WINS = 'p1'
+P2_WINS = 'p2'
+TIE = 'tie'
+STALLED = 'stalled'
+RESULTS = [P1_WINS, P2_WINS, TIE, STALLED]
+
+
+def play_game(p1_class: type, p2_class: type, p1_playstyle: type,
+              p2_playstyle: type, queue_class: type = BattleQueue,
+              seed: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Play one game between a p1_class and a p2_class character using the
+    given playstyle classes, and return its result and the number of turns
+    taken.
+
+    Both playstyles draw from one random stream seeded with seed, so a game
+    played with the same seed is an exact replay.
+
+    The turn logic is the same as a1_game.perform_attack.
+    """
+    rng = random.Random(seed)
+    bq = queue_class()
+    p1 = p1_class('P1', bq, p1_playstyle(bq, rng))
+    p2 = p2_class('P2', bq, p2_playstyle(bq, rng))
+    p1.enemy = p2
+    p2.enemy = p1
+    bq.add(p1)
+    bq.add(p2)
+
+    turns = 0
+    while not bq.is_over():
+        if turns == MAX_TURNS:
+            return STALLED, turns
+        character = bq.peek()
+        move = character.playstyle.select_action()
+        if not move & character.action_mask:
+            return STALLED, turns
+        if move == ATTACK:
+            character.attack()
+        else:
+            character.special_attack()
+        if character.action_mask:
+            bq.remove()
+        turns += 1
+
+    winner = bq.get_winner()
+    if winner is None:
+        return TIE, turns
+    return (P1_WINS if winner is p1 else P2_WINS), turns
+
+
+class MatchStats:
+    """
+    Aggregated results of a batch of games.
+
+    games - The number of games played.
+    results - How many games ended with each of RESULTS.
+    turns - How many games took each number of turns.
+    """
+    games: int
+    results: Counter
+    turns: Counter
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty MatchStats.
+        """
+        self.games = 0
+        self.results = Counter()
+        self.turns = Counter()
+
+    def record(self, result: str, turns: int) -> None:
+        """
+        Record one game that ended with result after turns turns.
+        """
+        self.games += 1
+        self.results[result] += 1
+        self.turns[turns] += 1
+
+    def merge(self, other: 'MatchStats') -> None:
+        """
+        Add the results in other to this MatchStats.
+        """
+        self.games += other.games
+        self.results.update(other.results)
+        self.turns.update(other.turns)
+
+    def turn_percentile(self, fraction: float) -> Optional[int]:
+        """
+        Return the smallest turn count that at least fraction of the games
+        finished within, or None if no games were played.
+        """
+        target = fraction * self.games
+        seen = 0
+        for turns in sorted(self.turns):
+            seen += self.turns[turns]
+            if seen >= target:
+                return turns
+        return None
+
+    def report(self, elapsed: Optional[float] = None) -> str:
+        """
+        Return a human readable summary of this MatchStats, given that the
+        games took elapsed seconds, if known.
+        """
+        lines = ["games: {}".format(self.games)]
+        if elapsed is not None:
+            lines[0] += "  time: {:.2f}s  games/sec: {:.0f}".format(
+                elapsed, self.games / elapsed if elapsed else 0)
+        for result in RESULTS:
+            count = self.results[result]
+            lines.append("{:>8}: {:>10} ({:6.2%})".format(
+                result, count, count / self.games if self.games else 0))
+
+        if self.games:
+            mean = sum(t * n for t, n in self.turns.items()) / self.games
+            variance = sum(n * (t - mean) ** 2
+                           for t, n in self.turns.items()) / self.games
+            lines.append(("   turns: min {} / median {} / p95 {} / max {}  " +
+                          "mean {:.2f}  stdev {:.2f}").format(
+                              min(self.turns), self.turn_percentile(0.5),
+                              self.turn_percentile(0.95), max(self.turns),
+                              mean, math.sqrt(variance)))
+        return "\n".join(lines)
+
+
+def run_batch(p1: str, p2: str, p1_style: str, p2_style: str, games: int,
+              queue_class: type = BattleQueue, seed: Optional[int] = None,
+              first_game: int = 0) -> MatchStats:
+    """
+    Play games games between the characters keyed p1 and p2 in
+    CHARACTER_CLASSES using the playstyles keyed p1_style and p2_style in
+    PLAYSTYLE_CLASSES, and return their aggregated results.
+
+    The games are numbered from first_game, and game i is seeded with
+    derive_seed(seed, i), so any range of games from a batch can be replayed
+    exactly, or split over processes, with the same seed.
+    """
+    p1_class = CHARACTER_CLASSES[p1]
+    p2_class = CHARACTER_CLASSES[p2]
+    p1_playstyle = PLAYSTYLE_CLASSES[p1_style]
+    p2_playstyle = PLAYSTYLE_CLASSES[p2_style]
+
+    stats = MatchStats()
+    for game in range(first_game, first_game + games):
+        stats.record(*play_game(p1_class, p2_class, p1_playstyle,
+                                p2_playstyle, queue_class,
+                                derive_seed(seed, game)))
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Parse the command line arguments in argv, run the batch they describe
+    and print its report.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument('--p1', choices=sorted(CHARACTER_CLASSES),
+                        default='m', help="class of the first character")
+    parser.add_argument('--p2', choices=sorted(CHARACTER_CLASSES),
+                        default='r', help="class of the second character")
+    parser.add_argument('--p1-style', choices=sorted(PLAYSTYLE_CLASSES),
+                        default='r', help="playstyle of the first character")
+    parser.add_argument('--p2-style', choices=sorted(PLAYSTYLE_CLASSES),
+                        default='r', help="playstyle of the second character")
+    parser.add_argument('--games', type=int, default=10000,
+                        help="number of games to play")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed for the random playstyles")
+    parser.add_argument('--compact-queue', action='store_true',
+                        help="use the run-length-encoded CompactBattleQueue")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="run random-vs-random games on the NumPy engine")
+    args = parser.parse_args(argv)
+
+    for style in (args.p1_style, args.p2_style):
+        if PLAYSTYLE_CLASSES[style](BattleQueue()).is_manual:
+            parser.error("manual playstyles need a player; " +
+                         "pick an AI playstyle")
+
+    start = time.perf_counter()
+    if args.vectorized:
+        from a1_playstyle import RandomPlaystyle
+        from a1_vector_engine import simulate
+        for style in (args.p1_style, args.p2_style):
+            if not issubclass(PLAYSTYLE_CLASSES[style], RandomPlaystyle):
+                parser.error("the vectorized engine only plays random " +
+                             "playstyles")
+        stats = simulate(CHARACTER_CLASSES[args.p1],
+                         CHARACTER_CLASSES[args.p2], args.games, args.seed)
+    else:
+        queue_class = CompactBattleQueue if args.compact_queue \
+            else BattleQueue
+        stats = run_batch(args.p1, args.p2, args.p1_style, args.p2_style,
+                          args.games, queue_class, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print("{} ({}) vs {} ({})".format(
+        CHARACTER_CLASSES[args.p1].__name__, args.p1_style,
+        CHARACTER_CLASSES[args.p2].__name__, args.p2_style))
+    print(stats.report(elapsed))
+
+
+if __name__ == '__main__':
+    main()
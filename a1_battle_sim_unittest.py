@@ -0,0 +1,63 @@
+"""
+Unittests for the headless battle simulator of A1.
+"""
+import unittest
+
+from a1_battle_sim import MatchStats, RESULTS, STALLED, play_game, run_batch
+from a1_characters import Mage, Rogue
+from a1_playstyle import RandomPlaystyle, derive_seed
+
+
+class BattleSimUnitTests(unittest.TestCase):
+    def test_every_game_finishes(self):
+        """
+        Test to make sure every random game between each pair of classes
+        ends without stalling.
+        """
+        for p1 in ['m', 'r']:
+            for p2 in ['m', 'r']:
+                stats = run_batch(p1, p2, 'r', 'r', 200)
+                self.assertEqual(stats.games, 200)
+                self.assertEqual(sum(stats.results.values()), 200)
+                self.assertEqual(stats.results[STALLED], 0,
+                                 ("No game between {} and {} should " +
+                                  "stall.").format(p1, p2))
+
+    def test_seeded_batch_replays(self):
+        """
+        Test to make sure a seeded batch, and any one game in it, can be
+        replayed exactly.
+        """
+        first = run_batch('m', 'r', 'r', 'r', 300, seed=11)
+        second = run_batch('m', 'r', 'r', 'r', 300, seed=11)
+        self.assertEqual(first.results, second.results)
+        self.assertEqual(first.turns, second.turns)
+
+        games = [run_batch('m', 'r', 'r', 'r', 1, seed=11, first_game=i)
+                 for i in range(20)]
+        for i, stats in enumerate(games):
+            result, turns = play_game(Mage, Rogue, RandomPlaystyle,
+                                      RandomPlaystyle,
+                                      seed=derive_seed(11, i))
+            self.assertEqual(stats.results, {result: 1})
+            self.assertEqual(stats.turns, {turns: 1})
+
+    def test_merge(self):
+        """
+        Test to make sure merging two MatchStats adds up their counters.
+        """
+        first = MatchStats()
+        first.record(RESULTS[0], 10)
+        second = MatchStats()
+        second.record(RESULTS[0], 10)
+        second.record(RESULTS[1], 12)
+        first.merge(second)
+
+        self.assertEqual(first.games, 3)
+        self.assertEqual(first.results[RESULTS[0]], 2)
+        self.assertEqual(first.turns, {10: 2, 12: 1})
+        self.assertEqual(first.turn_percentile(0.5), 10)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,434 @@
+"""
+Micro-benchmarks for the battle game.
+
+Run this file to print the results of every benchmark, or pass the names of
+the benchmarks to run, e.g.:
+
+    python a1_benchmarks.py queue
+"""
+import sys
+import timeit
+import tracemalloc
+
+from a1_battle_queue import BattleQueue, CompactBattleQueue
+from a1_characters import Characters, Rogue
+from a1_playstyle import ATTACKS, BufferedRandomPlaystyle, RandomPlaystyle
+
+QUEUE_SIZES = [10, 1000, 100000]
+RUN_LENGTHS = [1, 2, 8, 64]
+COMPACT_TURNS = 100000
+DECISIONS = 100000
+KEY_PRESSES = 15
+BATTLES = 100000
+
+
+class _ListQueue:
+    """The original list-backed queue, kept as a reference point."""
+
+    def __init__(self) -> None:
+        """Initialize this _ListQueue."""
+        self.queue = []
+
+    def add(self, character: object) -> None:
+        """Add character to the back of this _ListQueue."""
+        self.queue.append(character)
+
+    def remove(self) -> object:
+        """Remove and return the character at the front of this _ListQueue."""
+        return self.queue.pop(0)
+
+
+class _DictCharacter:
+    """A character with the same attributes as a Characters, but in a
+    __dict__ rather than __slots__, kept as a reference point."""
+
+    def __init__(self, character: Characters) -> None:
+        """Initialize this _DictCharacter as a copy of character."""
+        for name in Characters.__slots__:
+            setattr(self, name, getattr(character, name))
+
+
+def _dict_battle() -> object:
+    """Return a GameSession whose characters keep their attributes in a
+    __dict__, as they did before Characters had __slots__."""
+    from a1_game import GameSession
+    session = GameSession('r', 'A', 'r', 'm', 'B', 'r')
+    p1, p2 = _DictCharacter(session.p1), _DictCharacter(session.p2)
+    p1.enemy = p2
+    p2.enemy = p1
+    session.p1, session.p2 = p1, p2
+    session.battle_queue.remove()
+    session.battle_queue.remove()
+    session.battle_queue.add(p1)
+    session.battle_queue.add(p2)
+    return session
+
+
+def _time_remove(queue_class: type, size: int, repeat: int = 1000) -> float:
+    """Return the average time in nanoseconds of one remove() followed by
+    one add() on a queue of queue_class holding size entries.
+
+    Re-adding the removed entry keeps the queue at a constant size while it
+    is being timed.
+    """
+    bq = queue_class()
+    for i in range(size):
+        bq.add(i)
+
+    def turn() -> None:
+        """Take one turn off the front of the queue and put it at the back."""
+        bq.add(bq.remove())
+
+    return min(timeit.repeat(turn, number=repeat, repeat=5)) / repeat * 1e9
+
+
+def bench_queue() -> None:
+    """Print the cost of BattleQueue.remove() as the queue grows."""
+    print("queue: ns per remove+add")
+    print("{:>10} {:>12} {:>12}".format("size", "list", "BattleQueue"))
+    for size in QUEUE_SIZES:
+        print("{:>10} {:>12.1f} {:>12.1f}".format(
+            size, _time_remove(_ListQueue, size),
+            _time_remove(BattleQueue, size)))
+
+
+def _queue_cost(queue_class: type, run_length: int) -> tuple:
+    """Return (bytes, ns per add) for adding COMPACT_TURNS turns to a queue
+    of queue_class in runs of run_length turns by the same character.
+    """
+    players = [object(), object()]
+    tracemalloc.start()
+    bq = queue_class()
+    for i in range(COMPACT_TURNS):
+        bq.add(players[i // run_length % 2])
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def fill() -> None:
+        """Add COMPACT_TURNS turns to a new queue."""
+        q = queue_class()
+        for i in range(COMPACT_TURNS):
+            q.add(players[i // run_length % 2])
+
+    elapsed = min(timeit.repeat(fill, number=1, repeat=3))
+    return size, elapsed / COMPACT_TURNS * 1e9
+
+
+def bench_compact() -> None:
+    """Print the memory and add() cost of BattleQueue and CompactBattleQueue
+    for queues with runs of repeated characters.
+    """
+    print("compact: {} turns queued".format(COMPACT_TURNS))
+    print("{:>6} {:>14} {:>14} {:>10} {:>10}".format(
+        "run", "deque bytes", "runs bytes", "deque ns", "runs ns"))
+    for run_length in RUN_LENGTHS:
+        plain_bytes, plain_ns = _queue_cost(BattleQueue, run_length)
+        runs_bytes, runs_ns = _queue_cost(CompactBattleQueue, run_length)
+        print("{:>6} {:>14} {:>14} {:>10.1f} {:>10.1f}".format(
+            run_length, plain_bytes, runs_bytes, plain_ns, runs_ns))
+
+
+def _bytes_per_call(func: callable) -> float:
+    """Return the bytes allocated per call to func, over BATTLES calls whose
+    results are all kept alive at once."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [func() for _ in range(BATTLES)]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return allocated / BATTLES
+
+
+def bench_memory() -> None:
+    """Print the bytes allocated per character, and per battle (a
+    GameSession: its queue, two characters and their playstyles), for
+    BATTLES of them kept alive at once, with the characters' attributes in
+    a __dict__ (as they were) and in __slots__ (as they are now).
+    """
+    from a1_game import GameSession
+
+    rogue = Rogue('A', BattleQueue(), None)
+    print("memory: bytes, {} live battles".format(BATTLES))
+    print("{:>32} {:>10} {:>10}".format("", "__dict__", "__slots__"))
+    print("{:>32} {:>10.0f} {:>10.0f}".format(
+        "per character", _bytes_per_call(lambda: _DictCharacter(rogue)),
+        _bytes_per_call(lambda: Rogue('A', rogue.bq, None))))
+    print("{:>32} {:>10.0f} {:>10.0f}".format(
+        "per battle", _bytes_per_call(_dict_battle),
+        _bytes_per_call(lambda: GameSession('r', 'A', 'r', 'm', 'B', 'r'))))
+
+
+def _original_choice() -> str:
+    """The random draw of the original RandomPlaystyle.select_attack."""
+    import random
+    attacks = ['A', 'S']
+    return random.choice(attacks)
+
+
+def _time_per_call(func: callable) -> float:
+    """Return the best average time in nanoseconds of one call to func."""
+    return min(timeit.repeat(func, number=DECISIONS, repeat=5)) / \
+        DECISIONS * 1e9
+
+
+def bench_random() -> None:
+    """Print the per-decision cost of the random draw alone, and of a whole
+    select_action() call, for RandomPlaystyle and BufferedRandomPlaystyle.
+    """
+    bq = BattleQueue()
+    plain = RandomPlaystyle(bq)
+    buffered = BufferedRandomPlaystyle(bq)
+    bq.add(Rogue('P1', bq, plain))
+
+    def buffered_choice() -> str:
+        """The random draw of BufferedRandomPlaystyle.select_action."""
+        try:
+            return next(buffered._choices)
+        except StopIteration:
+            buffered._choices = iter(buffered._draw_block())
+            return next(buffered._choices)
+
+    print("random: ns per decision")
+    for label, func in [("original draw", _original_choice),
+                        ("RandomPlaystyle draw",
+                         lambda: plain.rng.choice(ATTACKS)),
+                        ("BufferedRandomPlaystyle draw", buffered_choice),
+                        ("RandomPlaystyle select", plain.select_action),
+                        ("BufferedRandomPlaystyle select",
+                         buffered.select_action)]:
+        print("{:>32} {:>10.1f}".format(label, _time_per_call(func)))
+
+
+def bench_startup() -> None:
+    """Print how long a1_ui.load_assets takes with the sprites decoded from
+    the PNGs one by one, and with them mapped from the packed atlas.
+
+    The atlas is built from a copy of the sprites in a temporary directory,
+    so the one in sprites/ is left as it is.
+    """
+    import os
+    import shutil
+    import tempfile
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import a1_atlas
+    import a1_ui
+
+    pygame.init()
+    pygame.display.set_mode((a1_ui.NUMBER_OF_CHARACTERS *
+                             a1_ui.CHARACTER_SIZE,
+                             a1_ui.CHARACTER_SIZE + a1_ui.PADDING * 2))
+    sprite_directory = a1_ui.SPRITE_DIRECTORY
+    copy = tempfile.TemporaryDirectory()
+    for file_name in os.listdir(sprite_directory):
+        if os.path.splitext(file_name)[1] == '.png' and \
+                file_name != a1_atlas.ATLAS_IMAGE:
+            shutil.copy(os.path.join(sprite_directory, file_name), copy.name)
+    a1_atlas.build_atlas(copy.name)
+    a1_ui.SPRITE_DIRECTORY = copy.name
+    load_atlas = a1_atlas.load_atlas
+
+    print("startup: ms per load_assets")
+    for label, loader in [("PNGs", lambda directory: None),
+                          ("atlas", load_atlas)]:
+        a1_atlas.load_atlas = loader
+        elapsed = min(timeit.repeat(a1_ui.load_assets, number=1, repeat=10))
+        print("{:>32} {:>10.2f}".format(label, elapsed * 1e3))
+    a1_atlas.load_atlas = load_atlas
+    a1_ui.SPRITE_DIRECTORY = sprite_directory
+    copy.cleanup()
+    pygame.quit()
+
+
+def _start_ui() -> object:
+    """Open a1_ui on the dummy video driver with a Mage and a Rogue, both
+    played manually, and return the a1_ui module.
+    """
+    import os
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import a1_game
+    import a1_ui
+
+    pygame.init()
+    a1_ui.PYGAME_SCREEN = pygame.display.set_mode(
+        (a1_ui.NUMBER_OF_CHARACTERS * a1_ui.CHARACTER_SIZE,
+         a1_ui.CHARACTER_SIZE + a1_ui.PADDING * 2))
+    a1_ui.load_assets()
+    a1_ui.DRAWN.clear()
+
+    a1_game.set_up_game_with('m', 'A', 'm', 'r', 'B', 'm')
+    return a1_ui
+
+
+def bench_frame() -> None:
+    """Print the cost of one a1_ui.update_game() call at steady state (the
+    characters idling, nothing else changing) when only the changed regions
+    are redrawn, and when the whole screen is.
+    """
+    a1_ui = _start_ui()
+
+    def full_frame() -> None:
+        """Draw a frame as if nothing were on the screen yet."""
+        a1_ui.DRAWN.clear()
+        a1_ui.update_game()
+
+    print("frame: us per update_game")
+    for label, func in [("changed regions", a1_ui.update_game),
+                        ("whole screen", full_frame)]:
+        elapsed = min(timeit.repeat(func, number=1000, repeat=5))
+        print("{:>32} {:>10.1f}".format(label, elapsed * 1e3))
+    print("text cache: {}".format(a1_ui.TEXT_CACHE))
+
+
+def bench_text() -> None:
+    """Print the cost of rendering the HUD lines of one frame with a bare
+    font, and through a1_ui.TextCache.
+    """
+    import pygame
+    a1_ui = _start_ui()
+    lines = ["A", "HP: 100", "SP: 100", "B", "HP: 100", "SP: 100",
+             "Current Character: A", "Available Actions: A, S"]
+    font = pygame.font.SysFont(pygame.font.get_default_font(),
+                               a1_ui.FONT_SIZE)
+    cache = a1_ui.TextCache()
+
+    def uncached() -> None:
+        """Render the HUD lines with the font."""
+        for line in lines:
+            font.render(line, True, a1_ui.TEXT_COLOR)
+
+    def cached() -> None:
+        """Render the HUD lines through the cache."""
+        for line in lines:
+            cache.render(line)
+
+    print("text: us per frame of HUD lines")
+    for label, func in [("font.render", uncached),
+                        ("TextCache.render", cached)]:
+        elapsed = min(timeit.repeat(func, number=1000, repeat=5))
+        print("{:>32} {:>10.1f}".format(label, elapsed * 1e3))
+    print("text cache: {}".format(cache))
+
+
+def _poll_loop(a1_ui: object, scheduler: object, latency: object) -> None:
+    """The main loop as it was before run_loop: sleep GAME_SPEED ms, then
+    handle every queued event.
+    """
+    import pygame
+    while True:
+        pygame.time.wait(a1_ui.GAME_SPEED)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return
+            if event.type == pygame.KEYDOWN:
+                a1_ui.handle_key(event.key)
+        scheduler.run_pending()
+
+
+def bench_input() -> None:
+    """Print the latency from posting a key press to the move it makes, for
+    a1_ui.run_loop and for a loop that polls every GAME_SPEED ms.
+    """
+    import random
+    import threading
+    import time
+    import pygame
+    import a1_game
+    from a1_scheduler import LatencyRecorder, Scheduler
+
+    def press_keys(posted: list) -> None:
+        """Press 'a' KEY_PRESSES times at random moments, then quit."""
+        rng = random.Random(0)
+        for _ in range(KEY_PRESSES):
+            time.sleep(rng.uniform(0.02, 0.15))
+            posted.append(time.perf_counter())
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN,
+                                                 key=pygame.K_a))
+        time.sleep(0.2)
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    print("input: ms from key press to move, {} presses".format(KEY_PRESSES))
+    for label, loop in [("run_loop", None), ("poll", _poll_loop)]:
+        a1_ui = _start_ui()
+        perform_attack = a1_game.perform_attack
+        moved = []
+
+        def timed_attack() -> None:
+            """Make the move, and note when it was made."""
+            perform_attack()
+            moved.append(time.perf_counter())
+
+        a1_game.perform_attack = timed_attack
+        scheduler = Scheduler()
+        scheduler.every(a1_ui.GAME_SPEED / 1000, a1_ui.update_game)
+        posted = []
+        presser = threading.Thread(target=press_keys, args=(posted,))
+        presser.start()
+        if loop is None:
+            a1_ui.run_loop(scheduler, LatencyRecorder())
+        else:
+            loop(a1_ui, scheduler, LatencyRecorder())
+        presser.join()
+        a1_game.perform_attack = perform_attack
+
+        latency = LatencyRecorder()
+        for pressed, done in zip(posted, moved):
+            latency.record(done - pressed)
+        print("{:>10} {}".format(label, latency))
+
+
+def bench_batch() -> None:
+    """Print the per-battle cost of deciding the moves of DECISIONS battles
+    with one action_for() call per battle, and with one select_actions()
+    call for all of them, for RandomPlaystyle and SolvedPlaystyle.
+    """
+    import tempfile
+    import numpy as np
+    from a1_characters import MAGE_STATS, ROGUE_STATS
+    from a1_playstyle import SolvedPlaystyle
+    from a1_solver import reachable_states
+    from a1_state import Matchup
+
+    matchup = Matchup(MAGE_STATS, ROGUE_STATS)
+    # Every state of a Mage's battles against a Rogue in which the Mage is
+    # to move, over and over.
+    moving = [state for state in reachable_states(matchup)
+              if matchup.mover(state) == 0]
+    states = (moving * (DECISIONS // len(moving) + 1))[:DECISIONS]
+    array = np.array(states, np.uint64)
+
+    # The table is solved into a temporary directory, so none is left
+    # behind.
+    tables = tempfile.TemporaryDirectory()
+    print("batch: ns per battle")
+    for playstyle in [RandomPlaystyle(None),
+                      SolvedPlaystyle(None, directory=tables.name)]:
+        action_for = playstyle.action_for
+        name = type(playstyle).__name__
+        for label, func in [
+                ("{} action_for".format(name),
+                 lambda: [action_for(matchup, state) for state in states]),
+                ("{} select_actions".format(name),
+                 lambda: playstyle.select_actions(matchup, array))]:
+            elapsed = min(timeit.repeat(func, number=1, repeat=5))
+            print("{:>32} {:>10.1f}".format(label,
+                                            elapsed / DECISIONS * 1e9))
+    tables.cleanup()
+
+
+BENCHMARKS = {'queue': bench_queue,
+              'compact': bench_compact,
+              'random': bench_random,
+              'startup': bench_startup,
+              'frame': bench_frame,
+              'text': bench_text,
+              'input': bench_input,
+              'batch': bench_batch,
+              'memory': bench_memory}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or list(BENCHMARKS):
+        BENCHMARKS[name]()
@@ -2,611 +2,312 @@
 The classes for the two types of the characters in the game.
 Namely, Rogue and Mage
 
+Every character class is defined by data: a CharacterStats record that holds
+its defense, the cost and damage of both of its attacks and who its special
+attack adds to the battle queue. The methods of Characters look everything
+up in the record of the character's class, so a new class needs no code of
+its own (see make_character_class), and the same records drive
+a1_vector_engine.
 """
-from typing import List
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# The number of sprites in every animation.
+FRAMES_PER_ANIMATION = 10
+
+# The animation states, with the name their sprites use and the state each
+# animation moves on to after its last frame.
+ANIMATION_STATES = {"idle": ("idle", "idle"),
+                    "attack": ("attack", "idle"),
+                    "sp_attack": ("special", "idle")}
+
+# The animation of every character class, keyed by (sprite prefix,
+# animation state). Every row holds the sprites shown for curr_state -1 to
+# FRAMES_PER_ANIMATION - 1 in order (the last one being the first idle
+# sprite, shown while the animation moves on) and the state it moves on to.
+AnimationRow = Tuple[Tuple[str, ...], str]
+ANIMATIONS: Dict[Tuple[str, str], AnimationRow] = {}
+
+
+def add_animations(sprite_prefix: str) -> Dict[str, AnimationRow]:
+    """Add the rows of ANIMATIONS for a character class whose sprites are
+    named sprite_prefix + "_" + animation + "_" + frame number, and return
+    them keyed by animation state alone. Classes that share a sprite_prefix
+    share its rows.
+
+    >>> rows = add_animations("rogue")
+    >>> rows["attack"][0][9:]
+    ('rogue_attack_9', 'rogue_idle_0')
+    >>> rows["attack"] is ANIMATIONS["rogue", "attack"]
+    True
+    """
+    rows = {}
+    for state, (sprite_name, next_state) in ANIMATION_STATES.items():
+        if (sprite_prefix, state) in ANIMATIONS:
+            rows[state] = ANIMATIONS[sprite_prefix, state]
+            continue
+        frames = tuple("{}_{}_{}".format(sprite_prefix, sprite_name, i)
+                       for i in range(FRAMES_PER_ANIMATION))
+        rows[state] = ANIMATIONS[sprite_prefix, state] = (
+            frames + ("{}_idle_0".format(sprite_prefix),), next_state)
+    return rows
+
+
+# Who an attack adds to the back of the battle queue, relative to the
+# attacker.
+SELF = 0
+ENEMY = 1
+
+# The actions a character can make, as used from the playstyles through to
+# the attack itself. Every action is a bit, so the actions a character has
+# enough SP for are one int (a mask), and an action is valid if its bit is
+# in the mask. The keys 'A', 'S' and 'X' are only used where a player or the
+# UI is involved.
+NO_ACTION = 0
+ATTACK = 1
+SPECIAL = 2
+ACTIONS = (ATTACK, SPECIAL)
+ACTION_KEYS = {NO_ACTION: 'X', ATTACK: 'A', SPECIAL: 'S'}
+KEY_ACTIONS = {'A': ATTACK, 'S': SPECIAL}
+
+
+class CharacterStats(NamedTuple):
+    """The numbers that define how a character class fights.
+
+    special_queue - Who the special attack adds to the back of the battle
+                    queue, in order, as SELF or ENEMY. (A normal attack
+                    always adds the attacker.)
+    """
+    defense: int
+    attack_cost: int
+    attack_damage: int
+    special_cost: int
+    special_damage: int
+    special_queue: Tuple[int, ...]
+
+
+ROGUE_STATS = CharacterStats(defense=10, attack_cost=3, attack_damage=15,
+                             special_cost=10, special_damage=20,
+                             special_queue=(SELF, SELF))
+MAGE_STATS = CharacterStats(defense=8, attack_cost=5, attack_damage=20,
+                            special_cost=30, special_damage=40,
+                            special_queue=(ENEMY, SELF))
 
 
 class Characters:
-    """A superclass for the two types of characters."""
+    """A superclass for every type of character.
 
-    def __init__(self) -> None:
-        """Initializes the Character"""
-        self.hp = 100
-        self.sp = 100
-        self.defense = 0
-        self.enemy = None
+    Every subclass sets stats, sprite_prefix, and animations to its rows of
+    ANIMATIONS keyed by animation state.
 
-    def get_hp(self) -> int:
-        """Returns the HealthPoints of the chrarcter.
-        >>> c = Characters()
-        >>> c.get_hp()
-        100
-        """
-        raise NotImplementedError
-
-    def get_sp(self) -> int:
-        """Returns the SkillPoints of the character.
-        >>> c = Characters()
-        >>> c.get_sp()
-        100"""
-        raise NotImplementedError
-
-
-class Rogue(Characters):
-    """The class containing the Rogue character.
+    Characters keep their attributes in __slots__ rather than a __dict__, so
+    a subclass must declare __slots__ too (empty, unless it adds attributes).
 
     Attributes:
         - Name (name): The name of the Character
         - BattleQueue (bq): The BattleQueue used for the game
-        - Playstyle (play): The playstyle used by the Character
+        - Playstyle (playstyle): The playstyle used by the Character
         - HealthPoints (hp): Contains the health of the character
         - SkillPoints (sp): Contains the skill points of the character
+        - Action Mask (action_mask): The actions the character has enough
+         SkillPoints for, kept up to date whenever sp is set.
         - Defense (defense): Contains the defense stats of a character.
         - Enenmy (enemy): The enemy of the player in the game
         - Animation State (animation_state): Keeps the track of the character's
          current animation state.
         - Current State (curr_state): Keeps track of the sprites.
-        """
+    """
+    __slots__ = ('name', 'bq', 'playstyle', 'enemy', 'hp', '_sp',
+                 'action_mask', 'defense', 'animation_state', 'curr_state')
+    stats: CharacterStats
+    sprite_prefix: str
+    animations: Dict[str, AnimationRow]
 
     def __init__(self, name: str, bq: 'BattleQueue', play: 'Playstyle') -> None:
-        """Initializes the Rogue character with the given (name) and given
+        """Initializes the character with the given (name) and given
         Playstyle(play)"""
-
         self.name = name
         self.bq = bq
         self.playstyle = play
         self.enemy = None
         self.hp = 100
         self.sp = 100
-        self.defense = 10
+        self.defense = self.stats.defense
         self.animation_state = "idle"
         self.curr_state = -1
 
+    @property
+    def sp(self) -> int:
+        """The SkillPoints of the character."""
+        return self._sp
+
+    @sp.setter
+    def sp(self, sp: int) -> None:
+        """Set the SkillPoints of the character to sp, and recompute the
+        actions it has enough SkillPoints for."""
+        stats = self.stats
+        self._sp = sp
+        self.action_mask = (ATTACK if sp >= stats.attack_cost else NO_ACTION) \
+            | (SPECIAL if sp >= stats.special_cost else NO_ACTION)
+
     def get_hp(self) -> int:
-        """Returns the HealthPoints of the chrarcter.
-        >>> c = Rogue()
-        >>> c.get_hp()
+        """Returns the HealthPoints of the character.
+        >>> r = Rogue("Dhruv", None, None)
+        >>> r.get_hp()
         100
         """
         return self.hp
 
     def get_sp(self) -> int:
-        """Returns the HealthPoints of the chrarcter.
-        >>> c = Rogue()
-        >>> c.get_sp()
+        """Returns the SkillPoints of the character.
+        >>> m = Mage("Dhruv", None, None)
+        >>> m.get_sp()
         100
         """
-        return self.sp
+        return self._sp
 
     def get_name(self) -> str:
         """Returns the name of the character.
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Rogue("Dhruv", bq, ps)
+        >>> r = Rogue("Dhruv", None, None)
         >>> r.get_name()
         'Dhruv'
         """
         return self.name
 
-    def attack(self) -> None:
-        """Allows the rogue to attack once using certain SP.
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Rogue("Dhruv", bq, ps)
-        >>> p = Rogue("Satish", bq, ps)
-        >>> r.enemy = p
-        >>> p.enemy = r
-        >>> r.attack()
-        >>> p.get_hp()
-        95
-        """
-        self.animation_state = "attack"
-        self.curr_state = -1
-        self.bq.add(self)
-        self.sp -= 3
-        self.enemy.hp -= (15 - self.enemy.defense)
-        if self.enemy.hp <= 0:
-            self.enemy.hp = 0
-
-    def special_attack(self) -> None:
-        """Allows the rogue to perform a special attack once using
-        certain SP.
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Rogue("Dhruv", bq, ps)
-        >>> p = Rogue("Satish", bq, ps)
-        >>> r.enemy = p
-        >>> p.enemy = r
-        >>> r.special_attack()
-        >>> p.get_hp()
-        90
-        """
-        self.animation_state = "sp_attack"
-        self.curr_state = -1
-        self.bq.add(self)
-        self.bq.add(self)
-        self.sp -= 10
-        self.enemy.hp -= (20 - self.enemy.defense)
-        if self.enemy.hp <= 0:
-            self.enemy.hp = 0
-
-    def is_valid_action(self, action: str) -> bool:
-        """Returns wheter the given (action) is valid or no depending upon
-        the available SkillPoints.
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Rogue("Dhruv", bq, ps)
-        >>> r.is_valid_action("A")
-        True
-        """
-
-        if action == 'A':
-            return self.sp >= 3
-        if action == 'S':
-            return self.sp >= 10
-
-    def get_available_actions(self) -> List[str]:
-        """Returns a list of all the possible actions depending upon the
-         available SkillPoints.
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Rogue("Dhruv", bq, ps)
-        >>> r.get_available_actions()
-        ['A', 'S']
-        """
-
-        available_actions = []
-        if self.sp >= 10:
-            available_actions.append("A")
-            available_actions.append("S")
-        elif 3 <= self.sp < 10:
-            available_actions.append("A")
-        return available_actions
-
-    def __repr__(self) -> str:
-        """Returns a representation of the character
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Rogue("Dhruv", bq, ps)
-        >>> r
-        Dhruv (Rogue): 100/100
-        """
-
-        string = '{} (Rogue): {}/{}'.format(self.name, self.hp, self.sp)
-        return string
-
-    def idle_helper(self) -> str:
-        """Helper Method for Idel state"""
-
-        idle = ["rogue_idle_0", "rogue_idle_1", "rogue_idle_2", "rogue_idle_3",
-                "rogue_idle_4", "rogue_idle_5", "rogue_idle_6", "rogue_idle_7",
-                "rogue_idle_8", "rogue_idle_9"]
-
-        if self.curr_state == -1:
-            self.curr_state += 1
-            return idle[0]
-        if self.curr_state == 0:
-            self.curr_state += 1
-            return idle[1]
-        if self.curr_state == 1:
-            self.curr_state += 1
-            return idle[2]
-        if self.curr_state == 2:
-            self.curr_state += 1
-            return idle[3]
-        if self.curr_state == 3:
-            self.curr_state += 1
-            return idle[4]
-        if self.curr_state == 4:
-            self.curr_state += 1
-            return idle[5]
-        if self.curr_state == 5:
-            self.curr_state += 1
-            return idle[6]
-        if self.curr_state == 6:
-            self.curr_state += 1
-            return idle[7]
-        if self.curr_state == 7:
-            self.curr_state += 1
-            return idle[8]
-        if self.curr_state == 8:
-            self.curr_state += 1
-            return idle[9]
-        if self.curr_state == 9:
-            self.curr_state = -1
-            return idle[0]
-
-    def attack_helper(self) -> str:
-        """Helper method for attack state"""
-
-        attack = ["rogue_attack_0", "rogue_attack_1", "rogue_attack_2",
-                  "rogue_attack_3", "rogue_attack_4", "rogue_attack_5",
-                  "rogue_attack_6", "rogue_attack_7", "rogue_attack_8",
-                  "rogue_attack_9"]
-        idle = ["rogue_idle_0", "rogue_idle_1", "rogue_idle_2", "rogue_idle_3",
-                "rogue_idle_4", "rogue_idle_5", "rogue_idle_6", "rogue_idle_7",
-                "rogue_idle_8", "rogue_idle_9"]
-
-        if self.curr_state == -1:
-            self.curr_state += 1
-            return attack[0]
-        if self.curr_state == 0:
-            self.curr_state += 1
-            return attack[1]
-        if self.curr_state == 1:
-            self.curr_state += 1
-            return attack[2]
-        if self.curr_state == 2:
-            self.curr_state += 1
-            return attack[3]
-        if self.curr_state == 3:
-            self.curr_state += 1
-            return attack[4]
-        if self.curr_state == 4:
-            self.curr_state += 1
-            return attack[5]
-        if self.curr_state == 5:
-            self.curr_state += 1
-            return attack[6]
-        if self.curr_state == 6:
-            self.curr_state += 1
-            return attack[7]
-        if self.curr_state == 7:
-            self.curr_state += 1
-            return attack[8]
-        if self.curr_state == 8:
-            self.curr_state += 1
-            return attack[9]
-        if self.curr_state == 9:
-            self.curr_state = -1
-            self.animation_state = "idle"
-            return idle[0]
-
-    def sp_attack_helper(self) -> str:
-        """Helper method for Sp_attack state"""
-        sp_attack = ["rogue_special_0", "rogue_special_1", "rogue_special_2",
-                     "rogue_special_3", "rogue_special_4", "rogue_special_5",
-                     "rogue_special_6", "rogue_special_7", "rogue_special_8",
-                     "rogue_special_9"]
-        idle = ["rogue_idle_0", "rogue_idle_1", "rogue_idle_2", "rogue_idle_3",
-                "rogue_idle_4", "rogue_idle_5", "rogue_idle_6", "rogue_idle_7",
-                "rogue_idle_8", "rogue_idle_9"]
-
-        if self.curr_state == -1:
-            self.curr_state += 1
-            return sp_attack[0]
-        if self.curr_state == 0:
-            self.curr_state += 1
-            return sp_attack[1]
-        if self.curr_state == 1:
-            self.curr_state += 1
-            return sp_attack[2]
-        if self.curr_state == 2:
-            self.curr_state += 1
-            return sp_attack[3]
-        if self.curr_state == 3:
-            self.curr_state += 1
-            return sp_attack[4]
-        if self.curr_state == 4:
-            self.curr_state += 1
-            return sp_attack[5]
-        if self.curr_state == 5:
-            self.curr_state += 1
-            return sp_attack[6]
-        if self.curr_state == 6:
-            self.curr_state += 1
-            return sp_attack[7]
-        if self.curr_state == 7:
-            self.curr_state += 1
-            return sp_attack[8]
-        if self.curr_state == 8:
-            self.curr_state += 1
-            return sp_attack[9]
-        if self.curr_state == 9:
-            self.curr_state = -1
-            self.animation_state = "idle"
-            return idle[0]
-
     def get_next_sprite(self) -> str:
-        """Returns the correct sprites for the surrent animation state of the
-        character."""
-
-        if self.animation_state == "idle":
-            return self.idle_helper()
-
-        elif self.animation_state == "attack":
-            return self.attack_helper()
-
-        elif self.animation_state == "sp_attack":
-            return self.sp_attack_helper()
-
-
-class Mage(Characters):
-    """The class containing the Rogue character.
-
-    Attributes:
-        - Name (name): The name of the Character
-        - BattleQueue (bq): The BattleQueue used for the game
-        - Playstyle (play): The playstyle used by the Character
-        - HealthPoints (hp): Contains the health of the character
-        - SkillPoints (sp): Contains the skill points of the character
-        - Defense (defense): Contains the defense stats of a character.
-        - Enenmy (enemy): The enemy of the player in the game
-        - Animation State (animation_state): Keeps the track of the character's
-         current animation state.
-        - Current State (curr_state): Keeps track of the sprites.
+        """Returns the correct sprites for the current animation state of the
+        character, moving on to the next animation state after the last
+        frame.
+        >>> r = Rogue("Dhruv", None, None)
+        >>> r.get_next_sprite()
+        'rogue_idle_0'
         """
-
-    def __init__(self, name: str, bq: 'BattleQueue', play: 'Playstyle') -> None:
-        """Initializes the Rogue character with the given (name) and given
-        Playstyle(play)"""
-
-        self.name = name
-        self.bq = bq
-        self.playstyle = play
-        self.enemy = None
-        self.hp = 100
-        self.sp = 100
-        self.defense = 8
-        self.animation_state = "idle"
-        self.curr_state = -1
-
-    def get_hp(self) -> int:
-        """Returns the HealthPoints of the chrarcter.
-        >>> c = Mage()
-        >>> c.get_hp()
-        100
-        """
-        return self.hp
-
-    def get_sp(self) -> int:
-        """Returns the HealthPoints of the chrarcter.
-        >>> c = Mage()
-        >>> c.get_sp()
-        100
-        """
-        return self.sp
-
-    def get_name(self) -> str:
-        """Returns the name of the character.
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Mage("Dhruv", bq, ps)
-        >>> r.get_name()
-        'Dhruv'"""
-        return self.name
+        frames, next_state = self.animations[self.animation_state]
+        frame = self.curr_state + 1
+        if frame == FRAMES_PER_ANIMATION:
+            self.curr_state = -1
+            self.animation_state = next_state
+        else:
+            self.curr_state = frame
+        return frames[frame]
 
     def attack(self) -> None:
-        """Allows the rogue to attack once using certain SP.
+        """Allows the character to attack once using certain SP.
+        >>> from a1_battle_queue import BattleQueue
         >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Mage("Dhruv", bq, ps)
-        >>> p = Mage("Satish", bq, ps)
-        >>> r.enemy = p
-        >>> p.enemy = r
+        >>> r = Rogue("Dhruv", bq, None)
+        >>> m = Mage("Satish", bq, None)
+        >>> r.enemy = m
+        >>> m.enemy = r
         >>> r.attack()
-        >>> p.get_hp()
-        88
+        >>> m.get_hp(), r.get_sp()
+        (93, 97)
         """
+        stats = self.stats
+        enemy = self.enemy
         self.animation_state = "attack"
         self.curr_state = -1
         self.bq.add(self)
-        self.sp -= 5
-        self.enemy.hp -= (20 - self.enemy.defense)
-        if self.enemy.hp <= 0:
-            self.enemy.hp = 0
+        self.sp -= stats.attack_cost
+        enemy.hp -= (stats.attack_damage - enemy.defense)
+        if enemy.hp <= 0:
+            enemy.hp = 0
+        self.bq.update_status(self)
 
     def special_attack(self) -> None:
-        """Allows the rogue to perform a special attack once using
-        certain SP.
+        """Allows the character to perform a special attack once using
+        certain SP, adding the characters in its special_queue to the battle
+        queue.
+        >>> from a1_battle_queue import BattleQueue
         >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Mage("Dhruv", bq, ps)
-        >>> p = Mage("Satish", bq, ps)
-        >>> r.enemy = p
-        >>> p.enemy = r
-        >>> r.special_attack()
-        >>> p.get_hp()
-        68
+        >>> r = Rogue("Dhruv", bq, None)
+        >>> m = Mage("Satish", bq, None)
+        >>> r.enemy = m
+        >>> m.enemy = r
+        >>> m.special_attack()
+        >>> r.get_hp(), m.get_sp()
+        (70, 70)
+        >>> [character.get_name() for character in bq]
+        ['Dhruv', 'Satish']
         """
+        stats = self.stats
+        enemy = self.enemy
         self.animation_state = "sp_attack"
         self.curr_state = -1
-        self.bq.add(self.enemy)
-        self.bq.add(self)
-        self.sp -= 30
-        self.enemy.hp -= (40 - self.enemy.defense)
-        if self.enemy.hp <= 0:
-            self.enemy.hp = 0
+        for who in stats.special_queue:
+            self.bq.add(enemy if who == ENEMY else self)
+        self.sp -= stats.special_cost
+        enemy.hp -= (stats.special_damage - enemy.defense)
+        if enemy.hp <= 0:
+            enemy.hp = 0
+        self.bq.update_status(self)
 
     def is_valid_action(self, action: str) -> bool:
-        """Returns wheter the given (action) is valid or no depending upon
-        the available SkillPoints.a
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Mage("Dhruv", bq, ps)
-        >>> r.is_valid_action("A")
-        True
+        """Returns wheter the given (action) key is valid or no depending
+        upon the available SkillPoints. (The turn itself checks the action
+        against action_mask.)
+        >>> m = Mage("Dhruv", None, None)
+        >>> m.sp = 20
+        >>> m.is_valid_action("A"), m.is_valid_action("S")
+        (True, False)
         """
-
-        if action == 'A':
-            return self.sp >= 5
-        if action == 'S':
-            return self.sp >= 30
+        return bool(KEY_ACTIONS.get(action, NO_ACTION) & self.action_mask)
 
     def get_available_actions(self) -> List[str]:
-        """Returns a list of all the possible actions depending upon the
-         available SkillPoints.
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Mage("Dhruv", bq, ps)
+        """Returns a new list of the keys of all the possible actions
+        depending upon the available SkillPoints.
+        >>> r = Rogue("Dhruv", None, None)
         >>> r.get_available_actions()
         ['A', 'S']
+        >>> r.sp = 5
+        >>> r.get_available_actions()
+        ['A']
         """
-
-        available_actions = []
-        if self.sp >= 30:
-            available_actions.append("A")
-            available_actions.append("S")
-        elif 5 <= self.sp < 30:
-            available_actions.append("A")
-        return available_actions
+        mask = self.action_mask
+        return [ACTION_KEYS[action] for action in ACTIONS if action & mask]
 
     def __repr__(self) -> str:
         """Returns a representation of the character
-        >>> bq = BattleQueue()
-        >>> ps = Playstyle(bq)
-        >>> r = Mage("Dhruv", bq, ps)
-        >>> r
+        >>> Mage("Dhruv", None, None)
         Dhruv (Mage): 100/100
         """
+        return '{} ({}): {}/{}'.format(self.name, type(self).__name__,
+                                       self.hp, self._sp)
 
-        string = "{} (Mage): {}/{}".format(self.name, self.hp, self.sp)
-        return string
-
-    def idle_helper(self) -> str:
-        """Helper Method for Idel state"""
-
-        idle = ["mage_idle_0", "mage_idle_1", "mage_idle_2", "mage_idle_3",
-                "mage_idle_4", "mage_idle_5", "mage_idle_6", "mage_idle_7",
-                "mage_idle_8", "mage_idle_9"]
-
-        if self.curr_state == -1:
-            self.curr_state += 1
-            return idle[0]
-        if self.curr_state == 0:
-            self.curr_state += 1
-            return idle[1]
-        if self.curr_state == 1:
-            self.curr_state += 1
-            return idle[2]
-        if self.curr_state == 2:
-            self.curr_state += 1
-            return idle[3]
-        if self.curr_state == 3:
-            self.curr_state += 1
-            return idle[4]
-        if self.curr_state == 4:
-            self.curr_state += 1
-            return idle[5]
-        if self.curr_state == 5:
-            self.curr_state += 1
-            return idle[6]
-        if self.curr_state == 6:
-            self.curr_state += 1
-            return idle[7]
-        if self.curr_state == 7:
-            self.curr_state += 1
-            return idle[8]
-        if self.curr_state == 8:
-            self.curr_state += 1
-            return idle[9]
-        if self.curr_state == 9:
-            self.curr_state = -1
-            return idle[0]
-
-    def attack_helper(self) -> str:
-        """Helper method for attack state"""
-
-        attack = ["mage_attack_0", "mage_attack_1", "mage_attack_2",
-                  "mage_attack_3", "mage_attack_4", "mage_attack_5",
-                  "mage_attack_6", "mage_attack_7", "mage_attack_8",
-                  "mage_attack_9"]
-        idle = ["mage_idle_0", "mage_idle_1", "mage_idle_2", "mage_idle_3",
-                "mage_idle_4", "mage_idle_5", "mage_idle_6", "mage_idle_7",
-                "mage_idle_8", "mage_idle_9"]
-
-        if self.curr_state == -1:
-            self.curr_state += 1
-            return attack[0]
-        if self.curr_state == 0:
-            self.curr_state += 1
-            return attack[1]
-        if self.curr_state == 1:
-            self.curr_state += 1
-            return attack[2]
-        if self.curr_state == 2:
-            self.curr_state += 1
-            return attack[3]
-        if self.curr_state == 3:
-            self.curr_state += 1
-            return attack[4]
-        if self.curr_state == 4:
-            self.curr_state += 1
-            return attack[5]
-        if self.curr_state == 5:
-            self.curr_state += 1
-            return attack[6]
-        if self.curr_state == 6:
-            self.curr_state += 1
-            return attack[7]
-        if self.curr_state == 7:
-            self.curr_state += 1
-            return attack[8]
-        if self.curr_state == 8:
-            self.curr_state += 1
-            return attack[9]
-        if self.curr_state == 9:
-            self.curr_state = -1
-            self.animation_state = "idle"
-            return idle[0]
-
-    def sp_attack_helper(self) -> str:
-        """Helper method for Sp_attack state"""
-        sp_attack = ["mage_special_0", "mage_special_1", "mage_special_2",
-                     "mage_special_3", "mage_special_4", "mage_special_5",
-                     "mage_special_6", "mage_special_7", "mage_special_8",
-                     "mage_special_9"]
-        idle = ["mage_idle_0", "mage_idle_1", "mage_idle_2", "mage_idle_3",
-                "mage_idle_4", "mage_idle_5", "mage_idle_6", "mage_idle_7",
-                "mage_idle_8", "mage_idle_9"]
-
-        if self.curr_state == -1:
-            self.curr_state += 1
-            return sp_attack[0]
-        if self.curr_state == 0:
-            self.curr_state += 1
-            return sp_attack[1]
-        if self.curr_state == 1:
-            self.curr_state += 1
-            return sp_attack[2]
-        if self.curr_state == 2:
-            self.curr_state += 1
-            return sp_attack[3]
-        if self.curr_state == 3:
-            self.curr_state += 1
-            return sp_attack[4]
-        if self.curr_state == 4:
-            self.curr_state += 1
-            return sp_attack[5]
-        if self.curr_state == 5:
-            self.curr_state += 1
-            return sp_attack[6]
-        if self.curr_state == 6:
-            self.curr_state += 1
-            return sp_attack[7]
-        if self.curr_state == 7:
-            self.curr_state += 1
-            return sp_attack[8]
-        if self.curr_state == 8:
-            self.curr_state += 1
-            return sp_attack[9]
-        if self.curr_state == 9:
-            self.curr_state = -1
-            self.animation_state = "idle"
-            return idle[0]
 
-    def get_next_sprite(self) -> str:
-        """Returns the correct sprites for the surrent animation state of the
-        character."""
-
-        if self.animation_state == "idle":
-            return self.idle_helper()
+class Rogue(Characters):
+    """The class containing the Rogue character."""
+    __slots__ = ()
+    stats = ROGUE_STATS
+    sprite_prefix = "rogue"
+    animations = add_animations(sprite_prefix)
 
-        elif self.animation_state == "attack":
-            return self.attack_helper()
 
-        elif self.animation_state == "sp_attack":
-            return self.sp_attack_helper()
+class Mage(Characters):
+    """The class containing the Mage character."""
+    __slots__ = ()
+    stats = MAGE_STATS
+    sprite_prefix = "mage"
+    animations = add_animations(sprite_prefix)
+
+
+def make_character_class(name: str, stats: CharacterStats,
+                         sprite_prefix: Optional[str] = None) -> type:
+    """Return a new character class called name that fights with stats and
+    is drawn with the sprites named sprite_prefix (name in lower case by
+    default), e.g. to add to the roster or to try out a balance change.
+
+    >>> Knight = make_character_class("Knight", ROGUE_STATS._replace(
+    ...     defense=12), "rogue")
+    >>> Knight("Arthur", None, None)
+    Arthur (Knight): 100/100
+    """
+    if sprite_prefix is None:
+        sprite_prefix = name.lower()
+    return type(name, (Characters,),
+                {'__slots__': (), '__doc__': "The {} character.".format(name),
+                 'stats': stats,
+                 'sprite_prefix': sprite_prefix,
+                 'animations': add_animations(sprite_prefix)})
 
 
 if __name__ == '__main__':
@@ -0,0 +1,135 @@
+"""
+Unittests for the data-driven character classes of A1.
+"""
+import unittest
+
+from a1_battle_queue import BattleQueue
+from a1_battle_sim import P1_WINS, STALLED, run_batch
+from a1_characters import (ATTACK, ENEMY, MAGE_STATS, NO_ACTION,
+                           ROGUE_STATS, SELF, SPECIAL, CharacterStats,
+                           Characters, Mage, Rogue, make_character_class)
+from a1_game import CHARACTER_CLASSES, register_character
+from a1_playstyle import ManualPlaystyle
+from a1_vector_engine import simulate
+
+# A class unlike Rogue and Mage: a cheap special attack that queues the
+# enemy twice, and a defense of neither 10 nor 8.
+KNIGHT_STATS = CharacterStats(defense=5, attack_cost=4, attack_damage=18,
+                              special_cost=8, special_damage=25,
+                              special_queue=(ENEMY, ENEMY))
+
+
+class CharacterClassUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a Knight against a Rogue in a Battle Queue.
+        """
+        self.knight_class = make_character_class("Knight", KNIGHT_STATS,
+                                                 "rogue")
+        self.battle_queue = BattleQueue()
+        playstyle = ManualPlaystyle(self.battle_queue)
+        self.knight = self.knight_class("K", self.battle_queue, playstyle)
+        self.rogue = Rogue("R", self.battle_queue, playstyle)
+        self.knight.enemy = self.rogue
+        self.rogue.enemy = self.knight
+        self.battle_queue.add(self.knight)
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp.
+        """
+        del self.knight_class
+        del self.battle_queue
+        del self.knight
+        del self.rogue
+
+    def test_builtin_stats(self):
+        """
+        Test to make sure Rogue and Mage are defined by their stats.
+        """
+        self.assertIs(Rogue.stats, ROGUE_STATS)
+        self.assertIs(Mage.stats, MAGE_STATS)
+        self.assertEqual(ROGUE_STATS.special_queue, (SELF, SELF))
+        self.assertEqual(MAGE_STATS.special_queue, (ENEMY, SELF))
+
+    def test_made_class(self):
+        """
+        Test to make sure a made class is a Characters named after it.
+        """
+        self.assertTrue(issubclass(self.knight_class, Characters))
+        self.assertEqual(self.knight.defense, 5)
+        self.assertEqual(repr(self.knight), "K (Knight): 100/100")
+        self.assertEqual(self.knight.get_next_sprite(), "rogue_idle_0")
+        with self.assertRaises(AttributeError):
+            self.knight.mana = 3
+
+    def test_attacks_follow_stats(self):
+        """
+        Test to make sure both attacks cost, damage and queue what the
+        stats say.
+        """
+        self.knight.attack()
+        self.assertEqual(self.knight.get_sp(), 96)
+        self.assertEqual(self.rogue.get_hp(), 92)
+
+        self.knight.special_attack()
+        self.assertEqual(self.knight.get_sp(), 88)
+        self.assertEqual(self.rogue.get_hp(), 77)
+        queued = [self.battle_queue.remove() for _ in range(4)]
+        self.assertEqual(queued, [self.knight, self.knight, self.rogue,
+                                  self.rogue])
+
+    def test_available_actions(self):
+        """
+        Test to make sure the actions available follow the costs in the
+        stats.
+        """
+        self.knight.sp = 8
+        self.assertEqual(self.knight.get_available_actions(), ['A', 'S'])
+        self.knight.sp = 7
+        self.assertEqual(self.knight.get_available_actions(), ['A'])
+        self.assertFalse(self.knight.is_valid_action('S'))
+        self.knight.sp = 3
+        self.assertEqual(self.knight.get_available_actions(), [])
+        self.assertFalse(self.knight.is_valid_action('X'))
+
+    def test_action_mask(self):
+        """
+        Test to make sure action_mask follows sp, and that
+        get_available_actions gives a new list every call.
+        """
+        self.assertEqual(self.knight.action_mask, ATTACK | SPECIAL)
+        self.knight.special_attack()
+        self.knight.sp = 7
+        self.assertEqual(self.knight.action_mask, ATTACK)
+        self.knight.attack()
+        self.assertEqual(self.knight.get_sp(), 3)
+        self.assertEqual(self.knight.action_mask, NO_ACTION)
+
+        actions = self.rogue.get_available_actions()
+        actions.append('X')
+        self.assertEqual(self.rogue.get_available_actions(), ['A', 'S'])
+
+    def test_register_character(self):
+        """
+        Test to make sure a registered class plays random games on both
+        engines without stalling.
+        """
+        knight_class = register_character('k', "Knight", KNIGHT_STATS,
+                                          "rogue")
+        self.addCleanup(CHARACTER_CLASSES.pop, 'k')
+        self.assertIs(CHARACTER_CLASSES['k'], knight_class)
+        with self.assertRaises(ValueError):
+            register_character('k', "Knight", KNIGHT_STATS)
+
+        objects = run_batch('k', 'm', 'r', 'r', 3000, seed=4)
+        arrays = simulate(knight_class, Mage, 30000, seed=4)
+        self.assertEqual(objects.results[STALLED], 0)
+        self.assertEqual(arrays.results[STALLED], 0)
+        self.assertAlmostEqual(objects.results[P1_WINS] / objects.games,
+                               arrays.results[P1_WINS] / arrays.games,
+                               delta=0.03)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
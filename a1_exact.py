@@ -0,0 +1,150 @@
+"""
+Exact odds of battles between two RandomPlaystyles.
+
+A battle between RandomPlaystyles is a finite Markov chain over the states
+of a1_state: the character at the front of the queue makes every move it
+has enough SP for with a known chance (half each if it can make both), and
+every move leads to a state with less SP. So instead of sampling battles,
+exact_odds() works out the chance of every result and of every battle
+length directly, by pushing the chance of being in each state forward one
+turn at a time from the start, until all of it has reached the end of the
+battle. This takes milliseconds, and gives what a1_battle_sim would report
+after infinitely many games. For example:
+
+    python -m a1_exact --p1 m --p2 r
+"""
+import argparse
+import math
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from a1_battle_sim import MAX_TURNS, P1_WINS, P2_WINS, RESULTS, STALLED, TIE
+from a1_state import LOSS, ONGOING, WIN, Matchup
+import a1_state
+
+# The result of a battle in a1_battle_sim for every result of a1_state,
+# with P1 as character 0.
+_RESULT_NAMES = {WIN: P1_WINS, LOSS: P2_WINS, a1_state.TIE: TIE,
+                 a1_state.STALLED: STALLED}
+
+
+class Odds:
+    """
+    The exact chances of how a battle ends and of how long it lasts.
+
+    results - The chance of each of RESULTS.
+    turns - The chance of the battle taking each number of turns.
+    states - The number of states (with their turn number) the battle can
+             pass through.
+    """
+    results: Dict[str, float]
+    turns: Dict[int, float]
+    states: int
+
+    def __init__(self) -> None:
+        """
+        Initialize Odds with no chance of anything.
+        """
+        self.results = {result: 0.0 for result in RESULTS}
+        self.turns = defaultdict(float)
+        self.states = 0
+
+    def mean_turns(self) -> float:
+        """
+        Return the expected number of turns of a battle.
+        """
+        return sum(turns * chance for turns, chance in self.turns.items())
+
+    def turn_percentile(self, fraction: float) -> Optional[int]:
+        """
+        Return the smallest number of turns that a battle ends within with
+        a chance of at least fraction.
+        """
+        seen = 0.0
+        for turns in sorted(self.turns):
+            seen += self.turns[turns]
+            # Allow for the rounding of the chances summed so far.
+            if seen >= fraction - 1e-12:
+                return turns
+        return None
+
+    def report(self, elapsed: Optional[float] = None) -> str:
+        """
+        Return a human readable summary of these Odds, given that they took
+        elapsed seconds to work out, if known.
+        """
+        lines = ["states: {}".format(self.states)]
+        if elapsed is not None:
+            lines[0] += "  time: {:.3f}s".format(elapsed)
+        for result in RESULTS:
+            lines.append("{:>8}: {:>10.6%}".format(result,
+                                                   self.results[result]))
+        mean = self.mean_turns()
+        variance = sum(chance * (turns - mean) ** 2
+                       for turns, chance in self.turns.items())
+        lines.append(("   turns: min {} / median {} / p95 {} / max {}  " +
+                      "mean {:.2f}  stdev {:.2f}").format(
+                          min(self.turns), self.turn_percentile(0.5),
+                          self.turn_percentile(0.95), max(self.turns), mean,
+                          math.sqrt(variance)))
+        return "\n".join(lines)
+
+
+def exact_odds(p1_class: type, p2_class: type) -> Odds:
+    """
+    Return the exact Odds of a battle between a p1_class and a p2_class
+    character, both with a RandomPlaystyle, in which P1 moves first.
+
+    As in a1_battle_sim.play_game, a battle that has not ended after
+    MAX_TURNS turns is stalled.
+    """
+    matchup = Matchup(p1_class.stats, p2_class.stats)
+    odds = Odds()
+    # The chance of being in each state after turns turns.
+    chances = {matchup.start(): 1.0}
+    turns = 0
+    while chances:
+        odds.states += len(chances)
+        after_turn = defaultdict(float)
+        for state, chance in chances.items():
+            result = matchup.result(state)
+            if result is ONGOING and turns == MAX_TURNS:
+                result = a1_state.STALLED
+            if result is not ONGOING:
+                odds.results[_RESULT_NAMES[result]] += chance
+                odds.turns[turns] += chance
+                continue
+            moves = matchup.moves(state)
+            for _, after in moves:
+                after_turn[after] += chance / len(moves)
+        chances = after_turn
+        turns += 1
+    return odds
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Parse the command line arguments in argv, and print the exact odds of
+    the matchup they name.
+    """
+    from a1_game import CHARACTER_CLASSES
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--p1', choices=sorted(CHARACTER_CLASSES),
+                        default='m', help="class of the first character")
+    parser.add_argument('--p2', choices=sorted(CHARACTER_CLASSES),
+                        default='r', help="class of the second character")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    odds = exact_odds(CHARACTER_CLASSES[args.p1], CHARACTER_CLASSES[args.p2])
+    elapsed = time.perf_counter() - start
+
+    print("{} (r) vs {} (r), exactly".format(
+        CHARACTER_CLASSES[args.p1].__name__,
+        CHARACTER_CLASSES[args.p2].__name__))
+    print(odds.report(elapsed))
+
+
+if __name__ == '__main__':
+    main()
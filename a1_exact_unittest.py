@@ -0,0 +1,56 @@
+"""
+Unittests for the exact odds of A1.
+"""
+import unittest
+
+from a1_battle_sim import P1_WINS, P2_WINS, RESULTS
+from a1_characters import ROGUE_STATS, Mage, Rogue, make_character_class
+from a1_exact import exact_odds
+from a1_vector_engine import simulate
+
+
+class ExactOddsUnitTests(unittest.TestCase):
+    def test_chances_add_up(self):
+        """
+        Test to make sure the chances of the results, and of the lengths,
+        add up to 1.
+        """
+        for p1_class, p2_class in [(Mage, Rogue), (Rogue, Rogue)]:
+            odds = exact_odds(p1_class, p2_class)
+            self.assertAlmostEqual(sum(odds.results.values()), 1)
+            self.assertAlmostEqual(sum(odds.turns.values()), 1)
+            self.assertEqual(sorted(odds.results), sorted(RESULTS))
+
+    def test_matches_sampling(self):
+        """
+        Test to make sure the exact odds are what many sampled games come
+        close to.
+        """
+        odds = exact_odds(Mage, Rogue)
+        sampled = simulate(Mage, Rogue, 100000, seed=2)
+        for result in RESULTS:
+            self.assertAlmostEqual(odds.results[result],
+                                   sampled.results[result] / sampled.games,
+                                   delta=0.01)
+        sampled_mean = sum(turns * count for turns, count
+                           in sampled.turns.items()) / sampled.games
+        self.assertAlmostEqual(odds.mean_turns(), sampled_mean, delta=0.05)
+        self.assertEqual(odds.turn_percentile(0.5),
+                         sampled.turn_percentile(0.5))
+
+    def test_one_blow(self):
+        """
+        Test to make sure a battle that the first attack wins is won by P1
+        in one turn.
+        """
+        giant = make_character_class("Giant", ROGUE_STATS._replace(
+            attack_damage=150, special_damage=150), "rogue")
+        odds = exact_odds(giant, giant)
+        self.assertEqual(odds.results[P1_WINS], 1)
+        self.assertEqual(odds.results[P2_WINS], 0)
+        self.assertEqual(dict(odds.turns), {1: 1})
+        self.assertIn("p1: 100.000000%", odds.report())
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -15,8 +15,14 @@ We will not grade the documentation of this file.
 from a1_battle_queue import BattleQueue
 from a1_playstyle import ManualPlaystyle
 from a1_playstyle import RandomPlaystyle
+from a1_playstyle import BufferedRandomPlaystyle
+from a1_playstyle import ExpectimaxPlaystyle
+from a1_playstyle import MCTSPlaystyle
+from a1_playstyle import SolvedPlaystyle
 from a1_characters import Rogue
 from a1_characters import Mage
+from a1_characters import make_character_class
+from a1_characters import ATTACK
 
 # Replace None with the name of your Character classes
 # m should map to your class for your Mage
@@ -27,15 +33,180 @@ CHARACTER_CLASSES = {'m': Mage,
 
 # Replace None with the name of your Playstyle classes
 # r should map to your class for your random playstyle
+# b should map to the random playstyle that draws its choices in blocks
+# e should map to the playstyle that searches the moves ahead
+# c should map to the Monte Carlo tree search playstyle
+# s should map to the playstyle that looks its moves up in a solved table
 PLAYSTYLE_CLASSES = {'m': ManualPlaystyle,
-                     'r': RandomPlaystyle
+                     'r': RandomPlaystyle,
+                     'b': BufferedRandomPlaystyle,
+                     'e': ExpectimaxPlaystyle,
+                     'c': MCTSPlaystyle,
+                     's': SolvedPlaystyle
                     }
 
+
+def register_character(key, name, stats, sprite_prefix=None):
+    """
+    Add a character class called name that fights with stats (a
+    CharacterStats) to CHARACTER_CLASSES under key, and return it. See
+    make_character_class for sprite_prefix.
+    """
+    if key in CHARACTER_CLASSES:
+        raise ValueError("{!r} is already in CHARACTER_CLASSES".format(key))
+    CHARACTER_CLASSES[key] = make_character_class(name, stats, sprite_prefix)
+    return CHARACTER_CLASSES[key]
+
+
+class GameSession:
+    """
+    One game: its battle queue, its two characters and how it ended.
+
+    Any number of GameSessions can be played at once in one process.
+
+    battle_queue - The BattleQueue of this game.
+    p1, p2 - The first and second characters.
+    last_key_pressed - The move for the next manual playstyle to make.
+    is_over - Whether this game is over.
+    winner - The character that won this game, or None if it is not over
+             or ended in a tie.
+    """
+
+    def __init__(self, player_1, player_1_name, player_1_playstyle,
+                 player_2, player_2_name, player_2_playstyle, rng=None):
+        """
+        Sets up the battle queue and characters for a game between the given
+        classes, names and playstyles (as keys of CHARACTER_CLASSES and
+        PLAYSTYLE_CLASSES).
+
+        Both playstyles draw from rng if it is given, so that a game with a
+        seeded rng plays out the same as a1_battle_sim.play_game with that
+        seed.
+        """
+        self.battle_queue = BattleQueue()
+        self.last_key_pressed = None
+        self.is_over = False
+        self.winner = None
+
+        # Store the classes in other variable names for convenience
+        p1_character = CHARACTER_CLASSES[player_1]
+        p2_character = CHARACTER_CLASSES[player_2]
+        p1_playstyle = PLAYSTYLE_CLASSES[player_1_playstyle](
+            self.battle_queue, rng)
+        p2_playstyle = PLAYSTYLE_CLASSES[player_2_playstyle](
+            self.battle_queue, rng)
+
+        # Call the corresponding __init__ for each player's character class
+        # The parameters passed in are: their name, the battle queue and an
+        # instance of their playstyle
+        self.p1 = p1_character(player_1_name, self.battle_queue, p1_playstyle)
+        self.p2 = p2_character(player_2_name, self.battle_queue, p2_playstyle)
+
+        # Set the enemy attribute of the characters
+        # You can assume this will be called before any attacks are performed
+        self.p1.enemy = self.p2
+        self.p2.enemy = self.p1
+
+        # Add the characters to the Battle Queue
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p2)
+
+    def perform_attack(self):
+        """
+        Uses the next character's playstyle to decide on and perform an
+        attack.
+        """
+        # Get the next character in the battle queue, but don't remove them.
+        next_character = self.battle_queue.peek()
+        playstyle = next_character.playstyle
+
+        # Uses the next character's playstyle to select an action (the key
+        # pressed is turned into one by the manual playstyle)
+        if playstyle.is_manual:
+            move_to_make = playstyle.select_action(self.last_key_pressed)
+        else:
+            move_to_make = playstyle.select_action()
+
+        # Check if the next_character can make that action (ATTACK is a
+        # normal attack, SPECIAL is a special attack.) NO_ACTION is never
+        # in the mask.
+        if move_to_make & next_character.action_mask:
+            if move_to_make == ATTACK:
+                next_character.attack()
+            else:
+                next_character.special_attack()
+
+            # Call remove() to remove the next_character from the
+            # battle_queue (if they still have SP; otherwise the next call
+            # to remove() should skip them)
+            if next_character.action_mask:
+                self.battle_queue.remove()
+
+        # Check if the game is over.
+        self.is_over = self.battle_queue.is_over()
+
+        # Get the winner of the game. If the game is not over yet,
+        # get_winner() should return None. Otherwise, it should return the
+        # character that won.
+        self.winner = self.battle_queue.get_winner()
+
+    def update_ui(self):
+        """
+        Return the parameters to update the UI for the game.
+        """
+        p1, p2, battle_queue = self.p1, self.p2, self.battle_queue
+
+        # Get the names
+        p1_name = p1.get_name()
+        p2_name = p2.get_name()
+
+        # Get the sprite to draw
+        p1_current_sprite = p1.get_next_sprite()
+        p2_current_sprite = p2.get_next_sprite()
+
+        # Get the character HPs
+        p1_current_hp = p1.get_hp()
+        p2_current_hp = p2.get_hp()
+
+        # Get the character SPs
+        p1_current_sp = p1.get_sp()
+        p2_current_sp = p2.get_sp()
+
+        if not battle_queue.is_over():
+            # Get the actions that the current player can make (this should
+            # be a list containing 'A' and/or 'S', or be empty if there are
+            # no actions.)
+            current_available_actions = \
+                battle_queue.peek().get_available_actions()
+
+            # Get the current player's name
+            current_player = battle_queue.peek().get_name()
+        else:
+            current_available_actions = []
+            current_player = None
+
+        ui_to_draw = {'p1_sprite': p1_current_sprite,
+                      'p2_sprite': p2_current_sprite,
+                      'p1_hp': p1_current_hp,
+                      'p2_hp': p2_current_hp,
+                      'p1_sp': p1_current_sp,
+                      'p2_sp': p2_current_sp,
+                      'p1_name': p1_name,
+                      'p2_name': p2_name,
+                      'actions': current_available_actions,
+                      'current_player': current_player}
+
+        return ui_to_draw
+
+
 # Do not change any of the code below
 # You may NOT use or modify any of the variables defined below within your code
 # they're only to be used by a1_game.py and a1_ui.py.
-# (i.e. don't reference BATTLE_QUEUE, LAST_KEY_PRESSED, P1, P2, GAME_IS_OVER,
-#  or GAME_WINNER anywhere in your code.)
+# (i.e. don't reference SESSION, BATTLE_QUEUE, LAST_KEY_PRESSED, P1, P2,
+#  GAME_IS_OVER, or GAME_WINNER anywhere in your code.)
+# The functions below play the one GameSession that the UI shows, SESSION,
+# and mirror its state in the other variables.
+SESSION = None
 BATTLE_QUEUE = None
 LAST_KEY_PRESSED = None
 P1 = None
@@ -44,104 +215,90 @@ GAME_IS_OVER = False
 GAME_WINNER = None
 
 
-def perform_attack():
+def _mirror_session():
     """
-    Uses the next character's playstyle to decide on and perform an attack.
+    Copy the state of SESSION into the module variables.
     """
-    global BATTLE_QUEUE, GAME_IS_OVER, GAME_WINNER, LAST_KEY_PRESSED
-
-    # Get the next character in the battle queue, but don't remove them.
-    next_character = BATTLE_QUEUE.peek()
-    playstyle = next_character.playstyle
+    global BATTLE_QUEUE, P1, P2, GAME_IS_OVER, GAME_WINNER, LAST_KEY_PRESSED
 
-    # Uses the next character's playstyle to select an attack
-    if playstyle.is_manual:
-        move_to_make = playstyle.select_attack(LAST_KEY_PRESSED)
-    else:
-        move_to_make = playstyle.select_attack()
+    BATTLE_QUEUE = SESSION.battle_queue
+    P1 = SESSION.p1
+    P2 = SESSION.p2
+    GAME_IS_OVER = SESSION.is_over
+    GAME_WINNER = SESSION.winner
+    LAST_KEY_PRESSED = SESSION.last_key_pressed
 
-    # Check if the next_character can make that action ('A' represents
-    # a normal attack, 'S' represents a special attack.)
-    # If a move that is not 'A' or 'S' is passed in, this should return False.
-    if next_character.is_valid_action(move_to_make):
-        if move_to_make == 'A':
-            next_character.attack()
-        else:
-            next_character.special_attack()
 
-        # Call remove() to remove the next_character from the battle_queue
-        # (if they still have SP; otherwise the next call to remove()
-        # should skip them)
-        if next_character.get_available_actions() != []:
-            BATTLE_QUEUE.remove()
+def perform_attack():
+    """
+    Uses the next character's playstyle to decide on and perform an attack.
+    """
+    SESSION.last_key_pressed = LAST_KEY_PRESSED
+    SESSION.perform_attack()
+    _mirror_session()
 
-    # Check if the game is over.
-    GAME_IS_OVER = BATTLE_QUEUE.is_over()
 
-    # Get the winner of the game. If the game is not over yet, get_winner()
-    # should return None. Otherwise, it should return the character that won.
-    GAME_WINNER = BATTLE_QUEUE.get_winner()
+def _choices(classes):
+    """
+    Return the keys of classes (CHARACTER_CLASSES or PLAYSTYLE_CLASSES) and
+    what they stand for, to list in a prompt, e.g. "m for Mage, r for Rogue".
+    """
+    return ", ".join("{} for {}".format(key, cls.__name__.replace(
+        "Playstyle", "")) for key, cls in classes.items())
 
 
 def set_up_game():
     """
     Sets up the battle queue and characters for the game.
     """
-    global P1, P2, BATTLE_QUEUE
-
-    # Create a new battle queue
-    BATTLE_QUEUE = BattleQueue()
-
     # Get the parameters for the first character
     player_1 = ''
     player_1_playstyle = ''
 
-    while player_1 not in ["m", "r"]:
-        player_1 = input("Select a class for the first character (m for Mage" +
-                         ", r for Rogue): ").strip()
+    while player_1 not in CHARACTER_CLASSES:
+        player_1 = input("Select a class for the first character ({}): "
+                         .format(_choices(CHARACTER_CLASSES))).strip()
 
     player_1_name = input("Select a name for the first character: ").strip()
 
-    while player_1_playstyle not in ["m", "r"]:
+    while player_1_playstyle not in PLAYSTYLE_CLASSES:
         player_1_playstyle = input("Select a playstyle for the first " +
-                                   "character (m for Manual, r for Random): ")
+                                   "character ({}): ".format(
+                                       _choices(PLAYSTYLE_CLASSES)))
         player_1_playstyle = player_1_playstyle.strip()
 
     # Get the parameters for the second character
     player_2 = ''
     player_2_playstyle = ''
 
-    while player_2 not in ["m", "r"]:
-        player_2 = input("Select a class for the second character (m for " +
-                         "Mage, r for Rogue): ").strip()
+    while player_2 not in CHARACTER_CLASSES:
+        player_2 = input("Select a class for the second character ({}): "
+                         .format(_choices(CHARACTER_CLASSES))).strip()
 
     player_2_name = input("Select a name for the second character: ").strip()
 
-    while player_2_playstyle not in ["m", "r"]:
+    while player_2_playstyle not in PLAYSTYLE_CLASSES:
         player_2_playstyle = input("Select a playstyle for the second " +
-                                   "character (m for Manual, r for Random): ")
+                                   "character ({}): ".format(
+                                       _choices(PLAYSTYLE_CLASSES)))
         player_2_playstyle = player_2_playstyle.strip()
 
-    # Store the classes in other variable names for convenience
-    P1_Character = CHARACTER_CLASSES[player_1]
-    P2_Character = CHARACTER_CLASSES[player_2]
-    p1_playstyle = PLAYSTYLE_CLASSES[player_1_playstyle](BATTLE_QUEUE)
-    p2_playstyle = PLAYSTYLE_CLASSES[player_2_playstyle](BATTLE_QUEUE)
+    set_up_game_with(player_1, player_1_name, player_1_playstyle,
+                     player_2, player_2_name, player_2_playstyle)
 
-    # Call the corresponding __init__ for each player's character class
-    # The parameters passed in are: their name, the battle queue and an
-    # instance of their playstyle
-    P1 = P1_Character(player_1_name, BATTLE_QUEUE, p1_playstyle)
-    P2 = P2_Character(player_2_name, BATTLE_QUEUE, p2_playstyle)
 
-    # Set the enemy attribute of the characters
-    # You can assume this will be called before any attacks are performed
-    P1.enemy = P2
-    P2.enemy = P1
+def set_up_game_with(player_1, player_1_name, player_1_playstyle,
+                     player_2, player_2_name, player_2_playstyle, rng=None):
+    """
+    Sets up the battle queue and characters for a game between the given
+    classes, names and playstyles, without asking for them (see
+    GameSession).
+    """
+    global SESSION
 
-    # Add the characters to the Battle Queue
-    BATTLE_QUEUE.add(P1)
-    BATTLE_QUEUE.add(P2)
+    SESSION = GameSession(player_1, player_1_name, player_1_playstyle,
+                          player_2, player_2_name, player_2_playstyle, rng)
+    _mirror_session()
 
 
 def update_ui():
@@ -152,44 +309,4 @@ def update_ui():
     pygame methods here, or having you read through a1_ui.py to find client
     code. Silly is the better option, in this case. :)
     """
-    global P1, P2, BATTLE_QUEUE
-
-    # Get the names
-    p1_name = P1.get_name()
-    p2_name = P2.get_name()
-
-    # Get the sprite to draw
-    p1_current_sprite = P1.get_next_sprite()
-    p2_current_sprite = P2.get_next_sprite()
-
-    # Get the character HPs
-    p1_current_hp = P1.get_hp()
-    p2_current_hp = P2.get_hp()
-
-    # Get the character SPs
-    p1_current_sp = P1.get_sp()
-    p2_current_sp = P2.get_sp()
-
-    if not BATTLE_QUEUE.is_over():
-        # Get the actions that the current player can make (this should be a
-        # list containing 'A' and/or 'S', or be empty if there are no actions.)
-        current_available_actions = BATTLE_QUEUE.peek().get_available_actions()
-
-        # Get the current player's name
-        current_player = BATTLE_QUEUE.peek().get_name()
-    else:
-        current_available_actions = []
-        current_player = None
-
-    ui_to_draw = {'p1_sprite': p1_current_sprite,
-                  'p2_sprite': p2_current_sprite,
-                  'p1_hp': p1_current_hp,
-                  'p2_hp': p2_current_hp,
-                  'p1_sp': p1_current_sp,
-                  'p2_sp': p2_current_sp,
-                  'p1_name': p1_name,
-                  'p2_name': p2_name,
-                  'actions': current_available_actions,
-                  'current_player': current_player}
-
-    return ui_to_draw
+    return SESSION.update_ui()
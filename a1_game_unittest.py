@@ -0,0 +1,121 @@
+"""
+Unittests for the GameSession of A1.
+"""
+import random
+import unittest
+
+import a1_game
+from a1_battle_sim import P1_WINS, P2_WINS, TIE, play_game
+from a1_characters import Mage, Rogue
+from a1_game import GameSession
+from a1_playstyle import RandomPlaystyle
+
+
+def play_session(session):
+    """
+    Play session to the end, and return its result as in a1_battle_sim.
+    """
+    while not session.is_over:
+        session.perform_attack()
+    if session.winner is None:
+        return TIE
+    return P1_WINS if session.winner is session.p1 else P2_WINS
+
+
+class GameSessionUnitTests(unittest.TestCase):
+    def test_seeded_session(self):
+        """
+        Test to make sure a seeded session plays the same game as
+        play_game.
+        """
+        for seed in range(20):
+            session = GameSession('m', 'A', 'r', 'r', 'B', 'r',
+                                  random.Random(seed))
+            result, _ = play_game(Mage, Rogue, RandomPlaystyle,
+                                  RandomPlaystyle, seed=seed)
+            self.assertEqual(play_session(session), result)
+
+    def test_interleaved_sessions(self):
+        """
+        Test to make sure many sessions played a turn at a time, in turn,
+        end the same as when each is played on its own.
+        """
+        sessions = [GameSession('r', 'A', 'r', 'm', 'B', 'b',
+                                random.Random(seed)) for seed in range(200)]
+        while not all(session.is_over for session in sessions):
+            for session in sessions:
+                if not session.is_over:
+                    session.perform_attack()
+
+        for seed, session in enumerate(sessions):
+            alone = GameSession('r', 'A', 'r', 'm', 'B', 'b',
+                                random.Random(seed))
+            self.assertEqual(play_session(alone), play_session(session))
+            self.assertEqual(alone.p1.get_hp(), session.p1.get_hp())
+            self.assertEqual(alone.p2.get_hp(), session.p2.get_hp())
+
+    def test_manual_moves(self):
+        """
+        Test to make sure a manual session makes the move in
+        last_key_pressed, and ignores invalid ones.
+        """
+        session = GameSession('r', 'A', 'm', 'm', 'B', 'm')
+        session.last_key_pressed = 'X'
+        session.perform_attack()
+        self.assertEqual(session.p1.get_sp(), 100)
+
+        session.last_key_pressed = 'S'
+        session.perform_attack()
+        self.assertEqual(session.p1.get_sp(), 90)
+        self.assertEqual(session.p2.get_hp(), 88)
+        self.assertFalse(session.is_over)
+
+        ui = session.update_ui()
+        self.assertEqual(ui['current_player'], 'B')
+        self.assertEqual(ui['actions'], ['A', 'S'])
+
+    def test_module_functions(self):
+        """
+        Test to make sure the module functions play SESSION and mirror its
+        state.
+        """
+        a1_game.set_up_game_with('m', 'A', 'm', 'r', 'B', 'm')
+        self.assertIs(a1_game.P1, a1_game.SESSION.p1)
+        self.assertIs(a1_game.BATTLE_QUEUE, a1_game.SESSION.battle_queue)
+
+        a1_game.LAST_KEY_PRESSED = 'A'
+        a1_game.perform_attack()
+        self.assertEqual(a1_game.P2.get_hp(), 90)
+        self.assertEqual(a1_game.update_ui()['p2_hp'], 90)
+        self.assertFalse(a1_game.GAME_IS_OVER)
+        self.assertIsNone(a1_game.GAME_WINNER)
+
+    def test_set_up_game_prompts(self):
+        """
+        Test to make sure every playstyle in PLAYSTYLE_CLASSES can be picked
+        when asked for, and is listed in the prompt.
+        """
+        answers = iter(['m', 'A', 'q', 'e', 'r', 'B', 'c'])
+        prompts = []
+
+        def answer(prompt=''):
+            """Record prompt, and give the next answer."""
+            prompts.append(prompt)
+            return next(answers)
+
+        a1_game.input = answer
+        self.addCleanup(delattr, a1_game, 'input')
+        a1_game.set_up_game()
+
+        self.assertEqual(type(a1_game.P1.playstyle),
+                         a1_game.PLAYSTYLE_CLASSES['e'])
+        self.assertEqual(type(a1_game.P2.playstyle),
+                         a1_game.PLAYSTYLE_CLASSES['c'])
+        self.assertEqual(len(prompts), 7)
+        for key in a1_game.PLAYSTYLE_CLASSES:
+            self.assertIn("{} for ".format(key), prompts[2])
+        self.assertIn("c for MCTS", prompts[-1])
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -17,7 +17,71 @@ for only a normal attack, it should return 'A'. If they have enough SP for
 either a normal or a special attack, it should return either 'A' or
 'S') at random.
 """
-from typing import Any
+import hashlib
+import math
+import random
+import time
+from typing import (TYPE_CHECKING, Any, Dict, List, Optional, Sequence,
+                    Tuple)
+
+from a1_characters import ACTION_KEYS, ATTACK, KEY_ACTIONS, NO_ACTION, SPECIAL
+from a1_solver import SOLVED_DIRECTORY, SolvedTable, load_table
+from a1_state import (FIELD_MASK, HP0_SHIFT, HP1_SHIFT, LOSS, ONGOING,
+                      SP0_SHIFT, WIN, Matchup, TranspositionTable, matchup_of)
+
+# numpy is only imported when select_actions is called, so the UI does not
+# load it at startup; this import is for type checkers.
+if TYPE_CHECKING:
+    import numpy as np
+
+# The number of rollouts an MCTSPlaystyle plays per move by default: at most
+# about 60 ms of search on one core, within a frame of a1_ui.
+DEFAULT_ROLLOUTS = 1000
+# How far down the last move's tree an MCTSPlaystyle looks for the state it
+# has to move from.
+REUSE_DEPTH = 4
+
+
+def derive_seed(master_seed: Optional[int], *path: Any) -> Optional[int]:
+    """
+    Return the seed of the random stream named by path (e.g. a game number)
+    under master_seed.
+
+    The path is hashed together with master_seed, so every path gets an
+    independent stream, and the same master_seed and path always give the
+    same seed. If master_seed is None, return None (i.e. an unseeded
+    stream).
+
+    >>> derive_seed(1, 'game', 0) == derive_seed(1, 'game', 0)
+    True
+    >>> derive_seed(1, 'game', 0) == derive_seed(1, 'game', 1)
+    False
+    """
+    if master_seed is None:
+        return None
+    key = ":".join(str(part) for part in (master_seed,) + path)
+    return int.from_bytes(hashlib.blake2b(key.encode(),
+                                          digest_size=8).digest(), 'big')
+
+
+# The attacks a RandomPlaystyle chooses between.
+ATTACKS = (ATTACK, SPECIAL)
+_BITS_TO_ATTACKS = bytes.maketrans(b'01', bytes(ATTACKS))
+
+
+def _choose_from(mask: int, choice: int) -> int:
+    """
+    Return choice if it is in the action mask mask, else the first of
+    ATTACKS that is, and NO_ACTION if there is none.
+    """
+    if choice & mask:
+        return choice
+    # Neither bit is set, or only the one that was not chosen.
+    return ATTACK if mask & ATTACK else mask
+
+
+# The generator of every Playstyle that was not given its own.
+_SHARED_RNG = random.Random()
 
 
 class Playstyle:
@@ -27,45 +91,97 @@ class Playstyle:
     is_manual - Whether the class is a manual Playstyle or not.
     battle_queue - The BattleQueue corresponding to the game this Playstyle is
                    being used in.
+    rng - The random number generator this Playstyle draws from, so that
+          games can be seeded and replayed independently of each other.
+    searches - Whether the class searches ahead for its moves, which takes
+               milliseconds per move, so that bulk runs (e.g. a1_tournament)
+               only play it when asked to.
     """
     is_manual: bool
     battle_queue: 'BattleQueue'
+    rng: random.Random
+    searches = False
 
-    def __init__(self, battle_queue: 'BattleQueue') -> None:
+    def __init__(self, battle_queue: 'BattleQueue',
+                 rng: Optional[random.Random] = None) -> None:
         """
-        Initialize this Playstyle with BattleQueue as its battle queue.
+        Initialize this Playstyle with BattleQueue as its battle queue and
+        rng as its random number generator (one unseeded generator shared by
+        every Playstyle if rng is None, as each one holds kilobytes of
+        state).
         """
         self.battle_queue = battle_queue
         self.is_manual = True
+        self.rng = rng if rng is not None else _SHARED_RNG
 
     def select_attack(self, parameter: Any = None) -> str:
         """
-        Return the attack for the next character in this Playstyle's
-        battle_queue to perform.
+        Return the key of the attack for the next character in this
+        Playstyle's battle_queue to perform.
 
         Return 'X' if a valid move cannot be found.
         """
+        return ACTION_KEYS[self.select_action(parameter)]
+
+    def select_action(self, parameter: Any = None) -> int:
+        """
+        Return the action (see a1_characters.ACTIONS) for the next character
+        in this Playstyle's battle_queue to perform.
+
+        Return NO_ACTION if a valid move cannot be found.
+        """
         raise NotImplementedError
 
+    def action_for(self, matchup: Matchup, state: int) -> int:
+        """
+        Return the action for character 0 to perform in state of matchup
+        (see a1_state), in which character 0 is at the front of the queue.
+
+        Return NO_ACTION if a valid move cannot be found.
+        """
+        raise NotImplementedError
+
+    def select_actions(self, matchup: Matchup,
+                       states: Sequence[int]) -> 'np.ndarray':
+        """
+        Return the action for character 0 to perform in each of states of
+        matchup, as a uint8 array.
+
+        states holds one packed state (see a1_state) per battle, e.g. a
+        uint64 array, and character 0 must be at the front of the queue in
+        every one of them: the battles are grouped by who is to move, so
+        they all have a character with matchup.stats to move against one
+        with matchup.enemy_stats. This lets whatever runs many battles at
+        once decide the moves of all of them in one call. By default,
+        action_for is called for each state.
+        """
+        import numpy as np
+        return np.fromiter((self.action_for(matchup, int(state))
+                            for state in states), np.uint8, len(states))
+
 
 class ManualPlaystyle(Playstyle):
     """
     The ManualPlaystyle. Inherits from Playstyle.
     """
 
-    def select_attack(self, parameter: Any = None) -> str:
+    def select_action(self, parameter: Any = None) -> int:
         """
-        Return the attack for the next character in this Playstyle's
+        Return the action for the next character in this Playstyle's
         battle_queue to perform.
 
         parameter represents a key pressed by a player.
 
-        Return 'X' if a valid move cannot be found.
+        Return NO_ACTION if a valid move cannot be found.
         """
-        if parameter in ['A', 'S']:
-            return parameter
+        return KEY_ACTIONS.get(parameter, NO_ACTION)
 
-        return 'X'
+    def action_for(self, matchup: Matchup, state: int) -> int:
+        """
+        Return NO_ACTION, as there are no keys pressed for battles that are
+        not on screen.
+        """
+        return NO_ACTION
 
 # Implement a random playstyle that selects an attack at random.
 # Importing random and using random.choice might be helpful.
@@ -74,37 +190,515 @@ class ManualPlaystyle(Playstyle):
 class RandomPlaystyle(Playstyle):
     """The RandomPlaystyle, Inherits from Playstyle."""
 
-    def __init__(self, battle_queue: 'BattleQueue') -> None:
+    def __init__(self, battle_queue: 'BattleQueue',
+                 rng: Optional[random.Random] = None) -> None:
         """
-        Initialize this Playstyle with BattleQueue as its battle queue.
+        Initialize this Playstyle with BattleQueue as its battle queue and
+        rng as its random number generator.
         """
-        self.battle_queue = battle_queue
+        super().__init__(battle_queue, rng)
         self.is_manual = False
 
-    def select_attack(self, parameter: Any = None) -> str:
-        """Return the attack for the next character in this Playstyle's
+    def select_action(self, parameter: Any = None) -> int:
+        """Return the action for the next character in this Playstyle's
+        battle_queue at random.
+        """
+        return self.choose_action(self.battle_queue.peek(),
+                                  self.rng.choice(ATTACKS))
+
+    def choose_action(self, player: 'Characters', choice: int) -> int:
+        """Return choice (ATTACK or SPECIAL) if player has enough SP for it,
+        else the first of ATTACKS that player has enough SP for, and
+        NO_ACTION if there is none.
+        """
+        return _choose_from(player.action_mask, choice)
+
+    def action_for(self, matchup: Matchup, state: int) -> int:
+        """Return the action for character 0 in state of matchup at random.
+        """
+        return _choose_from(matchup.actions(state, 0),
+                            self.rng.choice(ATTACKS))
+
+    def select_actions(self, matchup: Matchup,
+                       states: Sequence[int]) -> 'np.ndarray':
+        """Return the action for character 0 in each of states of matchup
+        at random, as a uint8 array.
+
+        The choices are made for every state at once: they are drawn from
+        rng as one block of random bits, as a BufferedRandomPlaystyle draws
+        them, and checked against each character's SP with array
+        operations. So the actions follow the same distribution as those of
+        action_for, but are not the ones it would return with the same seed.
+        """
+        import numpy as np
+        states = np.asarray(states, np.uint64)
+        count = len(states)
+        sp = states >> np.uint64(SP0_SHIFT) & np.uint64(FIELD_MASK)
+        can_attack = sp >= matchup.stats.attack_cost
+        can_special = sp >= matchup.stats.special_cost
+        bits = self.rng.getrandbits(count) if count else 0
+        specials = np.unpackbits(
+            np.frombuffer(bits.to_bytes((count + 7) // 8, 'little'),
+                          np.uint8),
+            count=count, bitorder='little').view(np.bool_)
+        # As in choose_action: the choice if there is enough SP for it,
+        # else the first of ATTACKS there is enough SP for.
+        fallback = np.where(can_attack, ATTACK,
+                            np.where(can_special, SPECIAL, NO_ACTION))
+        return np.where(specials & can_special, SPECIAL,
+                        np.where(~specials & can_attack, ATTACK,
+                                 fallback)).astype(np.uint8)
+
+
+class BufferedRandomPlaystyle(RandomPlaystyle):
+    """A RandomPlaystyle that draws its random choices in large blocks.
+
+    Instead of one rng.choice() call per decision, a block of random bits
+    is drawn at once with rng.getrandbits() and turned into a run of
+    ATTACKs and SPECIALs, which is then handed out one choice per decision.
+    Every choice is still ATTACK or SPECIAL with equal probability, so the
+    moves follow the same distribution as RandomPlaystyle.
+
+    The first block is small, since most games only need a few dozen
+    choices, and every block after it is twice as big as the last, up to
+    max_block_size.
+    """
+    block_size: int
+    max_block_size: int
+
+    def __init__(self, battle_queue: 'BattleQueue',
+                 rng: Optional[random.Random] = None,
+                 max_block_size: int = 4096) -> None:
+        """
+        Initialize this Playstyle with BattleQueue as its battle queue, rng
+        as its random number generator and at most max_block_size random
+        choices per block.
+        """
+        super().__init__(battle_queue, rng)
+        self.block_size = min(32, max_block_size)
+        self.max_block_size = max_block_size
+        self._choices = iter(())
+
+    def select_action(self, parameter: Any = None) -> int:
+        """Return the action for the next character in this Playstyle's
         battle_queue at random.
+        """
+        try:
+            choice = next(self._choices)
+        except StopIteration:
+            self._choices = iter(self._draw_block())
+            choice = next(self._choices)
+        return self.choose_action(self.battle_queue.peek(), choice)
+
+    def _draw_block(self) -> bytes:
+        """Return block_size random ATTACKs and SPECIALs, as the bytes of a
+        bytes object, and double block_size for the next block.
+        """
+        size = self.block_size
+        self.block_size = min(size * 2, self.max_block_size)
+        return format(self.rng.getrandbits(size), '0{}b'.format(size)) \
+            .encode().translate(_BITS_TO_ATTACKS)
+
+
+# How an ExpectimaxPlaystyle expects the enemy to move: like a
+# RandomPlaystyle, or always making the move that is worst for it.
+RANDOM_OPPONENT = 'random'
+ADVERSARIAL_OPPONENT = 'adversarial'
+OPPONENTS = (RANDOM_OPPONENT, ADVERSARIAL_OPPONENT)
+
+# The value of a battle that ended, to the character that searched.
+_RESULT_VALUES = {WIN: 1.0, LOSS: -1.0}
+
+# The transposition tables shared by every ExpectimaxPlaystyle that searches
+# the same matchup to the same depth against the same opponent.
+_SHARED_TABLES: Dict[Tuple[Any, ...], TranspositionTable] = {}
+
+
+class ExpectimaxPlaystyle(Playstyle):
+    """A Playstyle that searches the moves ahead of the next character in
+    its battle queue, and makes the one with the best expected result.
+
+    A won battle is worth 1, a lost one -1 and any other end 0. The enemy's
+    turns are chance nodes (every move it may make with the chance a
+    RandomPlaystyle makes it) against a RANDOM_OPPONENT, and min nodes
+    against an ADVERSARIAL_OPPONENT. Searching to the end of the battle
+    (depth None) is exact. With a depth, a battle that is still going after
+    depth turns is worth the difference in HP over 200.
+
+    Special attacks put characters back in the queue, so the same state is
+    reached by many orders of moves; every state's value is kept in a
+    TranspositionTable (a1_state) so that it is only searched once. Unless
+    one is given, the table is shared by every ExpectimaxPlaystyle with the
+    same depth and opponent, and kept for each matchup, so the states
+    searched in one battle are not searched again in the next.
+
+    depth - The number of turns to search ahead, or None to search to the
+            end of the battle.
+    opponent - RANDOM_OPPONENT or ADVERSARIAL_OPPONENT.
+    """
+    searches = True
+    depth: Optional[int]
+    opponent: str
 
-        Attributes:
-            - attacks: A list of valid attacks
-        """
-        import random
-        attacks = ['A', 'S']
-        parameter = random.choice(attacks)
-        for player in self.battle_queue.queue:
-            if player.defense == 10:
-                if player.sp >= 10:
-                    return parameter
-                elif 3 <= player.sp < 10:
-                    return 'A'
-
-            if player.defense == 8:
-                if player.sp >= 30:
-                    return parameter
-                elif 5 <= player.sp < 30:
-                    return 'A'
+    def __init__(self, battle_queue: 'BattleQueue',
+                 rng: Optional[random.Random] = None,
+                 depth: Optional[int] = None,
+                 opponent: str = RANDOM_OPPONENT,
+                 table: Optional[TranspositionTable] = None) -> None:
+        """
+        Initialize this Playstyle with BattleQueue as its battle queue,
+        searching depth turns ahead against opponent, and storing what it
+        finds in table.
+
+        rng is not used, as the search is deterministic.
+        """
+        if opponent not in OPPONENTS:
+            raise ValueError("opponent must be one of {}".format(OPPONENTS))
+        super().__init__(battle_queue, rng)
+        self.is_manual = False
+        self.depth = depth
+        self.opponent = opponent
+        self._table = table
+
+    def table(self, matchup: Matchup) -> TranspositionTable:
+        """
+        Return the TranspositionTable this Playstyle uses for matchup.
+        """
+        if self._table is not None:
+            return self._table
+        key = (matchup.stats, matchup.enemy_stats, self.depth, self.opponent)
+        table = _SHARED_TABLES.get(key)
+        if table is None:
+            table = _SHARED_TABLES[key] = TranspositionTable()
+        return table
+
+    def select_action(self, parameter: Any = None) -> int:
+        """Return the action with the best expected result for the next
+        character in this Playstyle's battle_queue.
+        """
+        player = self.battle_queue.peek()
+        if not player.action_mask:
+            return NO_ACTION
+        matchup = matchup_of(player)
+        return self.action_for(matchup,
+                               matchup.encode(player, self.battle_queue))
+
+    def action_for(self, matchup: Matchup, state: int) -> int:
+        """Return the action with the best expected result for character 0
+        in state of matchup.
+        """
+        table = self.table(matchup)
+        best_action, best_value = NO_ACTION, None
+        for action, after in matchup.moves(state):
+            value = self._search(matchup, table, after, self.depth)[0]
+            if best_value is None or value > best_value:
+                best_action, best_value = action, value
+        return best_action
+
+    def _search(self, matchup: Matchup, table: TranspositionTable,
+                state: int, depth: Optional[int]) -> Tuple[float, bool]:
+        """Return the value of state searched depth turns ahead, and whether
+        it is exact (i.e. every line searched reached the end of the
+        battle).
+
+        An entry of table is (value, depth), with a depth of None if the
+        value is exact, and is only used at the depth it was searched to.
+        """
+        entry = table.get(state)
+        if entry is not None and (entry[1] is None or entry[1] == depth):
+            return entry[0], entry[1] is None
+
+        result = matchup.result(state)
+        if result is not ONGOING:
+            value, exact = _RESULT_VALUES.get(result, 0.0), True
+        elif depth == 0:
+            value = ((state >> HP0_SHIFT & FIELD_MASK) -
+                     (state >> HP1_SHIFT & FIELD_MASK)) / 200
+            exact = False
+        else:
+            next_depth = None if depth is None else depth - 1
+            values = []
+            exact = True
+            for _, after in matchup.moves(state):
+                child_value, child_exact = self._search(matchup, table,
+                                                        after, next_depth)
+                values.append(child_value)
+                exact = exact and child_exact
+            if matchup.mover(state) == 0:
+                value = max(values)
+            elif self.opponent == ADVERSARIAL_OPPONENT:
+                value = min(values)
             else:
-                return 'X'
+                # A RandomPlaystyle picks each move it can make half the
+                # time, and only has one move when it is low on SP.
+                value = sum(values) / len(values)
+        table.put(state, (value, None if exact else depth))
+        return value, exact
+
+
+# The reward of a battle that ended, to the character that searched.
+_REWARDS = {WIN: 1.0, LOSS: 0.0}
+
+
+class _TreeNode:
+    """A state in the search tree of an MCTSPlaystyle.
+
+    untried - (action, next state) for every move from this state that has
+              no child yet.
+    children - The child for every move that has been tried, by action.
+    visits - The number of rollouts played through this state.
+    score - The total reward of those rollouts to character 0.
+    """
+    __slots__ = ('state', 'mover', 'result', 'untried', 'children',
+                 'visits', 'score')
+    untried: List[Tuple[int, int]]
+    children: Dict[int, '_TreeNode']
+
+    def __init__(self, matchup: Matchup, state: int) -> None:
+        """Initialize an unvisited node for state of matchup."""
+        self.state = state
+        self.mover = matchup.mover(state)
+        self.result = matchup.result(state)
+        self.untried = list(matchup.moves(state)) \
+            if self.result is ONGOING else []
+        self.children = {}
+        self.visits = 0
+        self.score = 0.0
+
+
+class MCTSPlaystyle(Playstyle):
+    """A Playstyle that picks moves by Monte Carlo tree search (UCT).
+
+    Every rollout walks down the tree of states from the current one,
+    picking at every state the move with the best upper confidence bound
+    for the character making it, adds one new state to the tree, plays the
+    rest of the battle out with random moves and counts its result (1 for
+    a win, 0 for a loss and 0.5 for any other end) on the way back up. The
+    move made is the one tried most often.
+
+    Rollouts are played on the packed states of a1_state rather than on
+    copies of the characters. The search stops after rollouts rollouts, or
+    after time_budget seconds if that comes first, so how well it plays
+    scales with the time it is given, and a move never takes longer than
+    the budget (or than the one rollout that is always played). With a
+    time budget the moves made depend on how fast the machine is, so only
+    a rollout budget gives battles that can be replayed from their seed.
+
+    The tree is kept after a move, and the next search starts from the
+    state reached in it (if it is found within REUSE_DEPTH moves), with
+    every rollout played through that state already counted.
+
+    rollouts - The most rollouts to play per move.
+    time_budget - The most seconds to search per move, or None.
+    exploration - The weight of the exploration term of the bound.
+    rollouts_played - The number of rollouts played for the last move.
+    reused - The number of rollouts the last search started with from the
+             tree of the move before.
+    """
+    searches = True
+    rollouts: int
+    time_budget: Optional[float]
+    exploration: float
+    rollouts_played: int
+    reused: int
+
+    def __init__(self, battle_queue: 'BattleQueue',
+                 rng: Optional[random.Random] = None,
+                 rollouts: int = DEFAULT_ROLLOUTS,
+                 time_budget: Optional[float] = None,
+                 exploration: float = math.sqrt(2)) -> None:
+        """
+        Initialize this Playstyle with BattleQueue as its battle queue and
+        rng as its random number generator, searching for at most rollouts
+        rollouts or time_budget seconds per move.
+        """
+        super().__init__(battle_queue, rng)
+        self.is_manual = False
+        self.rollouts = rollouts
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rollouts_played = 0
+        self.reused = 0
+        self._matchup = None
+        self._root = None
+
+    def select_action(self, parameter: Any = None) -> int:
+        """Return the move tried most often by a search from the state of
+        the next character in this Playstyle's battle_queue.
+        """
+        player = self.battle_queue.peek()
+        mask = player.action_mask
+        if mask != ATTACK | SPECIAL:
+            return mask
+        matchup = matchup_of(player)
+        return self.action_for(matchup,
+                               matchup.encode(player, self.battle_queue))
+
+    def action_for(self, matchup: Matchup, state: int) -> int:
+        """Return the move tried most often by a search from state of
+        matchup, for character 0.
+
+        Called for many unrelated states (as by select_actions), every
+        search starts a new tree, as none of them is found in the last one.
+        """
+        mask = matchup.actions(state, 0)
+        if mask != ATTACK | SPECIAL:
+            return mask
+        root = self._find_root(matchup, state)
+        self.reused = root.visits
+        self._search(matchup, root)
+
+        best_action, best_visits = NO_ACTION, -1
+        for action, child in sorted(root.children.items()):
+            if child.visits > best_visits:
+                best_action, best_visits = action, child.visits
+        return best_action
+
+    def _find_root(self, matchup: Matchup, state: int) -> _TreeNode:
+        """Return the node for state in the tree of the last search, or a
+        new one if it is not there.
+        """
+        level = [self._root] if matchup is self._matchup else []
+        for _ in range(REUSE_DEPTH + 1):
+            for node in level:
+                if node.state == state:
+                    self._root = node
+                    return node
+            level = [child for node in level
+                     for child in node.children.values()]
+        self._matchup = matchup
+        self._root = _TreeNode(matchup, state)
+        return self._root
+
+    def _search(self, matchup: Matchup, root: _TreeNode) -> None:
+        """Play rollouts from root until the budget runs out, but at least
+        one, so that root always has a child to pick a move from.
+        """
+        rng = self.rng
+        exploration = self.exploration
+        deadline = None if self.time_budget is None else \
+            time.perf_counter() + self.time_budget
+        played = 0
+        while not played or played < self.rollouts and \
+                (deadline is None or time.perf_counter() < deadline):
+            node = root
+            path = [node]
+            while not node.untried and node.children:
+                log_visits = math.log(node.visits)
+                best_bound = -1.0
+                for child in node.children.values():
+                    mean = child.score / child.visits
+                    if node.mover:
+                        mean = 1 - mean
+                    bound = mean + exploration * \
+                        math.sqrt(log_visits / child.visits)
+                    if bound > best_bound:
+                        best_bound, best_child = bound, child
+                node = best_child
+                path.append(node)
+            if node.untried:
+                action, state = node.untried.pop()
+                node.children[action] = node = _TreeNode(matchup, state)
+                path.append(node)
+
+            result = node.result
+            if result is ONGOING:
+                result = matchup.rollout(node.state, rng)
+            reward = _REWARDS.get(result, 0.5)
+            for visited in path:
+                visited.visits += 1
+                visited.score += reward
+            played += 1
+        self.rollouts_played = played
+
+
+# The solved tables opened by every SolvedPlaystyle, by matchup and
+# directory.
+_SOLVED_TABLES: Dict[Tuple[Any, ...], SolvedTable] = {}
+
+
+class SolvedPlaystyle(Playstyle):
+    """A Playstyle that makes the best move found by a1_solver for the
+    next character in its battle queue, i.e. plays perfectly against an
+    enemy that plays perfectly.
+
+    The table of a matchup is solved and written to directory the first
+    time it is needed (which takes a second at most for the built-in
+    classes), then memory-mapped once and shared by every SolvedPlaystyle,
+    so a move is one lookup. A state that cannot be reached from the start
+    of a battle (e.g. after HP was set by hand) is not in the table, and is
+    searched by an ExpectimaxPlaystyle against an adversarial opponent
+    instead.
+
+    A matchup whose special attacks can fill the queue with more than 31
+    characters cannot be tabled, and raises ValueError the first time it
+    is needed.
+
+    directory - The directory the tables are kept in.
+    """
+    searches = True
+    directory: str
+
+    def __init__(self, battle_queue: 'BattleQueue',
+                 rng: Optional[random.Random] = None,
+                 directory: str = SOLVED_DIRECTORY) -> None:
+        """
+        Initialize this Playstyle with BattleQueue as its battle queue,
+        keeping the solved tables in directory.
+
+        rng is not used, as the moves are looked up.
+        """
+        super().__init__(battle_queue, rng)
+        self.is_manual = False
+        self.directory = directory
+        self._search = ExpectimaxPlaystyle(battle_queue,
+                                           opponent=ADVERSARIAL_OPPONENT)
+
+    def table(self, matchup: Matchup) -> SolvedTable:
+        """
+        Return the solved table of matchup.
+        """
+        key = (matchup.stats, matchup.enemy_stats, self.directory)
+        table = _SOLVED_TABLES.get(key)
+        if table is None:
+            table = _SOLVED_TABLES[key] = load_table(matchup, self.directory)
+        return table
+
+    def select_action(self, parameter: Any = None) -> int:
+        """Return the best move for the next character in this Playstyle's
+        battle_queue.
+        """
+        player = self.battle_queue.peek()
+        mask = player.action_mask
+        if mask != ATTACK | SPECIAL:
+            return mask
+        matchup = matchup_of(player)
+        return self.action_for(matchup,
+                               matchup.encode(player, self.battle_queue))
+
+    def action_for(self, matchup: Matchup, state: int) -> int:
+        """Return the best move for character 0 in state of matchup.
+        """
+        entry = self.table(matchup).lookup(state)
+        if entry is None:
+            return self._search.action_for(matchup, state)
+        return entry[1]
+
+    def select_actions(self, matchup: Matchup,
+                       states: Sequence[int]) -> 'np.ndarray':
+        """Return the best move for character 0 in each of states of
+        matchup, as a uint8 array.
+
+        The states are looked up in the table all at once (see
+        SolvedTable.lookup_many), and only those not in it are searched one
+        at a time.
+        """
+        import numpy as np
+        states = np.asarray(states, np.uint64)
+        _, actions, found = self.table(matchup).lookup_many(states)
+        for i in np.flatnonzero(~found):
+            actions[i] = self._search.action_for(matchup, int(states[i]))
+        return actions
 
 
 if __name__ == '__main__':
@@ -0,0 +1,351 @@
+"""
+Unittests for the Playstyle classes of A1.
+"""
+import functools
+import random
+import time
+import unittest
+
+from a1_battle_queue import BattleQueue
+from a1_battle_sim import P1_WINS, play_game
+from a1_characters import ATTACK, NO_ACTION, SPECIAL, Mage, Rogue
+from a1_game import GameSession
+from a1_playstyle import (ADVERSARIAL_OPPONENT, BufferedRandomPlaystyle,
+                          ExpectimaxPlaystyle, ManualPlaystyle,
+                          MCTSPlaystyle, RandomPlaystyle)
+from a1_state import TranspositionTable, matchup_of
+
+
+class RandomPlaystyleUnitTests(unittest.TestCase):
+    playstyle_class = RandomPlaystyle
+
+    def setUp(self):
+        """
+        Sets up a Battle Queue with a Rogue at the front, whose playstyle
+        is seeded.
+        """
+        self.battle_queue = BattleQueue()
+        self.playstyle = self.playstyle_class(self.battle_queue,
+                                              random.Random(3))
+        self.p1 = Rogue("P1", self.battle_queue, self.playstyle)
+        self.p2 = Mage("P2", self.battle_queue, self.playstyle)
+        self.p1.enemy = self.p2
+        self.p2.enemy = self.p1
+        self.battle_queue.add(self.p1)
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp.
+        """
+        del self.battle_queue
+        del self.playstyle
+        del self.p1
+        del self.p2
+
+    def test_choices_are_even(self):
+        """
+        Test to make sure 'A' and 'S' are picked about equally often when
+        both are available.
+        """
+        moves = [self.playstyle.select_attack() for _ in range(20000)]
+        self.assertEqual(set(moves), {'A', 'S'})
+        self.assertAlmostEqual(moves.count('S') / len(moves), 0.5,
+                               delta=0.02)
+
+    def test_only_attack_when_low_on_sp(self):
+        """
+        Test to make sure only 'A' is picked when there isn't enough SP for
+        'S', and 'X' when there isn't enough SP for either.
+        """
+        self.p1.sp = 9
+        moves = {self.playstyle.select_attack() for _ in range(100)}
+        self.assertEqual(moves, {'A'})
+
+        self.p1.sp = 2
+        self.assertEqual(self.playstyle.select_attack(), 'X')
+        self.assertEqual(self.playstyle.select_action(), NO_ACTION)
+
+    def test_seeded_moves_repeat(self):
+        """
+        Test to make sure two playstyles with the same seed pick the same
+        moves.
+        """
+        other = self.playstyle_class(self.battle_queue, random.Random(3))
+        moves = [self.playstyle.select_attack() for _ in range(5000)]
+        other_moves = [other.select_attack() for _ in range(5000)]
+        self.assertEqual(moves, other_moves)
+
+    def test_actions_match_keys(self):
+        """
+        Test to make sure select_action picks the same moves as
+        select_attack, as actions.
+        """
+        other = self.playstyle_class(self.battle_queue, random.Random(3))
+        keys = [self.playstyle.select_attack() for _ in range(100)]
+        actions = [other.select_action() for _ in range(100)]
+        self.assertEqual(actions, [ATTACK if key == 'A' else SPECIAL
+                                   for key in keys])
+
+    def test_batch_follows_sp(self):
+        """
+        Test to make sure select_actions picks 'A' and 'S' about equally
+        often in battles where both are available, only 'A' in those low on
+        SP and nothing in those without enough SP for either.
+        """
+        matchup = matchup_of(self.p1)
+        states = []
+        for sp in [100, 9, 2]:
+            self.p1.sp = sp
+            states.append(matchup.encode(self.p1, self.battle_queue))
+        actions = self.playstyle.select_actions(matchup, states * 10000)
+        self.assertEqual(len(actions), 30000)
+        both, low, none = actions[0::3], actions[1::3], actions[2::3]
+        self.assertEqual(set(both.tolist()), {ATTACK, SPECIAL})
+        self.assertAlmostEqual((both == SPECIAL).mean(), 0.5, delta=0.02)
+        self.assertEqual(set(low.tolist()), {ATTACK})
+        self.assertEqual(set(none.tolist()), {NO_ACTION})
+
+        other = self.playstyle_class(self.battle_queue, random.Random(3))
+        self.assertEqual(other.select_actions(matchup, states * 10).tolist(),
+                         self.playstyle_class(self.battle_queue,
+                                              random.Random(3))
+                         .select_actions(matchup, states * 10).tolist())
+        self.assertEqual(len(other.select_actions(matchup, [])), 0)
+
+
+class BufferedRandomPlaystyleUnitTests(RandomPlaystyleUnitTests):
+    playstyle_class = BufferedRandomPlaystyle
+
+
+class ManualPlaystyleUnitTests(unittest.TestCase):
+    def test_keys_to_actions(self):
+        """
+        Test to make sure the keys pressed become actions, and any other
+        key becomes NO_ACTION.
+        """
+        playstyle = ManualPlaystyle(BattleQueue())
+        self.assertEqual(playstyle.select_action('A'), ATTACK)
+        self.assertEqual(playstyle.select_action('S'), SPECIAL)
+        self.assertEqual(playstyle.select_action('X'), NO_ACTION)
+        self.assertEqual(playstyle.select_action(None), NO_ACTION)
+        self.assertEqual(playstyle.select_attack('S'), 'S')
+        self.assertEqual(playstyle.select_attack('q'), 'X')
+
+
+class ExpectimaxPlaystyleUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a Battle Queue with a Mage at the front, who searches with
+        a table of its own, against a Rogue.
+        """
+        self.battle_queue = BattleQueue()
+        self.table = TranspositionTable()
+        self.playstyle = ExpectimaxPlaystyle(self.battle_queue,
+                                             table=self.table)
+        self.p1 = Mage("P1", self.battle_queue, self.playstyle)
+        self.p2 = Rogue("P2", self.battle_queue, self.playstyle)
+        self.p1.enemy = self.p2
+        self.p2.enemy = self.p1
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p2)
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp.
+        """
+        del self.battle_queue
+        del self.table
+        del self.playstyle
+        del self.p1
+        del self.p2
+
+    def test_finishing_blow(self):
+        """
+        Test to make sure an attack that wins the battle is made before
+        the enemy can strike back (the normal one if either would), and
+        nothing is made without the SP for it.
+        """
+        self.p1.hp = 5
+        self.p2.hp = 10
+        self.assertEqual(self.playstyle.select_action(), ATTACK)
+        self.p2.hp = 30
+        self.assertEqual(self.playstyle.select_attack(), 'S')
+        self.p1.sp = 4
+        self.assertEqual(self.playstyle.select_action(), NO_ACTION)
+
+    def test_table_is_reused(self):
+        """
+        Test to make sure a second search of the same state is answered
+        from the table.
+        """
+        first = self.playstyle.select_action()
+        size, misses = len(self.table), self.table.misses
+        self.assertEqual(self.playstyle.select_action(), first)
+        self.assertEqual(len(self.table), size)
+        self.assertEqual(self.table.misses, misses)
+        self.assertGreater(self.table.hit_rate, 0)
+
+    def test_batch_matches_select_action(self):
+        """
+        Test to make sure select_actions picks the move select_action picks
+        in each battle.
+        """
+        matchup = matchup_of(self.p1)
+        states, expected = [], []
+        for hp, enemy_hp, sp in [(5, 10, 100), (5, 30, 100), (5, 30, 4),
+                                 (60, 90, 40), (100, 100, 100)]:
+            self.p1.hp, self.p2.hp, self.p1.sp = hp, enemy_hp, sp
+            states.append(matchup.encode(self.p1, self.battle_queue))
+            expected.append(self.playstyle.select_action())
+        self.assertEqual(
+            self.playstyle.select_actions(matchup, states).tolist(),
+            expected)
+        self.assertEqual(expected[:3], [ATTACK, SPECIAL, NO_ACTION])
+
+    def test_depth_limited_search(self):
+        """
+        Test to make sure a search a few turns deep, against either
+        opponent, still makes a valid move.
+        """
+        for opponent in ['random', ADVERSARIAL_OPPONENT]:
+            playstyle = ExpectimaxPlaystyle(self.battle_queue, depth=3,
+                                            opponent=opponent)
+            self.assertIn(playstyle.select_action(), [ATTACK, SPECIAL])
+        with self.assertRaises(ValueError):
+            ExpectimaxPlaystyle(self.battle_queue, opponent='lucky')
+
+    def test_beats_random(self):
+        """
+        Test to make sure a Mage that searches beats a random Rogue far
+        more often than a random Mage does.
+        """
+        wins = sum(play_game(Mage, Rogue, ExpectimaxPlaystyle,
+                             RandomPlaystyle, seed=seed)[0] == P1_WINS
+                   for seed in range(300))
+        random_wins = sum(play_game(Mage, Rogue, RandomPlaystyle,
+                                    RandomPlaystyle, seed=seed)[0] == P1_WINS
+                          for seed in range(300))
+        self.assertGreater(wins, 0.7 * 300)
+        self.assertLess(random_wins, 0.3 * 300)
+
+
+class MCTSPlaystyleUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a Battle Queue with a Mage at the front, who searches with
+        a seeded MCTSPlaystyle, against a Rogue.
+        """
+        self.battle_queue = BattleQueue()
+        self.playstyle = MCTSPlaystyle(self.battle_queue, random.Random(3),
+                                       rollouts=300)
+        self.p1 = Mage("P1", self.battle_queue, self.playstyle)
+        self.p2 = Rogue("P2", self.battle_queue,
+                        RandomPlaystyle(self.battle_queue, random.Random(4)))
+        self.p1.enemy = self.p2
+        self.p2.enemy = self.p1
+        self.battle_queue.add(self.p1)
+        self.battle_queue.add(self.p2)
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp.
+        """
+        del self.battle_queue
+        del self.playstyle
+        del self.p1
+        del self.p2
+
+    def test_finishing_blow(self):
+        """
+        Test to make sure the attack that wins the battle is made before
+        the enemy can strike back, and nothing is made without the SP for
+        it.
+        """
+        self.p1.hp = 5
+        self.p2.hp = 30
+        self.assertEqual(self.playstyle.select_action(), SPECIAL)
+        self.assertEqual(self.playstyle.rollouts_played, 300)
+        self.p1.sp = 4
+        self.assertEqual(self.playstyle.select_action(), NO_ACTION)
+
+    def test_batch_of_battles(self):
+        """
+        Test to make sure select_actions searches each battle on its own,
+        making the finishing blow where there is one.
+        """
+        matchup = matchup_of(self.p1)
+        states = []
+        for hp, enemy_hp, sp in [(5, 30, 100), (100, 100, 100), (5, 30, 4),
+                                 (5, 30, 12)]:
+            self.p1.hp, self.p2.hp, self.p1.sp = hp, enemy_hp, sp
+            states.append(matchup.encode(self.p1, self.battle_queue))
+        actions = self.playstyle.select_actions(matchup, states).tolist()
+        self.assertEqual(actions[0], SPECIAL)
+        self.assertIn(actions[1], [ATTACK, SPECIAL])
+        self.assertEqual(actions[2:], [NO_ACTION, ATTACK])
+
+    def test_seeded_moves_repeat(self):
+        """
+        Test to make sure two playstyles with the same seed and a rollout
+        budget pick the same moves.
+        """
+        moves = [play_game(Mage, Rogue, functools.partial(
+            MCTSPlaystyle, rollouts=50), RandomPlaystyle, seed=seed)
+                 for seed in range(10)]
+        again = [play_game(Mage, Rogue, functools.partial(
+            MCTSPlaystyle, rollouts=50), RandomPlaystyle, seed=seed)
+                 for seed in range(10)]
+        self.assertEqual(moves, again)
+
+    def test_tree_is_reused(self):
+        """
+        Test to make sure the search for a character's next move starts
+        from the rollouts its last search played through the state reached.
+        """
+        session = GameSession('m', 'A', 'c', 'r', 'B', 'r',
+                              random.Random(5))
+        playstyle = session.p1.playstyle
+        session.perform_attack()
+        self.assertEqual(playstyle.reused, 0)
+        while session.battle_queue.peek() is not session.p1:
+            session.perform_attack()
+        session.perform_attack()
+        self.assertGreater(playstyle.reused, 0)
+        self.assertEqual(playstyle.rollouts_played, playstyle.rollouts)
+
+    def test_time_budget(self):
+        """
+        Test to make sure the search stops when its time is up.
+        """
+        self.playstyle.rollouts = 10 ** 9
+        self.playstyle.time_budget = 0.01
+        start = time.perf_counter()
+        self.assertIn(self.playstyle.select_action(), [ATTACK, SPECIAL])
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertGreater(self.playstyle.rollouts_played, 0)
+
+    def test_no_budget(self):
+        """
+        Test to make sure a search with no time or rollouts to spend still
+        plays one rollout and makes a move, rather than skipping the turn.
+        """
+        for rollouts, time_budget in [(300, 0.0), (0, None), (0, 0.0)]:
+            playstyle = MCTSPlaystyle(self.battle_queue, random.Random(3),
+                                      rollouts=rollouts,
+                                      time_budget=time_budget)
+            self.assertIn(playstyle.select_action(), [ATTACK, SPECIAL])
+            self.assertEqual(playstyle.rollouts_played, 1)
+
+    def test_beats_random(self):
+        """
+        Test to make sure a Mage that searches beats a random Rogue far
+        more often than a random Mage does, even with few rollouts.
+        """
+        wins = sum(play_game(Mage, Rogue, functools.partial(
+            MCTSPlaystyle, rollouts=100), RandomPlaystyle,
+                             seed=seed)[0] == P1_WINS for seed in range(60))
+        self.assertGreater(wins, 0.5 * 60)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
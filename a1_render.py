@@ -0,0 +1,161 @@
+"""
+Off-screen rendering of recorded battles, for reviewing matches on a machine
+without a display.
+
+A replay is a JSON file that describes one battle, either as a game between
+AI playstyles and the seed it was played with (the same seed gives the same
+game as a1_battle_sim.play_game):
+
+    {"p1": "m", "p1_name": "A", "p1_style": "r",
+     "p2": "r", "p2_name": "B", "p2_style": "r", "seed": 7}
+
+or as the moves that were made, in order, by whoever's turn it was:
+
+    {"p1": "m", "p1_name": "A", "p2": "r", "p2_name": "B", "moves": "ASAA"}
+
+Every replay is drawn by a1_ui.draw_frame onto an off-screen surface under
+SDL's dummy video driver, as fast as the CPU allows. A frame is drawn every
+tick of the UI's animation, with a move every FRAMES_PER_MOVE frames, as in
+a game played with a1_ui. A frame whose pixels are the same as the last one
+written is skipped. For example:
+
+    python -m a1_render replays/*.json --out frames --format png
+
+writes frames/<replay>/<frame number>.png for every frame that changed, and
+--format raw writes frames/<replay>.rgb instead: every frame that changed as
+its frame number (a 4-byte little-endian unsigned int) followed by its
+pixels (width * height * 3 bytes of RGB, row by row).
+"""
+import argparse
+import json
+import os
+import random
+import struct
+from typing import Iterator, List, Optional, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+import a1_game
+import a1_ui
+from a1_battle_sim import MAX_TURNS
+
+FRAMES_PER_MOVE = round(a1_ui.AI_THINK_TIME * 1000 / a1_ui.GAME_SPEED)
+SCREEN_SIZE = (a1_ui.NUMBER_OF_CHARACTERS * a1_ui.CHARACTER_SIZE,
+               a1_ui.CHARACTER_SIZE + a1_ui.PADDING * 2)
+FORMATS = ['png', 'raw']
+FRAME_NUMBER = struct.Struct('<I')
+
+
+def load_replay(path: str) -> dict:
+    """
+    Return the replay stored in the JSON file at path.
+    """
+    with open(path) as replay_file:
+        return json.load(replay_file)
+
+
+def start_renderer() -> None:
+    """
+    Initialize pygame without a window and load a1_ui's assets.
+    """
+    pygame.init()
+    # The assets are converted to the display's pixel format, so a display
+    # mode has to be set even though nothing is drawn to it.
+    pygame.display.set_mode((1, 1))
+    a1_ui.load_assets()
+
+
+def render_frames(replay: dict) -> Iterator[Tuple[int, pygame.Surface]]:
+    """
+    Play replay, and yield the number and surface of every frame whose
+    pixels differ from the last frame yielded.
+
+    The surface is drawn over by the next frame, so it must be used (or
+    copied) before the next frame is asked for.
+    """
+    moves = replay.get('moves')
+    if moves is None:
+        a1_game.set_up_game_with(
+            replay['p1'], replay['p1_name'], replay['p1_style'],
+            replay['p2'], replay['p2_name'], replay['p2_style'],
+            random.Random(replay.get('seed')))
+    else:
+        a1_game.set_up_game_with(replay['p1'], replay['p1_name'], 'm',
+                                 replay['p2'], replay['p2_name'], 'm')
+        moves = iter(moves)
+
+    surface = pygame.Surface(SCREEN_SIZE).convert()
+    a1_ui.DRAWN.clear()
+    last_pixels = None
+    frame = 0
+    turns = 0
+    while True:
+        if frame % FRAMES_PER_MOVE == 1:
+            if a1_game.GAME_IS_OVER or turns == MAX_TURNS:
+                break
+            if moves is not None:
+                a1_game.LAST_KEY_PRESSED = next(moves, None)
+                if a1_game.LAST_KEY_PRESSED is None:
+                    break
+            a1_game.perform_attack()
+            turns += 1
+
+        if a1_ui.draw_frame(surface, a1_game.update_ui()):
+            pixels = pygame.image.tobytes(surface, 'RGB')
+            if pixels != last_pixels:
+                last_pixels = pixels
+                yield frame, surface
+        frame += 1
+
+
+def render_replay(replay: dict, output: str,
+                  frame_format: str = 'png') -> int:
+    """
+    Render replay to output (a directory for png, a file for raw), and
+    return the number of frames written.
+    """
+    written = 0
+    if frame_format == 'png':
+        os.makedirs(output, exist_ok=True)
+        for frame, surface in render_frames(replay):
+            pygame.image.save(surface, os.path.join(
+                output, '{:05d}.png'.format(frame)))
+            written += 1
+    else:
+        with open(output, 'wb') as stream:
+            for frame, surface in render_frames(replay):
+                stream.write(FRAME_NUMBER.pack(frame))
+                stream.write(pygame.image.tobytes(surface, 'RGB'))
+                written += 1
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Parse the command line arguments in argv, and render every replay they
+    name.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('replays', nargs='+', help="replay JSON files")
+    parser.add_argument('--out', default='frames',
+                        help="directory to write the frames to")
+    parser.add_argument('--format', choices=FORMATS, default='png',
+                        help="numbered PNGs, or one raw RGB stream per " +
+                        "replay")
+    args = parser.parse_args(argv)
+
+    start_renderer()
+    os.makedirs(args.out, exist_ok=True)
+    for path in args.replays:
+        name = os.path.splitext(os.path.basename(path))[0]
+        output = os.path.join(args.out, name)
+        if args.format == 'raw':
+            output += '.rgb'
+        written = render_replay(load_replay(path), output, args.format)
+        print("{}: {} frames written to {}".format(path, written, output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Unittests for the off-screen replay renderer of A1.
+"""
+import unittest
+
+import pygame
+
+import a1_game
+from a1_battle_sim import P2_WINS, play_game
+from a1_characters import Mage, Rogue
+from a1_playstyle import RandomPlaystyle
+from a1_render import FRAMES_PER_MOVE, render_frames, start_renderer
+
+SEEDED_REPLAY = {'p1': 'm', 'p1_name': 'A', 'p1_style': 'r',
+                 'p2': 'r', 'p2_name': 'B', 'p2_style': 'r', 'seed': 7}
+
+
+class RenderUnitTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Starts pygame without a window.
+        """
+        start_renderer()
+
+    def test_seeded_replay(self):
+        """
+        Test to make sure a seeded replay plays the same game as
+        play_game, drawing FRAMES_PER_MOVE frames per move.
+        """
+        result, turns = play_game(Mage, Rogue, RandomPlaystyle,
+                                  RandomPlaystyle, seed=7)
+        frames = [frame for frame, _ in render_frames(SEEDED_REPLAY)]
+
+        self.assertEqual(result, P2_WINS)
+        self.assertIs(a1_game.GAME_WINNER, a1_game.P2)
+        self.assertEqual(frames[-1], turns * FRAMES_PER_MOVE)
+
+    def test_moves_replay(self):
+        """
+        Test to make sure a replay of moves makes those moves, and stops
+        when they run out.
+        """
+        replay = {'p1': 'r', 'p1_name': 'A', 'p2': 'm', 'p2_name': 'B',
+                  'moves': 'SAS'}
+        for _ in render_frames(replay):
+            pass
+
+        self.assertEqual(a1_game.P1.get_sp(), 80)
+        self.assertEqual(a1_game.P1.get_hp(), 90)
+        self.assertEqual(a1_game.P2.get_sp(), 95)
+        self.assertEqual(a1_game.P2.get_hp(), 76)
+
+    def test_repeated_frames_are_skipped(self):
+        """
+        Test to make sure no two frames in a row have the same pixels.
+        """
+        last_pixels = None
+        for _, surface in render_frames(SEEDED_REPLAY):
+            pixels = pygame.image.tobytes(surface, 'RGB')
+            self.assertNotEqual(pixels, last_pixels)
+            last_pixels = pixels
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,185 @@
+"""
+A fixed-rate scheduler for the main loop of the UI of A1.
+
+Every task runs on its own fixed timestep, so how often the sprites animate,
+how often the AI takes a turn and how fast input is handled no longer depend
+on one another. A task that falls behind (because the loop was blocked, for
+example) runs at most MAX_CATCH_UP times to catch up, then skips the rest of
+the runs it missed rather than running in a burst.
+
+A task with an interval of 0 runs on every call to run_pending(), as fast as
+the loop goes, which is how the UI's turbo mode plays AI turns. A task can be
+given a condition, such as an AI player being the one to move: while it is
+false the task is not due, so the loop does not spin on a task with nothing
+to do.
+
+A LatencyRecorder collects how long the loop takes to act on input.
+"""
+import math
+import time
+from typing import Callable, List, Optional
+
+MAX_CATCH_UP = 3
+
+
+class Task:
+    """
+    A callback that runs every interval seconds, while its condition holds.
+
+    interval - The number of seconds between two runs of the callback.
+    when - The condition, checked before every run, or None to always run.
+    due - The clock time at which the callback should next run.
+    runs - The number of times the callback has run.
+    """
+    interval: float
+    due: float
+    runs: int
+
+    def __init__(self, interval: float, callback: Callable[[], None],
+                 due: float,
+                 when: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Initialize a Task that runs callback every interval seconds, first
+        at clock time due, while when() is true (if when is given).
+        """
+        if interval < 0:
+            raise ValueError("interval must not be negative")
+        self.interval = interval
+        self.callback = callback
+        self.due = due
+        self.when = when
+        self.runs = 0
+
+    def is_ready(self) -> bool:
+        """
+        Return whether this Task's condition holds.
+        """
+        return self.when is None or self.when()
+
+    def run_pending(self, now: float) -> int:
+        """
+        Run the callback for every run that is due at clock time now, up to
+        MAX_CATCH_UP, and return how many runs there were.
+
+        While the condition does not hold, the runs that are due are
+        skipped (keeping the phase), rather than run in a burst later.
+        """
+        if self.due > now:
+            return 0
+        if not self.is_ready():
+            if self.interval:
+                self.due += ((now - self.due) // self.interval + 1) * \
+                    self.interval
+            return 0
+        if self.interval == 0:
+            self.callback()
+            self.runs += 1
+            return 1
+
+        ran = 0
+        while self.due <= now and ran < MAX_CATCH_UP:
+            self.callback()
+            self.due += self.interval
+            ran += 1
+        if self.due <= now:
+            # Too far behind: drop the missed runs but keep the phase.
+            missed = (now - self.due) // self.interval + 1
+            self.due += missed * self.interval
+        self.runs += ran
+        return ran
+
+
+class Scheduler:
+    """
+    A set of Tasks, run against one clock.
+
+    tasks - The tasks, in the order they run in when due at the same time.
+    """
+    tasks: List[Task]
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) \
+            -> None:
+        """
+        Initialize a Scheduler with no tasks that reads the time, in
+        seconds, from clock.
+        """
+        self.clock = clock
+        self.tasks = []
+
+    def every(self, interval: float, callback: Callable[[], None],
+              delay: Optional[float] = None,
+              when: Optional[Callable[[], bool]] = None) -> Task:
+        """
+        Schedule callback to run every interval seconds, first after delay
+        seconds (interval seconds by default), while when() is true (if
+        when is given), and return its Task.
+        """
+        if delay is None:
+            delay = interval
+        task = Task(interval, callback, self.clock() + delay, when)
+        self.tasks.append(task)
+        return task
+
+    def run_pending(self) -> int:
+        """
+        Run every task that is due, and return how many runs there were.
+        """
+        now = self.clock()
+        return sum(task.run_pending(now) for task in self.tasks)
+
+    def time_until_next(self) -> float:
+        """
+        Return how many seconds there are until the next task whose
+        condition holds is due, or 0 if one is already due (or there is no
+        such task).
+        """
+        ready = [task for task in self.tasks if task.is_ready()]
+        if not ready:
+            return 0.0
+        now = self.clock()
+        return max(0.0, min(task.due - now for task in ready))
+
+
+class LatencyRecorder:
+    """
+    A record of how long something took, over and over, e.g. from a key
+    press to the move it makes.
+
+    samples - Every latency recorded, in seconds, in the order recorded.
+    """
+    samples: List[float]
+
+    def __init__(self) -> None:
+        """
+        Initialize a LatencyRecorder with no samples.
+        """
+        self.samples = []
+
+    def record(self, seconds: float) -> None:
+        """
+        Record one latency of seconds seconds.
+        """
+        self.samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Return the smallest latency that at least fraction of the samples
+        are within, or None if there are no samples.
+        """
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+    def __str__(self) -> str:
+        """
+        Return the number of samples and their median, p95, p99 and largest
+        latencies in milliseconds.
+        """
+        if not self.samples:
+            return "no samples"
+        return "{} samples: p50 {:.3f} ms / p95 {:.3f} ms / p99 {:.3f} " \
+            "ms / max {:.3f} ms".format(
+                len(self.samples), self.percentile(0.5) * 1e3,
+                self.percentile(0.95) * 1e3, self.percentile(0.99) * 1e3,
+                max(self.samples) * 1e3)
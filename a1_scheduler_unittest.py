@@ -0,0 +1,147 @@
+"""
+Unittests for the Scheduler of A1.
+"""
+import unittest
+
+from a1_scheduler import LatencyRecorder, MAX_CATCH_UP, Scheduler
+
+
+class SchedulerUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a Scheduler on a clock that only moves when told to.
+        """
+        self.now = 0.0
+        self.scheduler = Scheduler(lambda: self.now)
+        self.calls = []
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp.
+        """
+        del self.now
+        del self.scheduler
+        del self.calls
+
+    def test_fixed_rate(self):
+        """
+        Test to make sure tasks run at their own rates, regardless of how
+        often run_pending is called.
+        """
+        self.scheduler.every(0.1, lambda: self.calls.append('frame'))
+        self.scheduler.every(0.25, lambda: self.calls.append('ai'))
+        for _ in range(100):
+            self.now += 0.01
+            self.scheduler.run_pending()
+
+        self.assertEqual(self.calls.count('frame'), 10)
+        self.assertEqual(self.calls.count('ai'), 4)
+
+    def test_time_until_next(self):
+        """
+        Test to make sure time_until_next gives the wait until the earliest
+        task is due.
+        """
+        self.scheduler.every(0.1, lambda: None)
+        self.scheduler.every(1.0, lambda: None, delay=0.05)
+        self.assertAlmostEqual(self.scheduler.time_until_next(), 0.05)
+        self.now = 0.07
+        self.scheduler.run_pending()
+        self.assertAlmostEqual(self.scheduler.time_until_next(), 0.03)
+        self.now = 5
+        self.assertEqual(self.scheduler.time_until_next(), 0)
+
+    def test_catch_up_is_bounded(self):
+        """
+        Test to make sure a task that falls far behind runs at most
+        MAX_CATCH_UP times, then keeps its phase.
+        """
+        task = self.scheduler.every(0.125,
+                                    lambda: self.calls.append('frame'))
+        self.now = 10.0625
+        self.assertEqual(self.scheduler.run_pending(), MAX_CATCH_UP)
+        self.assertEqual(task.due, 10.125)
+        self.now = 10.125
+        self.assertEqual(self.scheduler.run_pending(), 1)
+
+    def test_turbo(self):
+        """
+        Test to make sure a task with an interval of 0 runs on every call
+        to run_pending, and never makes the loop wait.
+        """
+        task = self.scheduler.every(0, lambda: self.calls.append('ai'))
+        self.scheduler.every(0.1, lambda: self.calls.append('frame'))
+        for _ in range(50):
+            self.assertEqual(self.scheduler.time_until_next(), 0)
+            self.scheduler.run_pending()
+
+        self.assertEqual(task.runs, 50)
+        self.assertNotIn('frame', self.calls)
+
+    def test_turbo_waits_for_delay_and_condition(self):
+        """
+        Test to make sure a task with an interval of 0 does not run before
+        its delay, nor while its condition is false, and only makes the
+        loop wait for other tasks then.
+        """
+        ready = [True]
+        task = self.scheduler.every(0, lambda: self.calls.append('ai'),
+                                    delay=0.05, when=lambda: ready[0])
+        self.scheduler.every(0.1, lambda: self.calls.append('frame'))
+        self.assertAlmostEqual(self.scheduler.time_until_next(), 0.05)
+        self.assertEqual(self.scheduler.run_pending(), 0)
+
+        self.now = 0.05
+        self.assertEqual(self.scheduler.time_until_next(), 0)
+        self.assertEqual(self.scheduler.run_pending(), 1)
+        ready[0] = False
+        self.assertAlmostEqual(self.scheduler.time_until_next(), 0.05)
+        self.assertEqual(self.scheduler.run_pending(), 0)
+        self.now = 0.1
+        self.scheduler.run_pending()
+        self.assertEqual(self.calls, ['ai', 'frame'])
+        self.assertEqual(task.runs, 1)
+
+    def test_skipped_while_condition_is_false(self):
+        """
+        Test to make sure a task whose condition is false skips its runs,
+        rather than running them in a burst once it holds again.
+        """
+        ready = [False]
+        task = self.scheduler.every(0.125, lambda: self.calls.append('ai'),
+                                    when=lambda: ready[0])
+        self.now = 1.0625
+        self.assertEqual(self.scheduler.run_pending(), 0)
+        self.assertEqual(task.due, 1.125)
+        ready[0] = True
+        self.now = 1.125
+        self.assertEqual(self.scheduler.run_pending(), 1)
+
+    def test_negative_interval(self):
+        """
+        Test to make sure a negative interval is rejected.
+        """
+        with self.assertRaises(ValueError):
+            self.scheduler.every(-1, lambda: None)
+
+
+class LatencyRecorderUnitTests(unittest.TestCase):
+    def test_percentiles(self):
+        """
+        Test to make sure percentiles come from the recorded samples.
+        """
+        latency = LatencyRecorder()
+        self.assertIsNone(latency.percentile(0.5))
+        self.assertEqual(str(latency), "no samples")
+        for ms in range(100, 0, -1):
+            latency.record(ms / 1000)
+
+        self.assertEqual(latency.percentile(0.5), 0.05)
+        self.assertEqual(latency.percentile(0.95), 0.095)
+        self.assertEqual(latency.percentile(1), 0.1)
+        self.assertEqual(latency.percentile(0), 0.001)
+        self.assertTrue(str(latency).startswith("100 samples: p50 50.000 ms"))
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,328 @@
+"""
+An exhaustive solver for battles, and the on-disk table of its results.
+
+A battle between two character classes has few enough states (see a1_state)
+to be solved completely. solve() finds every state reachable from the start
+of a battle, with either character moving first, then works back from the
+ends of the battle (retrograde analysis): states are valued in order of the
+SP left in them, least first, and every move costs SP, so the states a move
+leads to have always been valued already.
+
+A state's value is from character 0's point of view, with both characters
+playing perfectly: WIN_VALUE minus the number of turns left for a win, the
+negative of that for a loss, and 0 for any other end. So perfect play wins
+as soon as it can, and loses as late as it can.
+
+write_table() stores the value and best move of every state in which a move
+is to be made in an open-addressing hash table (with linear probing) in a
+binary file, which SolvedTable memory-maps: a lookup reads a slot or two of
+the file, and nothing is loaded up front. The file holds, little-endian,
+
+    header: MAGIC, the number of slots and of entries (uint64 each) and a
+            digest of the matchup's CharacterStats (16 bytes)
+    slots:  the state (uint64, 0 in an empty slot), its value (int16), the
+            best move (uint8) and a pad byte
+
+For example:
+
+    python -m a1_solver --p1 m --p2 r
+
+writes the table of a Mage against a Rogue to solved/.
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from a1_characters import ACTION_KEYS
+from a1_state import (FIELD_MASK, LOSS, ONGOING, QUEUE_SHIFT, SP0_SHIFT,
+                      SP1_SHIFT, WIN, Matchup)
+
+# For the annotations of lookup_many, which imports numpy when it is called.
+if TYPE_CHECKING:
+    import numpy as np
+
+# Next to this file, rather than in whatever directory the game is run from.
+SOLVED_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'solved')
+MAGIC = b'A1SOLVE1'
+HEADER = struct.Struct('<8sQQ16s')
+SLOT = struct.Struct('<QhBx')
+# The most a table is filled before it is made bigger.
+MAX_LOAD = 0.5
+
+WIN_VALUE = 1000
+
+# The most bits a state can take to be stored in a slot: a queue of up to
+# 31 characters.
+STATE_BITS = 64
+
+_FIBONACCI = 0x9E3779B97F4A7C15
+_UINT64 = (1 << 64) - 1
+
+# The fields of SLOT, as a numpy dtype for SolvedTable.lookup_many.
+_SLOT_DTYPE = [('state', '<u8'), ('value', '<i2'), ('action', 'u1'),
+               ('pad', 'u1')]
+
+
+def matchup_digest(matchup: Matchup) -> bytes:
+    """
+    Return the digest that identifies the CharacterStats of matchup.
+    """
+    return hashlib.blake2b(repr((matchup.stats, matchup.enemy_stats))
+                           .encode(), digest_size=16).digest()
+
+
+def table_path(matchup: Matchup,
+               directory: str = SOLVED_DIRECTORY) -> str:
+    """
+    Return the path of the table of matchup in directory.
+    """
+    return os.path.join(directory,
+                        matchup_digest(matchup).hex() + '.solved')
+
+
+def _slot_of(state: int, bits: int) -> int:
+    """
+    Return the first slot to probe for state in a table of 2 ** bits slots.
+    """
+    return (state * _FIBONACCI & _UINT64) >> (64 - bits)
+
+
+def reachable_states(matchup: Matchup) -> List[int]:
+    """
+    Return every state of matchup in which a move is to be made that can
+    be reached from the start of a battle, with either character moving
+    first.
+
+    Raise ValueError as soon as one is found that does not fit in
+    STATE_BITS bits (i.e. special attacks can fill the queue so fast that
+    the matchup cannot be tabled).
+    """
+    first = matchup.start()
+    # The same start with the queue the other way round.
+    second = first ^ 0b011 << QUEUE_SHIFT
+    seen = {first, second}
+    frontier = [first, second]
+    while frontier:
+        state = frontier.pop()
+        for _, after in matchup.moves(state):
+            if after not in seen and matchup.result(after) is ONGOING:
+                if after >> STATE_BITS:
+                    raise ValueError(
+                        "the queue of this matchup can grow too long for " +
+                        "its states to fit in {} bits".format(STATE_BITS))
+                seen.add(after)
+                frontier.append(after)
+    return list(seen)
+
+
+def solve(matchup: Matchup) -> Dict[int, Tuple[int, int]]:
+    """
+    Return the value and the best move of every reachable state of matchup
+    in which a move is to be made, keyed by state.
+
+    Of moves that are worth the same, the first in ACTIONS is the best.
+    Raise ValueError if the states of matchup do not fit in a table (see
+    reachable_states).
+    """
+    states = reachable_states(matchup)
+    states.sort(key=lambda state: (state >> SP0_SHIFT & FIELD_MASK) +
+                (state >> SP1_SHIFT & FIELD_MASK))
+    end_values = {WIN: WIN_VALUE, LOSS: -WIN_VALUE}
+    solved = {}
+    for state in states:
+        maximize = matchup.mover(state) == 0
+        best_value = best_action = None
+        for action, after in matchup.moves(state):
+            if after in solved:
+                value = solved[after][0]
+            else:
+                value = end_values.get(matchup.result(after), 0)
+            # One turn further from the end than the state after.
+            value -= (value > 0) - (value < 0)
+            if best_value is None or \
+                    (value > best_value if maximize else value < best_value):
+                best_value, best_action = value, action
+        solved[state] = (best_value, best_action)
+    return solved
+
+
+def write_table(matchup: Matchup, solved: Dict[int, Tuple[int, int]],
+                path: str) -> None:
+    """
+    Write the values and moves in solved, for matchup, to the table at
+    path.
+    """
+    bits = 1
+    while len(solved) > MAX_LOAD * (1 << bits):
+        bits += 1
+    slots = 1 << bits
+    data = bytearray(HEADER.size + slots * SLOT.size)
+    HEADER.pack_into(data, 0, MAGIC, slots, len(solved),
+                     matchup_digest(matchup))
+    for state, (value, action) in solved.items():
+        slot = _slot_of(state, bits)
+        while SLOT.unpack_from(data, HEADER.size + slot * SLOT.size)[0]:
+            slot = (slot + 1) & (slots - 1)
+        SLOT.pack_into(data, HEADER.size + slot * SLOT.size, state, value,
+                       action)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Written to the side first, so a table is never seen half written,
+    # even by another process that is writing it too.
+    written = '{}.{}.tmp'.format(path, os.getpid())
+    with open(written, 'wb') as table_file:
+        table_file.write(data)
+    os.replace(written, path)
+
+
+class SolvedTable:
+    """
+    The table of a solved matchup, memory-mapped from its file.
+
+    slots - The number of slots in the table.
+    entries - The number of states in the table.
+    """
+    slots: int
+    entries: int
+
+    def __init__(self, path: str,
+                 matchup: Optional[Matchup] = None) -> None:
+        """
+        Open the table at path, checking that it is a table of matchup if
+        one is given.
+        """
+        with open(path, 'rb') as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        magic, self.slots, self.entries, digest = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or \
+                len(self._map) != HEADER.size + self.slots * SLOT.size:
+            self.close()
+            raise ValueError("{} is not a solved table".format(path))
+        if matchup is not None and digest != matchup_digest(matchup):
+            self.close()
+            raise ValueError("{} is the table of another matchup".format(
+                path))
+        self._bits = self.slots.bit_length() - 1
+
+    def lookup(self, state: int) -> Optional[Tuple[int, int]]:
+        """
+        Return the value and best move of state, or None if it is not in
+        this table.
+        """
+        table = self._map
+        unpack_from = SLOT.unpack_from
+        mask = self.slots - 1
+        slot = _slot_of(state, self._bits)
+        while True:
+            key, value, action = unpack_from(table, HEADER.size +
+                                             slot * SLOT.size)
+            if key == state:
+                return value, action
+            if not key:
+                return None
+            slot = (slot + 1) & mask
+
+    def lookup_many(self, states: Sequence[int]) -> Tuple['np.ndarray', ...]:
+        """
+        Return the values (int16) and best moves (uint8) of states, and
+        whether each one was found in this table, as arrays. The value and
+        move of a state that was not found are 0.
+
+        Every state is probed at once with array operations, one round of
+        probes per slot of the longest probe sequence, so a lookup costs
+        well under a microsecond per state for large arrays.
+        """
+        import numpy as np
+        states = np.asarray(states, np.uint64)
+        count = len(states)
+        values = np.zeros(count, np.int16)
+        actions = np.zeros(count, np.uint8)
+        found = np.zeros(count, np.bool_)
+        # A view of the slots in the mapped file, made for this lookup
+        # only: the map cannot be closed while a view of it is held.
+        slots = np.frombuffer(self._map, _SLOT_DTYPE, self.slots,
+                              HEADER.size)
+        mask = np.uint64(self.slots - 1)
+        # Multiplying uint64 arrays wraps, as _slot_of masks to 64 bits.
+        slot = states * np.uint64(_FIBONACCI) >> np.uint64(64 - self._bits)
+        pending = np.arange(count)
+        while pending.size:
+            probed = slots[slot[pending]]
+            hit = probed['state'] == states[pending]
+            hits = pending[hit]
+            values[hits] = probed['value'][hit]
+            actions[hits] = probed['action'][hit]
+            found[hits] = True
+            missing = hit | (probed['state'] == 0)
+            pending = pending[~missing]
+            slot[pending] = (slot[pending] + np.uint64(1)) & mask
+        return values, actions, found
+
+    def close(self) -> None:
+        """
+        Unmap this table.
+        """
+        self._map.close()
+
+    def __len__(self) -> int:
+        """
+        Return the number of states in this table.
+        """
+        return self.entries
+
+
+def load_table(matchup: Matchup,
+               directory: str = SOLVED_DIRECTORY) -> SolvedTable:
+    """
+    Return the table of matchup in directory, solving matchup and writing
+    the table first if there is none.
+
+    Raise ValueError if the states of matchup do not fit in a table.
+    """
+    path = table_path(matchup, directory)
+    if not os.path.exists(path):
+        write_table(matchup, solve(matchup), path)
+    return SolvedTable(path, matchup)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Parse the command line arguments in argv, and solve the matchup they
+    name (both ways round).
+    """
+    from a1_game import CHARACTER_CLASSES
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--p1', choices=sorted(CHARACTER_CLASSES),
+                        default='m', help="class of the first character")
+    parser.add_argument('--p2', choices=sorted(CHARACTER_CLASSES),
+                        default='r', help="class of the second character")
+    parser.add_argument('--directory', default=SOLVED_DIRECTORY,
+                        help="directory to write the tables to")
+    args = parser.parse_args(argv)
+
+    p1_stats = CHARACTER_CLASSES[args.p1].stats
+    p2_stats = CHARACTER_CLASSES[args.p2].stats
+    for stats, enemy_stats in {(p1_stats, p2_stats), (p2_stats, p1_stats)}:
+        matchup = Matchup(stats, enemy_stats)
+        start = time.perf_counter()
+        solved = solve(matchup)
+        path = table_path(matchup, args.directory)
+        write_table(matchup, solved, path)
+        value, action = solved[matchup.start()]
+        print("{} states in {:.2f}s, written to {}".format(
+            len(solved), time.perf_counter() - start, path))
+        print("  moving first: value {}, best move {}".format(
+            value, ACTION_KEYS[action]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""
+Unittests for the exhaustive solver and the SolvedPlaystyle of A1.
+"""
+import functools
+import os
+import tempfile
+import unittest
+
+from a1_battle_sim import P1_WINS, P2_WINS, play_game
+from a1_battle_queue import BattleQueue
+from a1_characters import (ATTACK, MAGE_STATS, ROGUE_STATS, SPECIAL, Mage,
+                           Rogue)
+from a1_playstyle import SolvedPlaystyle
+from a1_solver import (WIN_VALUE, SolvedTable, load_table, solve,
+                       table_path, write_table)
+from a1_state import HP0_SHIFT, HP1_SHIFT, LOSS, ONGOING, WIN, Matchup
+
+MATCHUP = Matchup(MAGE_STATS, ROGUE_STATS)
+
+
+@functools.lru_cache(maxsize=None)
+def minimax(state):
+    """
+    Return 1, 0 or -1 for a win, other end or loss of character 0 in state
+    of MATCHUP, with both characters playing perfectly.
+    """
+    result = MATCHUP.result(state)
+    if result is not ONGOING:
+        return {WIN: 1, LOSS: -1}.get(result, 0)
+    values = [minimax(after) for _, after in MATCHUP.moves(state)]
+    return max(values) if MATCHUP.mover(state) == 0 else min(values)
+
+
+class SolverUnitTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Solves a Mage against a Rogue once for every test.
+        """
+        cls.solved = solve(MATCHUP)
+
+    def setUp(self):
+        """
+        Makes a directory for the tables of a test.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_values_are_perfect_play(self):
+        """
+        Test to make sure every state is won, lost or neither as a plain
+        minimax search finds, and its best move keeps that value.
+        """
+        self.assertIn(MATCHUP.start(), self.solved)
+        for state, (value, action) in self.solved.items():
+            sign = (value > 0) - (value < 0)
+            self.assertEqual(sign, minimax(state))
+            self.assertLess(abs(value), WIN_VALUE)
+            self.assertEqual(minimax(MATCHUP.play(state, action)), sign)
+
+    def test_table_round_trip(self):
+        """
+        Test to make sure a table gives back every entry written to it, and
+        nothing for a state that is not in it.
+        """
+        path = table_path(MATCHUP, self.directory.name)
+        write_table(MATCHUP, self.solved, path)
+        table = SolvedTable(path, MATCHUP)
+        self.addCleanup(table.close)
+
+        self.assertEqual(len(table), len(self.solved))
+        self.assertGreaterEqual(table.slots, 2 * len(self.solved))
+        for state, entry in self.solved.items():
+            self.assertEqual(table.lookup(state), entry)
+        self.assertIsNone(table.lookup(MATCHUP.start() + 1))
+
+    def test_lookup_many(self):
+        """
+        Test to make sure looking up many states at once gives what looking
+        them up one at a time gives, and nothing for states not in the
+        table.
+        """
+        path = table_path(MATCHUP, self.directory.name)
+        write_table(MATCHUP, self.solved, path)
+        table = SolvedTable(path, MATCHUP)
+        self.addCleanup(table.close)
+
+        states = list(self.solved) + [MATCHUP.start() + 1]
+        values, actions, found = table.lookup_many(states)
+        self.assertEqual(found.tolist(), [True] * len(self.solved) + [False])
+        self.assertEqual(list(zip(values.tolist(), actions.tolist()))[:-1],
+                         [self.solved[state] for state in self.solved])
+        self.assertEqual((values[-1], actions[-1]), (0, 0))
+        self.assertEqual(len(table.lookup_many([])[2]), 0)
+
+    def test_wrong_table(self):
+        """
+        Test to make sure a table is not opened for another matchup, and a
+        file that is not a table is not opened at all.
+        """
+        path = table_path(MATCHUP, self.directory.name)
+        write_table(MATCHUP, self.solved, path)
+        with self.assertRaises(ValueError):
+            SolvedTable(path, Matchup(ROGUE_STATS, MAGE_STATS))
+
+        other = os.path.join(self.directory.name, 'other.solved')
+        with open(other, 'wb') as other_file:
+            other_file.write(b'not a table' * 10)
+        with self.assertRaises(ValueError):
+            SolvedTable(other)
+
+    def test_matchup_too_wide(self):
+        """
+        Test to make sure a matchup whose queue can grow past what a state
+        in a table holds is rejected before it is solved.
+        """
+        cheap = ROGUE_STATS._replace(special_cost=4, special_damage=12)
+        with self.assertRaises(ValueError):
+            load_table(Matchup(cheap, cheap), self.directory.name)
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_load_table_solves_once(self):
+        """
+        Test to make sure load_table writes a missing table, and opens the
+        one written after that.
+        """
+        path = table_path(MATCHUP, self.directory.name)
+        table = load_table(MATCHUP, self.directory.name)
+        table.close()
+        written = os.path.getmtime(path)
+        table = load_table(MATCHUP, self.directory.name)
+        self.addCleanup(table.close)
+        self.assertEqual(os.path.getmtime(path), written)
+        self.assertEqual(table.lookup(MATCHUP.start()),
+                         self.solved[MATCHUP.start()])
+
+
+class SolvedPlaystyleUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Makes a directory for the tables of a test.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.playstyle_class = functools.partial(
+            SolvedPlaystyle, directory=self.directory.name)
+
+    def test_perfect_play(self):
+        """
+        Test to make sure two SolvedPlaystyles always end a battle the way
+        the solver says it ends.
+        """
+        value = solve(MATCHUP)[MATCHUP.start()][0]
+        expected = P1_WINS if value > 0 else P2_WINS
+        for seed in range(5):
+            result, _ = play_game(Mage, Rogue, self.playstyle_class,
+                                  self.playstyle_class, seed=seed)
+            self.assertEqual(result, expected)
+
+    def test_state_not_in_table(self):
+        """
+        Test to make sure a state that cannot be reached from the start of
+        a battle is searched instead.
+        """
+        battle_queue = BattleQueue()
+        playstyle = self.playstyle_class(battle_queue)
+        p1 = Mage("P1", battle_queue, playstyle)
+        p2 = Rogue("P2", battle_queue, playstyle)
+        p1.enemy = p2
+        p2.enemy = p1
+        battle_queue.add(p1)
+        battle_queue.add(p2)
+        p1.hp = 7
+        p2.hp = 29
+        self.assertEqual(playstyle.select_action(), SPECIAL)
+        p2.hp = 9
+        self.assertEqual(playstyle.select_action(), ATTACK)
+
+    def test_batch_of_battles(self):
+        """
+        Test to make sure select_actions makes the best move in every
+        battle, whether its state is in the table or not.
+        """
+        solved = solve(MATCHUP)
+        states = [state for state in solved if MATCHUP.mover(state) == 0]
+        # Neither of these can be reached from the start of a battle, with
+        # no SP spent but HP lost.
+        start = MATCHUP.start()
+        unreachable = [start - (93 << HP0_SHIFT) - (71 << HP1_SHIFT),
+                       start - (93 << HP0_SHIFT) - (91 << HP1_SHIFT)]
+        playstyle = self.playstyle_class(BattleQueue())
+        actions = playstyle.select_actions(MATCHUP, states + unreachable)
+        self.assertEqual(actions.tolist(),
+                         [solved[state][1] for state in states] +
+                         [SPECIAL, ATTACK])
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
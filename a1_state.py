@@ -0,0 +1,334 @@
+"""
+Battle states packed into one int, for the playstyles that look ahead.
+
+A state holds everything that decides how a battle can go on: the HP and SP
+of both characters and the order of the battle queue. The characters are
+numbered from the point of view of whoever looks ahead: 0 is that character
+and 1 is its enemy. The fields are packed as
+
+    queue << 32 | hp0 << 24 | sp0 << 16 | hp1 << 8 | sp1
+
+where bit i of queue holds the number of the i-th character in the battle
+queue, and the bit above the last one is set (so the length of the queue is
+queue.bit_length() - 1). Playing a move returns a new int rather than
+changing anything, so looking ahead needs no copies of the characters or
+the BattleQueue, and a state can be used as a dict key as it is.
+
+The rules are the same as in Characters.attack, Characters.special_attack,
+BattleQueue.update_status and a1_game.GameSession.perform_attack, read from
+the characters' CharacterStats.
+"""
+import random
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from a1_characters import (ACTIONS, ATTACK, ENEMY, NO_ACTION, SELF,
+                           SPECIAL, CharacterStats)
+
+HP0_SHIFT = 24
+SP0_SHIFT = 16
+HP1_SHIFT = 8
+SP1_SHIFT = 0
+QUEUE_SHIFT = 32
+FIELD_MASK = 0xff
+
+# How a state's battle ended, if it has.
+ONGOING = None
+WIN = 0
+LOSS = 1
+TIE = 2
+# The character at the front of the queue has no actions left but its enemy
+# does, so no more moves can be made (a1_battle_sim counts it as stalled).
+STALLED = 3
+
+# The default number of entries a TranspositionTable holds.
+TABLE_SIZE = 1 << 18
+
+
+class Matchup:
+    """
+    The rules of a battle between a character with stats (character 0) and
+    one with enemy_stats (character 1), for playing moves on states.
+
+    Every move costs SP and no attack heals (which is checked), so every
+    move leads to a state that was never seen before it: the states of a
+    battle form a DAG, and a battle lasts at most 200 turns.
+    """
+    stats: CharacterStats
+    enemy_stats: CharacterStats
+
+    def __init__(self, stats: CharacterStats,
+                 enemy_stats: CharacterStats) -> None:
+        """
+        Initialize the Matchup of a character with stats against one with
+        enemy_stats.
+        """
+        self.stats = stats
+        self.enemy_stats = enemy_stats
+        both = (stats, enemy_stats)
+        for who in (0, 1):
+            mine, theirs = both[who], both[1 - who]
+            if min(mine.attack_cost, mine.special_cost) < 1 or \
+                    min(mine.attack_damage, mine.special_damage) < \
+                    theirs.defense:
+                raise ValueError("every attack must cost SP and none may " +
+                                 "heal")
+
+        # The changes made by each move of each character: (its SP shift,
+        # cost, the enemy's HP shift, damage, the characters added to the
+        # queue as bits, and how many were added).
+        self._moves: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        for who, (sp_shift, hp_shift) in enumerate(
+                [(SP0_SHIFT, HP1_SHIFT), (SP1_SHIFT, HP0_SHIFT)]):
+            mine, theirs = both[who], both[1 - who]
+            for action, cost, damage, queued in [
+                    (ATTACK, mine.attack_cost, mine.attack_damage, (SELF,)),
+                    (SPECIAL, mine.special_cost, mine.special_damage,
+                     mine.special_queue)]:
+                bits = 0
+                for i, relative in enumerate(queued):
+                    bits |= (who ^ (relative == ENEMY)) << i
+                self._moves[who, action] = (
+                    sp_shift, cost, hp_shift, damage - theirs.defense,
+                    bits, len(queued))
+
+    def start(self, starting_hp: int = 100, starting_sp: int = 100) -> int:
+        """
+        Return the state at the start of a battle in which character 0
+        moves first.
+        """
+        return (0b110 << QUEUE_SHIFT | starting_hp << HP0_SHIFT |
+                starting_sp << SP0_SHIFT | starting_hp << HP1_SHIFT |
+                starting_sp << SP1_SHIFT)
+
+    def encode(self, character: 'Characters',
+               battle_queue: 'BattleQueue') -> int:
+        """
+        Return the state of the battle in battle_queue, with character as
+        character 0.
+        """
+        enemy = character.enemy
+        queue = 0
+        length = 0
+        for queued in battle_queue:
+            queue |= (queued is not character) << length
+            length += 1
+        for value in (character.hp, character.sp, enemy.hp, enemy.sp):
+            if not 0 <= value <= FIELD_MASK:
+                raise ValueError("HP and SP must be in 0..255")
+        return ((queue | 1 << length) << QUEUE_SHIFT |
+                character.hp << HP0_SHIFT | character.sp << SP0_SHIFT |
+                enemy.hp << HP1_SHIFT | enemy.sp << SP1_SHIFT)
+
+    def mover(self, state: int) -> int:
+        """
+        Return the character at the front of the queue in state.
+        """
+        return state >> QUEUE_SHIFT & 1
+
+    def actions(self, state: int, who: int) -> int:
+        """
+        Return the mask of the actions character who has enough SP for in
+        state.
+        """
+        stats = self.enemy_stats if who else self.stats
+        sp = state >> (SP1_SHIFT if who else SP0_SHIFT) & FIELD_MASK
+        return (ATTACK if sp >= stats.attack_cost else NO_ACTION) | \
+            (SPECIAL if sp >= stats.special_cost else NO_ACTION)
+
+    def result(self, state: int) -> Optional[int]:
+        """
+        Return how the battle in state ended, from character 0's point of
+        view, or ONGOING if it has not.
+        """
+        if not state >> HP1_SHIFT & FIELD_MASK:
+            return WIN
+        if not state >> HP0_SHIFT & FIELD_MASK:
+            return LOSS
+        if not self.actions(state, self.mover(state)):
+            return STALLED if self.actions(state, 1 - self.mover(state)) \
+                else TIE
+        return ONGOING
+
+    def play(self, state: int, action: int) -> int:
+        """
+        Return the state after the character at the front of the queue in
+        state makes action, which must be one it has enough SP for.
+        """
+        queue = state >> QUEUE_SHIFT
+        who = queue & 1
+        sp_shift, cost, hp_shift, damage, bits, added = \
+            self._moves[who, action]
+        sp = (state >> sp_shift & FIELD_MASK) - cost
+        hp = (state >> hp_shift & FIELD_MASK) - damage
+        if hp < 0:
+            hp = 0
+        state ^= ((state >> sp_shift & FIELD_MASK) ^ sp) << sp_shift
+        state ^= ((state >> hp_shift & FIELD_MASK) ^ hp) << hp_shift
+
+        # Add to the back of the queue, then take the mover off the front
+        # unless it has no actions left (as in perform_attack).
+        length = queue.bit_length() - 1
+        queue = (queue ^ 1 << length | bits << length) | \
+            1 << (length + added)
+        if self.actions(state, who):
+            queue >>= 1
+        return state & 0xffffffff | queue << QUEUE_SHIFT
+
+    def moves(self, state: int) -> Tuple[Tuple[int, int], ...]:
+        """
+        Return (action, next state) for every action the character at the
+        front of the queue in state can make, in the order of ACTIONS.
+        """
+        mask = self.actions(state, self.mover(state))
+        return tuple((action, self.play(state, action))
+                     for action in ACTIONS if action & mask)
+
+    def rollout(self, state: int, rng: random.Random) -> int:
+        """
+        Play state out to the end with both characters moving as a
+        RandomPlaystyle does, drawing from rng, and return how it ended.
+
+        Only ints are made along the way, so a rollout is cheap enough to
+        play thousands of per move.
+        """
+        getrandbits = rng.getrandbits
+        moves = self._moves
+        while True:
+            queue = state >> QUEUE_SHIFT
+            who = queue & 1
+            mask = self.actions(state, who)
+            if not state >> HP1_SHIFT & FIELD_MASK:
+                return WIN
+            if not state >> HP0_SHIFT & FIELD_MASK:
+                return LOSS
+            if not mask:
+                return STALLED if self.actions(state, 1 - who) else TIE
+
+            if mask == ATTACK | SPECIAL and getrandbits(1):
+                mask = SPECIAL
+            sp_shift, cost, hp_shift, damage, bits, added = \
+                moves[who, ATTACK if mask & ATTACK else SPECIAL]
+            hp = (state >> hp_shift & FIELD_MASK) - damage
+            state = state - (cost << sp_shift) - \
+                ((damage if hp > 0 else hp + damage) << hp_shift)
+            length = queue.bit_length() - 1
+            queue = (queue ^ 1 << length | bits << length) | \
+                1 << (length + added)
+            if self.actions(state, who):
+                queue >>= 1
+            state = state & 0xffffffff | queue << QUEUE_SHIFT
+
+    def describe(self, state: int) -> str:
+        """
+        Return state in a human readable form.
+
+        >>> from a1_characters import MAGE_STATS, ROGUE_STATS
+        >>> matchup = Matchup(ROGUE_STATS, MAGE_STATS)
+        >>> matchup.describe(matchup.play(matchup.start(), SPECIAL))
+        '0: 100/90  1: 88/100  queue: 1 0 0'
+        """
+        queue = state >> QUEUE_SHIFT
+        return "0: {}/{}  1: {}/{}  queue: {}".format(
+            state >> HP0_SHIFT & FIELD_MASK, state >> SP0_SHIFT & FIELD_MASK,
+            state >> HP1_SHIFT & FIELD_MASK, state >> SP1_SHIFT & FIELD_MASK,
+            " ".join(str(queue >> i & 1)
+                     for i in range(queue.bit_length() - 1)))
+
+
+_MATCHUPS: Dict[Tuple[CharacterStats, CharacterStats], Matchup] = {}
+
+
+def matchup_of(character: 'Characters') -> Matchup:
+    """
+    Return the Matchup of character (as character 0) against its enemy,
+    made once per pair of CharacterStats.
+    """
+    key = (character.stats, character.enemy.stats)
+    matchup = _MATCHUPS.get(key)
+    if matchup is None:
+        matchup = _MATCHUPS[key] = Matchup(*key)
+    return matchup
+
+
+class TranspositionTable:
+    """
+    Values found for states by a search, of which only the capacity most
+    recently used are kept.
+
+    hits - The number of get() calls that found their key.
+    misses - The number of get() calls that did not.
+    evictions - The number of entries dropped to make room for new ones.
+    """
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, capacity: int = TABLE_SIZE) -> None:
+        """
+        Initialize an empty TranspositionTable that holds at most capacity
+        entries.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """
+        Return the entry for key, or None if there is none.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: object) -> None:
+        """
+        Store entry for key, dropping the least recently used entry if this
+        TranspositionTable is full.
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove every entry from this TranspositionTable.
+        """
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of get() calls that found their key.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of entries in this TranspositionTable.
+        """
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        """
+        Return the size and hit rate of this TranspositionTable.
+        """
+        return ("{}/{} entries, {} hits, {} misses ({:.1%} hit rate), " +
+                "{} evicted").format(len(self), self.capacity, self.hits,
+                                     self.misses, self.hit_rate,
+                                     self.evictions)
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config='a1_pyta.txt')
@@ -0,0 +1,102 @@
+"""
+Unittests for the packed battle states of A1.
+"""
+import random
+import unittest
+
+from a1_battle_queue import CompactBattleQueue
+from a1_characters import ATTACK, MAGE_STATS, ROGUE_STATS, SPECIAL
+from a1_game import GameSession
+from a1_state import (LOSS, ONGOING, TIE, WIN, Matchup, TranspositionTable,
+                      matchup_of)
+
+
+class MatchupUnitTests(unittest.TestCase):
+    def test_start(self):
+        """
+        Test to make sure the start of a battle is the state of a new game.
+        """
+        session = GameSession('m', 'A', 'm', 'r', 'B', 'm')
+        matchup = matchup_of(session.p1)
+        self.assertEqual(matchup.encode(session.p1, session.battle_queue),
+                         matchup.start())
+        self.assertEqual(matchup.describe(matchup.start()),
+                         "0: 100/100  1: 100/100  queue: 0 1")
+
+    def test_moves_follow_the_game(self):
+        """
+        Test to make sure playing the moves of random games on states gives
+        the states of those games, and the same results.
+        """
+        for seed in range(200):
+            p1, p2 = ['mr', 'rm', 'rr', 'mm'][seed % 4]
+            session = GameSession(p1, 'A', 'r', p2, 'B', 'b',
+                                  random.Random(seed))
+            me = session.p1
+            matchup = matchup_of(me)
+            state = matchup.start()
+            while not session.is_over:
+                mover = session.battle_queue.peek()
+                sp = mover.get_sp()
+                session.perform_attack()
+                action = ATTACK if sp - mover.get_sp() == \
+                    mover.stats.attack_cost else SPECIAL
+                state = matchup.play(state, action)
+                self.assertEqual(state,
+                                 matchup.encode(me, session.battle_queue))
+            winner = session.winner
+            self.assertEqual(matchup.result(state),
+                             TIE if winner is None else
+                             WIN if winner is me else LOSS)
+
+    def test_compact_queue(self):
+        """
+        Test to make sure a CompactBattleQueue is read a turn at a time.
+        """
+        session = GameSession('r', 'A', 'm', 'm', 'B', 'm')
+        session.last_key_pressed = 'S'
+        session.perform_attack()
+        compact = CompactBattleQueue()
+        for character in session.battle_queue:
+            compact.add(character)
+        matchup = matchup_of(session.p1)
+        self.assertEqual(matchup.encode(session.p1, compact),
+                         matchup.encode(session.p1, session.battle_queue))
+        self.assertEqual(matchup.result(matchup.encode(session.p1, compact)),
+                         ONGOING)
+
+    def test_attacks_must_cost_and_hurt(self):
+        """
+        Test to make sure stats that could make a battle go on forever are
+        rejected.
+        """
+        with self.assertRaises(ValueError):
+            Matchup(ROGUE_STATS._replace(attack_cost=0), MAGE_STATS)
+        with self.assertRaises(ValueError):
+            Matchup(ROGUE_STATS, MAGE_STATS._replace(attack_damage=9))
+
+
+class TranspositionTableUnitTests(unittest.TestCase):
+    def test_least_recently_used_is_evicted(self):
+        """
+        Test to make sure a full table drops the entry used longest ago,
+        and counts its hits, misses and evictions.
+        """
+        table = TranspositionTable(2)
+        table.put(1, 'one')
+        table.put(2, 'two')
+        self.assertEqual(table.get(1), 'one')
+        table.put(3, 'three')
+
+        self.assertIsNone(table.get(2))
+        self.assertEqual(table.get(3), 'three')
+        self.assertEqual(len(table), 2)
+        self.assertEqual((table.hits, table.misses, table.evictions),
+                         (2, 1, 1))
+        self.assertAlmostEqual(table.hit_rate, 2 / 3)
+        self.assertEqual(str(table), "2/2 entries, 2 hits, 1 misses " +
+                         "(66.7% hit rate), 1 evicted")
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,149 @@
+"""
+A tournament runner that plays every pairing of CHARACTER_CLASSES and AI
+PLAYSTYLE_CLASSES across all cores. The playstyles that search ahead take
+milliseconds a move, so they only play when named with --playstyles.
+
+The game budget of every pairing is split into chunks that are played by a
+concurrent.futures.ProcessPoolExecutor. Every game is seeded from the master
+seed, the pairing and the game number alone (see derive_seed), so a
+tournament gives the same results no matter how many workers play it, how
+it is chunked or in which order the chunks finish. The exception is
+--vectorized: the NumPy engine draws every game of a chunk from one stream,
+so its pairings are seeded per chunk, and give the same results for the
+same --chunk-size only. Workers send back only a MatchStats of aggregated
+counters.
+For example:
+
+    python -m a1_tournament --games 1000000 --workers 32 --seed 1
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from a1_battle_queue import BattleQueue
+from a1_battle_sim import MatchStats, run_batch
+from a1_game import CHARACTER_CLASSES, PLAYSTYLE_CLASSES
+from a1_playstyle import derive_seed
+
+DEFAULT_CHUNK_SIZE = 20000
+
+# A pairing is (p1 class, p1 playstyle, p2 class, p2 playstyle), as keys of
+# CHARACTER_CLASSES and PLAYSTYLE_CLASSES.
+Pairing = Tuple[str, str, str, str]
+
+
+def ai_playstyles(searching: bool = True) -> List[str]:
+    """
+    Return the keys of the playstyles in PLAYSTYLE_CLASSES that do not need
+    a player, leaving out those that search ahead unless searching.
+    """
+    return [key for key in sorted(PLAYSTYLE_CLASSES)
+            if not PLAYSTYLE_CLASSES[key](BattleQueue()).is_manual and
+            (searching or not PLAYSTYLE_CLASSES[key].searches)]
+
+
+def all_pairings(playstyles: Optional[List[str]] = None) -> List[Pairing]:
+    """
+    Return every pairing of a character class and AI playstyle against
+    another, of the playstyles keyed in playstyles (every AI playstyle that
+    does not search ahead by default, as those take milliseconds a move).
+    """
+    if playstyles is None:
+        playstyles = ai_playstyles(searching=False)
+    players = list(itertools.product(sorted(CHARACTER_CLASSES),
+                                     sorted(playstyles)))
+    return [p1 + p2 for p1 in players for p2 in players]
+
+
+def play_chunk(pairing: Pairing, first_game: int, games: int, seed: int,
+               vectorized: bool = False) -> MatchStats:
+    """
+    Play games games of pairing numbered from first_game in a tournament
+    with the master seed seed, and return their results.
+
+    This runs in a worker process.
+    """
+    p1, p1_style, p2, p2_style = pairing
+    seed = derive_seed(seed, *pairing)
+    if vectorized:
+        from a1_playstyle import RandomPlaystyle
+        from a1_vector_engine import simulate
+        if issubclass(PLAYSTYLE_CLASSES[p1_style], RandomPlaystyle) and \
+                issubclass(PLAYSTYLE_CLASSES[p2_style], RandomPlaystyle):
+            # The engine draws a whole chunk from one stream, so it is the
+            # chunk rather than the game that is seeded here.
+            return simulate(CHARACTER_CLASSES[p1], CHARACTER_CLASSES[p2],
+                            games, derive_seed(seed, 'chunk', first_game))
+    return run_batch(p1, p2, p1_style, p2_style, games, seed=seed,
+                     first_game=first_game)
+
+
+def run_tournament(games: int, seed: int, workers: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   vectorized: bool = False,
+                   playstyles: Optional[List[str]] = None
+                   ) -> Dict[Pairing, MatchStats]:
+    """
+    Play games games of every pairing of playstyles (see all_pairings) on
+    workers processes, and return the merged results of every pairing.
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for pairing in all_pairings(playstyles):
+            results[pairing] = MatchStats()
+            for start in range(0, games, chunk_size):
+                futures.append((pairing, executor.submit(
+                    play_chunk, pairing, start,
+                    min(chunk_size, games - start), seed, vectorized)))
+        for pairing, future in futures:
+            results[pairing].merge(future.result())
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Parse the command line arguments in argv, run the tournament they
+    describe and print its report.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument('--games', type=int, default=100000,
+                        help="number of games to play for every pairing")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="number of games played per task")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="master seed of the tournament")
+    parser.add_argument('--vectorized', action='store_true',
+                        help="play random-vs-random pairings on the NumPy " +
+                        "engine (their results then depend on " +
+                        "--chunk-size)")
+    parser.add_argument('--playstyles', nargs='+', choices=ai_playstyles(),
+                        default=None, help="AI playstyles to pair up " +
+                        "(all but those that search ahead by default)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run_tournament(args.games, args.seed, args.workers,
+                             args.chunk_size, args.vectorized,
+                             args.playstyles)
+    elapsed = time.perf_counter() - start
+
+    total = MatchStats()
+    for (p1, p1_style, p2, p2_style), stats in results.items():
+        print("{} ({}) vs {} ({})".format(
+            CHARACTER_CLASSES[p1].__name__, p1_style,
+            CHARACTER_CLASSES[p2].__name__, p2_style))
+        print(stats.report())
+        print()
+        total.merge(stats)
+    print("all pairings on {} workers".format(args.workers))
+    print(total.report(elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Unittests for the process-pool tournament runner of A1.
+"""
+import unittest
+
+from a1_tournament import ai_playstyles, all_pairings, run_tournament
+
+
+class TournamentUnitTests(unittest.TestCase):
+    def test_results_do_not_depend_on_workers(self):
+        """
+        Test to make sure a seeded tournament gives the same results on one
+        worker as on two, and in one chunk as in three.
+        """
+        # MCTSPlaystyle is left out, as it takes a few ms per move.
+        playstyles = ['b', 'e', 'r']
+        one = run_tournament(300, seed=5, workers=1, chunk_size=300,
+                             playstyles=playstyles)
+        two = run_tournament(300, seed=5, workers=2, chunk_size=100,
+                             playstyles=playstyles)
+
+        self.assertEqual(sorted(one), sorted(all_pairings(playstyles)))
+        for pairing in one:
+            self.assertEqual(one[pairing].games, 300)
+            self.assertEqual(one[pairing].results, two[pairing].results,
+                             "Pairing {} gave different results.".format(
+                                 pairing))
+            self.assertEqual(one[pairing].turns, two[pairing].turns)
+
+    def test_default_pairings(self):
+        """
+        Test to make sure the playstyles that search ahead are only paired
+        up when asked for.
+        """
+        pairings = all_pairings()
+        self.assertEqual(len(pairings), (2 * 2) ** 2)
+        self.assertEqual({pairing[1] for pairing in pairings} |
+                         {pairing[3] for pairing in pairings}, {'b', 'r'})
+        self.assertEqual(ai_playstyles(), ['b', 'c', 'e', 'r', 's'])
+        self.assertIn(('m', 'c', 'r', 's'), all_pairings(['c', 's']))
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -7,9 +7,16 @@ way, nor do you need to submit it.
 This file simply calls on pygame and the code from a1_game.py, which contains
 all of your client code.
 """
+import a1_atlas
 import a1_game
+import argparse
+import math
+import os
 import pygame
 import sys
+import time
+from a1_scheduler import LatencyRecorder, Scheduler
+from collections import OrderedDict
 
 GAME_SPEED = 100
 pygame.init()
@@ -20,8 +27,41 @@ NUMBER_OF_CHARACTERS = 2
 PADDING = 40
 P1_POSITION = CHARACTER_SIZE // 4
 P2_POSITION = CHARACTER_SIZE - (CHARACTER_SIZE // 4)
-RANDOM_TIMER = 10
+# The seconds between two moves of an AI player.
+AI_THINK_TIME = 10 * GAME_SPEED / 1000
 FONT_SIZE = 18
+TEXT_CACHE_SIZE = 256
+TEXT_COLOR = (0, 0, 0)
+SPRITE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'sprites')
+
+# Every image in SPRITE_DIRECTORY, decoded once by load_assets() and keyed by
+# file name without the .png, along with the mirrored copies used for P2 and
+# the cache that renders every label. The frame loop only reads these.
+SPRITES = {}
+FLIPPED_SPRITES = {}
+# The smallest rect around the visible pixels of every sprite in SPRITES and
+# FLIPPED_SPRITES, relative to the sprite.
+SPRITE_BOUNDS = {}
+FLIPPED_SPRITE_BOUNDS = {}
+BACKGROUND = None
+TEXT_CACHE = None
+
+# The parts of the screen that update_game() redraws on their own: each
+# character's sprite, the name/HP/SP labels and the status lines below the
+# characters.
+REGIONS = {'p1_sprite': pygame.Rect(P1_POSITION, PADDING, CHARACTER_SIZE,
+                                    CHARACTER_SIZE),
+           'p2_sprite': pygame.Rect(P2_POSITION, PADDING, CHARACTER_SIZE,
+                                    CHARACTER_SIZE),
+           'labels': pygame.Rect(0, 0, NUMBER_OF_CHARACTERS * CHARACTER_SIZE,
+                                 3 * FONT_SIZE),
+           'status': pygame.Rect(0, CHARACTER_SIZE + PADDING,
+                                 NUMBER_OF_CHARACTERS * CHARACTER_SIZE,
+                                 PADDING)}
+
+# What is on the screen in each of REGIONS, as of the last update_game().
+DRAWN = {}
 
 
 def start_game():
@@ -40,15 +80,137 @@ def start_game():
 
     # set the screen to draw on
     PYGAME_SCREEN = pygame.display.set_mode(pixel_size)
+    load_assets()
+    DRAWN.clear()
+
+
+class TextCache:
+    """
+    Rendered lines of text, keyed by (text, color, size), of which only the
+    capacity most recently used are kept.
+
+    hits - The number of render() calls answered from the cache.
+    misses - The number of render() calls that had to render their text.
+    """
+    capacity: int
+    hits: int
+    misses: int
+
+    def __init__(self, capacity=TEXT_CACHE_SIZE):
+        """
+        Initialize an empty TextCache that holds at most capacity lines.
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+        self._fonts = {}
+
+    def render(self, text, color=TEXT_COLOR, size=FONT_SIZE):
+        """
+        Return text rendered (anti-aliased) in color with the default font
+        at size.
+        """
+        key = (text, color, size)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = pygame.font.SysFont(
+                pygame.font.get_default_font(), size)
+        surface = self._surfaces[key] = font.render(text, True, color)
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def __len__(self):
+        """
+        Return the number of lines in this TextCache.
+        """
+        return len(self._surfaces)
+
+    def __str__(self):
+        """
+        Return the size and hit rate of this TextCache.
+        """
+        lookups = self.hits + self.misses
+        return "{}/{} lines, {} hits, {} misses ({:.1%} hit rate)".format(
+            len(self), self.capacity, self.hits, self.misses,
+            self.hits / lookups if lookups else 0)
+
+
+def load_assets():
+    """
+    Decode every sprite and the background once, mirror the sprites for P2,
+    and create the label cache, so that drawing a frame does no disk I/O or
+    decoding.
+
+    The sprites come from the packed atlas (see a1_atlas) if it has been
+    built and is up to date, and from the PNGs one by one otherwise.
+
+    This must be called after the display mode is set, so that the images
+    can be converted to the display's pixel format for fast blitting.
+    """
+    global BACKGROUND, TEXT_CACHE
+    images = a1_atlas.load_atlas(SPRITE_DIRECTORY)
+    if images is None:
+        images = {}
+        for file_name in sorted(os.listdir(SPRITE_DIRECTORY)):
+            name, extension = os.path.splitext(file_name)
+            if extension == '.png' and file_name != a1_atlas.ATLAS_IMAGE:
+                images[name] = pygame.image.load(
+                    os.path.join(SPRITE_DIRECTORY, file_name)).convert_alpha()
+
+    for name, image in images.items():
+        if name == 'background':
+            # The background has no transparency, so an opaque copy blits
+            # faster.
+            BACKGROUND = image.convert()
+        else:
+            SPRITES[name] = image
+            FLIPPED_SPRITES[name] = pygame.transform.flip(image, True, False)
+            SPRITE_BOUNDS[name] = image.get_bounding_rect()
+            FLIPPED_SPRITE_BOUNDS[name] = \
+                FLIPPED_SPRITES[name].get_bounding_rect()
+
+    TEXT_CACHE = TextCache()
+
+
+def _sprite_change(bounds, old_sprite, new_sprite, region):
+    """
+    Return the part of region that changes when the sprite drawn in it goes
+    from old_sprite to new_sprite, given the bounds of their visible pixels.
+    """
+    return bounds[old_sprite].union(bounds[new_sprite]).move(region.topleft)
 
 
 def update_game():
     """
     Update the game's UI.
+
+    Only the REGIONS whose contents changed since the last call are redrawn
+    and pushed to the display, so a frame where nothing changed draws
+    nothing.
+    """
+    dirty = draw_frame(PYGAME_SCREEN, a1_game.update_ui())
+    if dirty:
+        pygame.display.update(dirty)
+
+
+def draw_frame(surface, draw_parameters):
     """
-    global PYGAME_SCREEN, CHARACTER_SIZE, P1_POSITION, P2_POSITION
+    Draw the game described by draw_parameters (see a1_game.update_ui) onto
+    surface, and return the rects of surface that changed.
 
-    draw_parameters = a1_game.update_ui()
+    Only the REGIONS whose contents changed since the last frame drawn are
+    redrawn, so DRAWN must be cleared before drawing onto a new surface.
+    """
+    global CHARACTER_SIZE, P1_POSITION, P2_POSITION
 
     p1_sprite = draw_parameters['p1_sprite']
     p1_hp = draw_parameters['p1_hp']
@@ -64,112 +226,194 @@ def update_game():
 
     p2_label = "{}\nHP: {}\nSP: {}".format(p2_name, p2_hp, p2_sp).split("\n")
 
-    font_type = pygame.font.get_default_font()
-    font = pygame.font.SysFont(font_type, FONT_SIZE)
-    p1_icon = pygame.image.load('sprites/' + p1_sprite + '.png')
-    p2_icon = pygame.image.load('sprites/' + p2_sprite + '.png')
-
-    PYGAME_SCREEN.fill((255, 255, 255)) # (255, 255, 255)=(r,g,b)=white
-    bg = pygame.image.load('sprites/background.png')
+    # Update the current player and available actions
+    if not a1_game.GAME_IS_OVER:
+        actions = draw_parameters['actions']
+        current_player = draw_parameters['current_player']
+        status_label = ["Current Character: {}".format(current_player),
+                        "Available Actions: {}".format(", ".join(actions))]
+    else:
+        status_label = ["Game over!"]
+        winner = a1_game.GAME_WINNER
+        if winner:
+            status_label.append("The winner is {}!".format(winner.get_name()))
+        else:
+            status_label.append("The game ended in a tie!")
+
+    contents = {'p1_sprite': p1_sprite,
+                'p2_sprite': p2_sprite,
+                'labels': (p1_label, p2_label),
+                'status': status_label}
+    dirty = []
+    for region, content in contents.items():
+        drawn = DRAWN.get(region)
+        if drawn == content:
+            continue
+        if drawn is not None and region == 'p1_sprite':
+            dirty.append(_sprite_change(SPRITE_BOUNDS, drawn, content,
+                                        REGIONS[region]))
+        elif drawn is not None and region == 'p2_sprite':
+            dirty.append(_sprite_change(FLIPPED_SPRITE_BOUNDS, drawn,
+                                        content, REGIONS[region]))
+        else:
+            dirty.append(REGIONS[region])
+    if not dirty:
+        return dirty
+    DRAWN.update(contents)
+
+    # Every layer is drawn in order, but clipped to the changed regions, so
+    # anything overlapping them (the other sprite, a label) is redrawn too.
+    surface.set_clip(dirty[0].unionall(dirty[1:]))
+
+    render = TEXT_CACHE.render
+    p1_icon = SPRITES[p1_sprite]
+    # p2 is pre-flipped so they face p1
+    p2_icon = FLIPPED_SPRITES[p2_sprite]
+
+    surface.fill((255, 255, 255)) # (255, 255, 255)=(r,g,b)=white
+    bg = BACKGROUND
     rect = pygame.Rect(0, 0, NUMBER_OF_CHARACTERS * CHARACTER_SIZE,
                        CHARACTER_SIZE + PADDING * 2)
-    PYGAME_SCREEN.blit(bg, rect)
+    surface.blit(bg, rect)
 
     # Draw the first character
     (x, y) = P1_POSITION, PADDING
     rect = pygame.Rect(x, y, CHARACTER_SIZE, CHARACTER_SIZE)
-    PYGAME_SCREEN.blit(p1_icon, rect)
+    surface.blit(p1_icon, rect)
 
     y_coordinate = 0
     for line in p1_label:
-        text = font.render(line, True, (0, 0, 0))
-        PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING, y_coordinate))
+        text = render(line)
+        surface.blit(text, (P1_POSITION + PADDING, y_coordinate))
         y_coordinate += FONT_SIZE
 
     # Draw the HP bar
     # Draw the SP bar
 
     # Draw the second character
-    # Flip p2 so they face p1
-    p2_icon = pygame.transform.flip(p2_icon, True, False)
     (x, y) = P2_POSITION, PADDING
     rect = pygame.Rect(x, y, CHARACTER_SIZE, CHARACTER_SIZE)
-    PYGAME_SCREEN.blit(p2_icon, rect)
+    surface.blit(p2_icon, rect)
 
     y_coordinate = 0
     for line in p2_label:
-        text = font.render(line, True, (0, 0, 0))
-        PYGAME_SCREEN.blit(text, (P2_POSITION + PADDING, y_coordinate))
+        text = render(line)
+        surface.blit(text, (P2_POSITION + PADDING, y_coordinate))
         y_coordinate += FONT_SIZE
 
-    # Update the current player and available actions
-    if not a1_game.GAME_IS_OVER:
-        actions = draw_parameters['actions']
-        current_player = draw_parameters['current_player']
-        action_label = ["Current Character: {}".format(current_player),
-                        "Available Actions: {}".format(", ".join(actions))]
+    y_coordinate = CHARACTER_SIZE + PADDING
+    for line in status_label:
+        text = render(line)
+        surface.blit(text, (P1_POSITION + PADDING // 2, y_coordinate))
+        y_coordinate += FONT_SIZE
 
-        y_coordinate = CHARACTER_SIZE + PADDING
-        for line in action_label:
-            text = font.render(line, True, (0, 0, 0))
-            PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING // 2, y_coordinate))
-            y_coordinate += FONT_SIZE
-    else:
-        game_label = ["Game over!"]
-        winner = a1_game.GAME_WINNER
-        if winner:
-            game_label.append("The winner is {}!".format(winner.get_name()))
-        else:
-            game_label.append("The game ended in a tie!")
+    surface.set_clip(None)
+    return dirty
 
-        y_coordinate = CHARACTER_SIZE + PADDING
-        for line in game_label:
-            text = font.render(line, True, (0, 0, 0))
-            PYGAME_SCREEN.blit(text, (P1_POSITION + PADDING // 2, y_coordinate))
-            y_coordinate += FONT_SIZE
 
-    pygame.display.flip()
+def ai_to_move():
+    """
+    Return whether the game is still going and the current player isn't
+    using a manual playstyle.
+    """
+    return (not a1_game.GAME_IS_OVER and
+            not a1_game.BATTLE_QUEUE.is_over() and
+            not a1_game.BATTLE_QUEUE.peek().playstyle.is_manual)
 
 
-if __name__ == '__main__':
-    start_game()
-    update_game()
+def ai_turn():
+    """
+    Make a move for the current player if they aren't using a manual
+    playstyle.
+    """
+    if ai_to_move():
+        a1_game.perform_attack()
 
-    while True:
-        pygame.time.wait(GAME_SPEED)
 
-        for event in pygame.event.get():
+def handle_key(key):
+    """
+    Make a move for the current player with the pressed key if they are
+    using a manual playstyle, and return whether a move was made.
+    """
+    if (not a1_game.GAME_IS_OVER and
+        not a1_game.BATTLE_QUEUE.is_over() and
+        a1_game.BATTLE_QUEUE.peek().playstyle.is_manual):
+        k = 'X'
+        if key == pygame.K_a:
+            k = 'A'
+        elif key == pygame.K_s:
+            k = 'S'
+
+        a1_game.LAST_KEY_PRESSED = k
+        a1_game.perform_attack()
+        return True
+    return False
+
+
+def run_loop(scheduler, latency):
+    """
+    Handle events and run the tasks of scheduler until the window is
+    closed.
+
+    Between tasks the loop blocks on the event queue, so a key press is
+    acted on (and drawn) as soon as it arrives. The time from taking each
+    key press that makes a move off the queue to having drawn that move is
+    recorded in latency.
+    """
+    while True:
+        # event.wait(0) would wait forever, so poll when a task is due.
+        timeout = math.ceil(scheduler.time_until_next() * 1000)
+        event = pygame.event.wait(timeout) if timeout else \
+            pygame.event.poll()
+        while event.type != pygame.NOEVENT:
+            received = time.perf_counter()
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit(0)
-            if event.type == pygame.KEYDOWN and not a1_game.GAME_IS_OVER:
-                # If the current player is using a manual playstyle, the
-                # pick a move when a key is pressed
-                if (not a1_game.BATTLE_QUEUE.is_over() and
-                    a1_game.BATTLE_QUEUE.peek().playstyle.is_manual):
-                    k = 'X'
-                    if event.key == pygame.K_a:
-                        k = 'A'
-                    elif event.key == pygame.K_s:
-                        k = 'S'
-
-                    a1_game.LAST_KEY_PRESSED = k
-                    a1_game.perform_attack()
-
-        # If the current player isn't using a manual playstyle, pick a move
-        if (not a1_game.GAME_IS_OVER and
-            not a1_game.BATTLE_QUEUE.is_over() and
-            not a1_game.BATTLE_QUEUE.peek().playstyle.is_manual and
-            RANDOM_TIMER == 10):
-            a1_game.perform_attack()
+                return
+            if event.type == pygame.KEYDOWN and handle_key(event.key):
+                update_game()
+                latency.record(time.perf_counter() - received)
+            event = pygame.event.poll()
+
+        scheduler.run_pending()
+
 
-        # Redraw the game
-        update_game()
+def main(argv=None):
+    """
+    Parse the command line arguments in argv, then play the game until the
+    window is closed, and print the key-to-move latencies.
+
+    The sprites animate (and the screen is redrawn) every GAME_SPEED
+    milliseconds, and AI players make a move every --ai-think-time seconds,
+    or as fast as possible with --turbo, each on their own timer.
+    """
+    parser = argparse.ArgumentParser(description="Play the battle game.")
+    parser.add_argument('--ai-think-time', type=float, default=AI_THINK_TIME,
+                        help="seconds between two moves of an AI player")
+    parser.add_argument('--turbo', action='store_true',
+                        help="play AI moves as fast as possible, while the " +
+                        "sprites still animate at their normal speed")
+    args = parser.parse_args(argv)
 
-        # Only let the random strategy make a decision every 10 ticks of time
-        RANDOM_TIMER -= 1
-        if RANDOM_TIMER == 0:
-            RANDOM_TIMER = 10
+    start_game()
+    update_game()
 
+    frame_time = GAME_SPEED / 1000
+    scheduler = Scheduler()
+    # The AI goes first when both are due, so its move is drawn at once.
+    # It is only due while an AI player is to move, so in turbo mode the
+    # loop sleeps until the next frame once the game is over or while a
+    # manual player is to move, rather than spinning.
+    scheduler.every(0 if args.turbo else args.ai_think_time, ai_turn,
+                    delay=frame_time, when=ai_to_move)
+    scheduler.every(frame_time, update_game)
+
+    latency = LatencyRecorder()
+    run_loop(scheduler, latency)
+    if latency.samples:
+        print("key-to-move latency: {}".format(latency))
     pygame.quit()
     sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Unittests for the UI of A1.
+"""
+import os
+import unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+import a1_game
+import a1_ui
+from a1_ui import DRAWN, FONT_SIZE, REGIONS, TextCache
+
+
+class _StubFont:
+    """A font that renders every line as a new object, and counts them."""
+
+    def __init__(self):
+        """Initialize a _StubFont that has rendered nothing."""
+        self.rendered = []
+
+    def render(self, text, antialias, color):
+        """Return a new object for text."""
+        self.rendered.append(text)
+        return object()
+
+
+class TextCacheUnitTests(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up a TextCache of two lines, rendering with a stub font.
+        """
+        self.font = _StubFont()
+        self.cache = TextCache(capacity=2)
+        self.cache._fonts[FONT_SIZE] = self.font
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp.
+        """
+        del self.font
+        del self.cache
+
+    def test_hit_and_miss(self):
+        """
+        Test to make sure the first render of a line misses and renders it,
+        and the next one hits and returns the same surface.
+        """
+        first = self.cache.render("HP: 100")
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+        self.assertIs(self.cache.render("HP: 100"), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.font.rendered, ["HP: 100"])
+        self.assertEqual(str(self.cache),
+                         "1/2 lines, 1 hits, 1 misses (50.0% hit rate)")
+
+    def test_least_recently_used_is_evicted(self):
+        """
+        Test to make sure a full cache drops the line used longest ago.
+        """
+        self.cache.render("one")
+        self.cache.render("two")
+        self.cache.render("one")
+        self.cache.render("three")
+        self.assertEqual(len(self.cache), 2)
+
+        self.cache.render("one")
+        self.cache.render("three")
+        self.assertEqual(self.font.rendered, ["one", "two", "three"])
+        self.cache.render("two")
+        self.assertEqual(self.font.rendered, ["one", "two", "three", "two"])
+        self.assertEqual((self.cache.hits, self.cache.misses), (3, 4))
+
+
+class DrawFrameUnitTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Starts pygame without a window and loads the assets.
+        """
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        a1_ui.load_assets()
+
+    def setUp(self):
+        """
+        Sets up a surface to draw on, with nothing drawn on it yet, and the
+        parameters of a game that is still going.
+        """
+        self.surface = pygame.Surface(
+            (a1_ui.NUMBER_OF_CHARACTERS * a1_ui.CHARACTER_SIZE,
+             a1_ui.CHARACTER_SIZE + a1_ui.PADDING * 2))
+        DRAWN.clear()
+        self.game_is_over = a1_game.GAME_IS_OVER
+        a1_game.GAME_IS_OVER = False
+        self.parameters = {'p1_sprite': 'rogue_idle_0', 'p1_hp': 100,
+                           'p1_sp': 100, 'p1_name': 'A',
+                           'p2_sprite': 'mage_idle_0', 'p2_hp': 100,
+                           'p2_sp': 100, 'p2_name': 'B',
+                           'actions': ['A', 'S'], 'current_player': 'A'}
+
+    def tearDown(self):
+        """
+        Delete the attributes that were created in setUp, and forget what
+        was drawn.
+        """
+        a1_game.GAME_IS_OVER = self.game_is_over
+        DRAWN.clear()
+        del self.surface
+        del self.parameters
+        del self.game_is_over
+
+    def test_only_changes_are_drawn(self):
+        """
+        Test to make sure the first frame draws every region, a frame that
+        only changes an HP redraws the labels alone, and the same frame
+        again draws nothing.
+        """
+        dirty = a1_ui.draw_frame(self.surface, self.parameters)
+        self.assertEqual(sorted(map(tuple, dirty)),
+                         sorted(map(tuple, REGIONS.values())))
+
+        self.parameters['p2_hp'] = 88
+        before = pygame.image.tobytes(self.surface, 'RGB')
+        self.assertEqual(a1_ui.draw_frame(self.surface, self.parameters),
+                         [REGIONS['labels']])
+        self.assertNotEqual(pygame.image.tobytes(self.surface, 'RGB'),
+                            before)
+
+        self.assertEqual(a1_ui.draw_frame(self.surface,
+                                          dict(self.parameters)), [])
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,240 @@
+"""
+A NumPy-vectorized Monte Carlo engine for running many battles at once.
+
+Instead of one Python object graph per game, the state of N battles is held
+as a struct of arrays (HP, SP and the battle queue of every battle), and
+every running battle is advanced by one turn per vectorized step. The damage,
+SP and queue rules are the same as in Characters.attack and
+Characters.special_attack, read from the same CharacterStats records, and
+both characters pick their moves with the RandomPlaystyle rule.
+
+Each battle queue is packed into the bits of a uint64: bit i holds the side
+(0 for P1, 1 for P2) of the i-th character in the queue, so peek() is
+queue & 1, remove() is queue >> 1 and add() sets bit length.
+"""
+from typing import Optional
+
+import numpy as np
+
+from a1_battle_sim import MatchStats, MAX_TURNS, RESULTS
+from a1_characters import CharacterStats
+
+# The codes stored in VectorBattles.result, in the same order as RESULTS.
+RUNNING = -1
+P1_WINS = 0
+P2_WINS = 1
+TIE = 2
+STALLED = 3
+
+STARTING_HP = 100
+STARTING_SP = 100
+DEFAULT_CHUNK_SIZE = 100000
+
+
+class VectorBattles:
+    """
+    N battles between a P1 and a P2 character class, advanced together.
+
+    The classes are given as their CharacterStats, so a balance change can
+    be tried out without making a class for it. The step assumes a normal
+    attack is never dearer than a special attack and that a special attack
+    adds two characters to the queue, which holds for every stats accepted.
+
+    The step avoids np.where and fancy indexing, which are an order of
+    magnitude slower than plain arithmetic on random data: every per-side
+    value is selected as value_p1 + (value_p2 - value_p1) * side, where side
+    is 0 when P1 is at the front of the queue and 1 when P2 is. The state
+    arrays hold only the battles that are still running (plus a few that
+    have just ended), and are compacted once enough battles have ended.
+
+    index - The battle number of every battle in the state arrays.
+    live - Whether every battle in the state arrays is still running.
+    hp, sp - (2, M) arrays holding the HP and SP of P1 (row 0) and P2
+             (row 1).
+    queue - The battle queue of every battle, packed into a uint64.
+    length - The number of characters in every battle queue.
+    turns - The number of turns every battle has taken.
+    result - RUNNING, or how each of the N battles ended.
+    turns_taken - The number of turns each of the N battles took.
+    """
+    index: np.ndarray
+    live: np.ndarray
+    hp: np.ndarray
+    sp: np.ndarray
+    queue: np.ndarray
+    length: np.ndarray
+    turns: np.ndarray
+    result: np.ndarray
+    turns_taken: np.ndarray
+
+    def __init__(self, p1_stats: CharacterStats, p2_stats: CharacterStats,
+                 n: int, rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Initialize n new battles between characters with p1_stats and
+        p2_stats, drawing the random moves from rng.
+        """
+        for stats in (p1_stats, p2_stats):
+            if stats.attack_cost > stats.special_cost or \
+                    len(stats.special_queue) != 2:
+                raise ValueError("the vectorized engine needs a special " +
+                                 "attack that costs at least as much as " +
+                                 "an attack and queues two characters")
+        longest = 2 + sum(STARTING_SP // s.special_cost *
+                          (len(s.special_queue) - 1)
+                          for s in [p1_stats, p2_stats]) + 2
+        if longest > 64:
+            raise ValueError(("battle queues of up to {} characters do " +
+                              "not fit in 64 bits").format(longest))
+
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.p1_stats = p1_stats
+        self.p2_stats = p2_stats
+
+        self.index = np.arange(n)
+        self.live = np.ones(n, np.bool_)
+        self.hp = np.full((2, n), STARTING_HP, np.int16)
+        self.sp = np.full((2, n), STARTING_SP, np.int16)
+        # The queue starts as P1 -> P2, i.e. bit 0 is 0 and bit 1 is 1.
+        self.queue = np.full(n, 0b10, np.uint64)
+        self.length = np.full(n, 2, np.uint64)
+        self.turns = np.zeros(n, np.int16)
+        self.result = np.full(n, RUNNING, np.int8)
+        self.turns_taken = np.zeros(n, np.int16)
+
+    def _pick(self, field: str, side: np.ndarray) -> np.ndarray:
+        """
+        Return the field of CharacterStats for the given sides (0 for P1, 1 for
+        P2).
+        """
+        p1_value = getattr(self.p1_stats, field)
+        return p1_value + (getattr(self.p2_stats, field) - p1_value) * side
+
+    def step(self) -> int:
+        """
+        Advance every running battle by one turn, and return the number of
+        battles that are still running.
+        """
+        p1, p2 = self.p1_stats, self.p2_stats
+        hp, sp, queue, length = self.hp, self.sp, self.queue, self.length
+        side = (queue & np.uint64(1)).astype(np.int16)
+        enemy = 1 - side
+
+        # RandomPlaystyle: pick 'A' or 'S' at random, then fall back to 'A'
+        # if there isn't enough SP for 'S'.
+        actor_sp = sp[0] + (sp[1] - sp[0]) * side
+        attack_cost = self._pick('attack_cost', side)
+        special = ((actor_sp >= self._pick('special_cost', side)) &
+                   self.rng.integers(0, 2, side.size, dtype=np.bool_) &
+                   self.live)
+        acted = ((actor_sp >= attack_cost) & self.live) | special
+
+        cost = (attack_cost * acted +
+                (self._pick('special_cost', side) - attack_cost) * special)
+        attack_damage = self._pick('attack_damage', side)
+        damage = ((attack_damage - self._pick('defense', enemy)) * acted +
+                  (self._pick('special_damage', side) - attack_damage) *
+                  special)
+        enemy_hp = hp[1] + (hp[0] - hp[1]) * side
+        damage = np.minimum(damage, enemy_hp)
+        enemy_hp -= damage
+        sp[0] -= cost * enemy
+        sp[1] -= cost * side
+        hp[0] -= damage * side
+        hp[1] -= damage * enemy
+        actor_sp -= cost
+
+        # An attack adds the attacker to the queue; a special attack adds
+        # the two characters in its class's special_queue instead. A
+        # special_queue entry XORed with the attacker's side gives the side
+        # that is added.
+        bit = side.astype(np.uint64)
+        acted_bit = acted.astype(np.uint64)
+        special_bit = special.astype(np.uint64)
+        first_entry = np.uint64(p1.special_queue[0]) ^ (
+            np.uint64(p1.special_queue[0] ^ p2.special_queue[0]) * bit)
+        second_entry = np.uint64(p1.special_queue[1]) ^ (
+            np.uint64(p1.special_queue[1] ^ p2.special_queue[1]) * bit)
+        queue |= ((bit ^ (first_entry * special_bit)) << length) * acted_bit
+        length += acted_bit
+        queue |= ((bit ^ second_entry) << length) * special_bit
+        length += special_bit
+
+        # Remove the attacker from the front of the queue if they still have
+        # SP for another attack.
+        can_act_again = actor_sp >= attack_cost
+        removed = (acted & can_act_again).astype(np.uint64)
+        queue >>= removed
+        length -= removed
+        self.turns += acted
+
+        enemy_sp = sp[1] + (sp[0] - sp[1]) * side
+        tie = acted & ~can_act_again & \
+            (enemy_sp < self._pick('attack_cost', enemy))
+        knocked_out = acted & (enemy_hp == 0)
+        stalled = self.live & (~acted | (self.turns >= MAX_TURNS))
+        ended = knocked_out | tie | stalled
+        if ended.any():
+            result = np.full(side.size, STALLED, np.int8)
+            result[tie] = TIE
+            result[knocked_out] = side[knocked_out]
+            self.result[self.index[ended]] = result[ended]
+            self.turns_taken[self.index[ended]] = self.turns[ended]
+            self.live &= ~ended
+
+        running = int(self.live.sum())
+        if running < self.live.size * 3 // 4:
+            self._compact()
+        return running
+
+    def _compact(self) -> None:
+        """
+        Drop the battles that have ended from the state arrays.
+        """
+        live = self.live
+        self.index = self.index[live]
+        self.hp = self.hp[:, live]
+        self.sp = self.sp[:, live]
+        self.queue = self.queue[live]
+        self.length = self.length[live]
+        self.turns = self.turns[live]
+        self.live = self.live[live]
+
+    def run(self) -> None:
+        """
+        Step every battle until they have all ended.
+        """
+        while self.step():
+            pass
+
+    def stats(self) -> MatchStats:
+        """
+        Return the results of the ended battles as a MatchStats.
+        """
+        stats = MatchStats()
+        ended = self.result != RUNNING
+        counts = np.bincount(self.result[ended], minlength=len(RESULTS))
+        for result, count in zip(RESULTS, counts):
+            if count:
+                stats.results[result] = int(count)
+        for turns, count in enumerate(np.bincount(self.turns_taken[ended])):
+            if count:
+                stats.turns[turns] = int(count)
+        stats.games = int(ended.sum())
+        return stats
+
+
+def simulate(p1_class: type, p2_class: type, games: int,
+             seed: Optional[int] = None,
+             chunk_size: int = DEFAULT_CHUNK_SIZE) -> MatchStats:
+    """
+    Play games random-vs-random battles between p1_class and p2_class in
+    chunks of at most chunk_size battles, and return their results.
+    """
+    rng = np.random.default_rng(seed)
+    stats = MatchStats()
+    while stats.games < games:
+        battles = VectorBattles(p1_class.stats, p2_class.stats,
+                                min(chunk_size, games - stats.games), rng)
+        battles.run()
+        stats.merge(battles.stats())
+    return stats
@@ -0,0 +1,74 @@
+"""
+Unittests for the NumPy-vectorized battle engine of A1.
+"""
+import unittest
+
+import numpy as np
+
+from a1_battle_sim import P1_WINS, STALLED, TIE
+from a1_characters import Mage, Rogue
+from a1_vector_engine import VectorBattles, simulate
+
+
+class VectorEngineUnitTests(unittest.TestCase):
+    def test_first_turn_matches_mage(self):
+        """
+        Test to make sure the first turn of a Mage against a Rogue follows
+        Mage.attack or Mage.special_attack.
+        """
+        battles = VectorBattles(Mage.stats, Rogue.stats, 1000,
+                                np.random.default_rng(0))
+        battles.step()
+
+        mage_sp = battles.sp[0]
+        rogue_hp = battles.hp[1]
+        attacked = mage_sp == 95
+        special = mage_sp == 70
+        self.assertTrue((attacked | special).all(),
+                        "A mage should have 95 or 70 SP after one turn.")
+        self.assertTrue((rogue_hp[attacked] == 90).all(),
+                        "A mage's attack should leave a rogue at 90 HP.")
+        self.assertTrue((rogue_hp[special] == 70).all(),
+                        "A mage's special should leave a rogue at 70 HP.")
+        self.assertTrue(attacked.any() and special.any(),
+                        "Both moves should be picked at random.")
+
+        # An attack gives P2 -> P1, a special gives P2 -> P2 -> P1.
+        self.assertTrue((battles.queue[attacked] == 0b01).all())
+        self.assertTrue((battles.length[attacked] == 2).all())
+        self.assertTrue((battles.queue[special] == 0b011).all())
+        self.assertTrue((battles.length[special] == 3).all())
+
+    def test_every_game_finishes(self):
+        """
+        Test to make sure every game between each pair of classes ends with
+        a winner.
+        """
+        for p1 in [Mage, Rogue]:
+            for p2 in [Mage, Rogue]:
+                stats = simulate(p1, p2, 2000, seed=1)
+                self.assertEqual(stats.games, 2000)
+                self.assertEqual(stats.results[STALLED], 0)
+                self.assertEqual(stats.results[TIE], 0)
+
+    def test_matches_win_rate(self):
+        """
+        Test to make sure a random Mage beats a random Rogue about as often
+        as in the object-based game (17.9% over 10^7 games).
+        """
+        stats = simulate(Mage, Rogue, 50000, seed=2)
+        win_rate = stats.results[P1_WINS] / stats.games
+        self.assertAlmostEqual(win_rate, 0.179, delta=0.01)
+
+    def test_seed_is_reproducible(self):
+        """
+        Test to make sure the same seed gives the same results.
+        """
+        first = simulate(Rogue, Rogue, 5000, seed=7)
+        second = simulate(Rogue, Rogue, 5000, seed=7)
+        self.assertEqual(first.results, second.results)
+        self.assertEqual(first.turns, second.turns)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)